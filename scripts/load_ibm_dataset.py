@@ -48,6 +48,23 @@ def main():
         action="store_true",
         help="Load only normal (non-laundering) transactions"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Use vectorized parsing and COPY (for large files such as HI-Large)"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        help="CSV rows per chunk in bulk mode (default: 200000)"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Processes parsing the CSV in bulk mode (0 = all cores, default: 1)"
+    )
     parser.add_argument(
         "--stats",
         action="store_true",
@@ -90,15 +107,29 @@ def main():
         print(f"Max records: {args.max_records or 'All'}")
         print(f"Include laundering: {include_laundering}")
         print(f"Include normal: {include_normal}")
+        print(f"Bulk mode: {args.bulk}")
         print()
         
         # Load data
-        records_loaded = loader.load_data(
-            db,
-            max_records=args.max_records,
-            include_laundering=include_laundering,
-            include_normal=include_normal
-        )
+        if args.bulk:
+            summary = loader.load_data_bulk(
+                db,
+                max_records=args.max_records,
+                include_laundering=include_laundering,
+                include_normal=include_normal,
+                chunk_rows=args.chunk_rows,
+                processes=args.processes
+            )
+            records_loaded = summary["records_loaded"]
+            print(f"Read {summary['records_read']} rows in {summary['seconds']}s ({summary['rows_per_second'] or 0:,} rows/sec)")
+            print(f"Skipped {summary['records_skipped']} filtered or duplicate rows")
+        else:
+            records_loaded = loader.load_data(
+                db,
+                max_records=args.max_records,
+                include_laundering=include_laundering,
+                include_normal=include_normal
+            )
         
         print(f"\n✓ Successfully loaded {records_loaded} records")
         
@@ -0,0 +1,44 @@
+"""Migration script for the index used by per-rule correction analytics."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from src.core.database import db_manager
+
+def migrate():
+    """Create the corrections(rule_id, created_at) index."""
+    print("🔄 Starting correction analytics migration...")
+    
+    try:
+        # Initialize database
+        db_manager.initialize_postgres()
+        engine = db_manager._postgres_engine
+        
+        # Rule metrics number each rule's corrections in date order
+        print("Creating index on corrections(rule_id, created_at)...")
+        with engine.begin() as conn:
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_corrections_rule_id_created_at 
+                ON corrections(rule_id, created_at)
+            """))
+        
+        print("\n📊 Migration Summary:")
+        print("  - corrections(rule_id, created_at) index: ✅ Created")
+        print("\n✅ Migration completed successfully!")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        db_manager.close_all()
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
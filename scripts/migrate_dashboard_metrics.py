@@ -0,0 +1,58 @@
+"""Migration script to create the dashboard metrics materialized view."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from src.core.database import db_manager
+from src.services.dashboard_metrics import VIEW_NAME, CREATE_VIEW_SQL, CREATE_VIEW_INDEX_SQL
+
+def migrate():
+    """Create the violation_metrics_daily materialized view and its unique index."""
+    print("🔄 Starting dashboard metrics migration...")
+    
+    try:
+        # Initialize database
+        db_manager.initialize_postgres()
+        engine = db_manager._postgres_engine
+        
+        # Daily rollup by status, severity and risk level, populated on creation
+        print(f"Creating {VIEW_NAME} materialized view...")
+        with engine.begin() as conn:
+            conn.execute(text(CREATE_VIEW_SQL))
+        
+        # Unique index lets the refresh task run REFRESH ... CONCURRENTLY
+        print(f"Creating unique index on {VIEW_NAME}...")
+        with engine.begin() as conn:
+            conn.execute(text(CREATE_VIEW_INDEX_SQL))
+        
+        # Verify view exists
+        with engine.connect() as conn:
+            result = conn.execute(text("SELECT to_regclass(:name)"), {"name": VIEW_NAME})
+            
+            if result.scalar():
+                print(f"✅ Verified: {VIEW_NAME} view exists")
+            else:
+                print(f"❌ Error: {VIEW_NAME} view not found")
+                return False
+        
+        print("\n📊 Migration Summary:")
+        print(f"  - {VIEW_NAME} materialized view: ✅ Created")
+        print(f"  - {VIEW_NAME} unique index: ✅ Created")
+        print("\n✅ Migration completed successfully!")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        db_manager.close_all()
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
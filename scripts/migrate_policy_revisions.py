@@ -0,0 +1,52 @@
+"""Migration script for incremental policy revisions."""
+
+import psycopg2
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.settings import settings
+
+def migrate():
+    """Run policy revision migration."""
+    print("🔄 Starting policy revision migration...")
+    
+    try:
+        conn = psycopg2.connect(
+            host=settings.postgres_host,
+            port=settings.postgres_port,
+            database=settings.postgres_db,
+            user=settings.postgres_user,
+            password=settings.postgres_password or ""
+        )
+        
+        cursor = conn.cursor()
+        
+        print("📝 Adding superseded_at column to compliance_rules...")
+        cursor.execute("""
+            ALTER TABLE compliance_rules 
+            ADD COLUMN IF NOT EXISTS superseded_at TIMESTAMP;
+        """)
+        
+        print("📝 Creating index on compliance_rules(policy_document_id, is_active)...")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_compliance_rules_policy_active 
+            ON compliance_rules(policy_document_id, is_active);
+        """)
+        
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        print("✅ Policy revision migration completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,61 @@
+"""Migration script to index predictions for batch scoring."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from src.core.database import db_manager
+
+def migrate():
+    """Index predictions by latest per record and drop superseded predictions."""
+    print("🔄 Starting prediction batch migration...")
+    
+    try:
+        # Initialize database
+        db_manager.initialize_postgres()
+        engine = db_manager._postgres_engine
+        
+        # High-risk views read the latest prediction per record
+        print("Creating index on predictions(record_id, predicted_at DESC)...")
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_predictions_record_id_predicted_at"))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_predictions_record_id_latest 
+                ON predictions(record_id, predicted_at DESC)
+            """))
+        
+        # Scoring now replaces earlier predictions; clear those left by previous runs
+        print("Removing superseded predictions...")
+        with engine.begin() as conn:
+            result = conn.execute(text("""
+                DELETE FROM predictions p
+                WHERE p.actual_violation IS NULL
+                  AND EXISTS (
+                      SELECT 1 FROM predictions newer
+                      WHERE newer.record_id = p.record_id
+                        AND newer.policy_id IS NOT DISTINCT FROM p.policy_id
+                        AND newer.predicted_at > p.predicted_at
+                  )
+            """))
+            removed = result.rowcount
+        
+        print("\n📊 Migration Summary:")
+        print("  - predictions(record_id, predicted_at DESC) index: ✅ Created")
+        print(f"  - Superseded predictions removed: {removed}")
+        print("\n✅ Migration completed successfully!")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        db_manager.close_all()
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
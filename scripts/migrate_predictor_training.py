@@ -0,0 +1,53 @@
+"""Migration script for the indexes used to label predictor training data."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from src.core.database import db_manager
+
+def migrate():
+    """Create the violations(record_identifier) and corrections(violation_id) indexes."""
+    print("🔄 Starting predictor training migration...")
+    
+    try:
+        # Initialize database
+        db_manager.initialize_postgres()
+        engine = db_manager._postgres_engine
+        
+        # Training labels each page of records by looking up their violations
+        print("Creating index on violations(record_identifier)...")
+        with engine.begin() as conn:
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_violations_record_identifier 
+                ON violations(record_identifier)
+            """))
+        
+        # False-positive corrections are joined per violation
+        print("Creating index on corrections(violation_id)...")
+        with engine.begin() as conn:
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_corrections_violation_id 
+                ON corrections(violation_id)
+            """))
+        
+        print("\n📊 Migration Summary:")
+        print("  - violations(record_identifier) index: ✅ Created")
+        print("  - corrections(violation_id) index: ✅ Created")
+        print("\n✅ Migration completed successfully!")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        db_manager.close_all()
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,68 @@
+"""Migration script to create the rule watermark table for delta monitoring."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from src.core.database import db_manager
+from src.models.rule_watermark import RuleWatermark
+from src.core.database import Base
+
+def migrate():
+    """Create rule_watermarks table and the company_records(updated_at) index."""
+    print("🔄 Starting rule watermark migration...")
+    
+    try:
+        # Initialize database
+        db_manager.initialize_postgres()
+        engine = db_manager._postgres_engine
+        
+        # Create rule watermarks table
+        print("Creating rule_watermarks table...")
+        Base.metadata.create_all(bind=engine, tables=[RuleWatermark.__table__])
+        
+        # Delta scans select records changed since the watermark
+        print("Creating index on company_records(updated_at)...")
+        with engine.begin() as conn:
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_company_records_updated_at 
+                ON company_records(updated_at)
+            """))
+        
+        print("✅ rule_watermarks table created successfully!")
+        
+        # Verify table exists
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT table_name 
+                FROM information_schema.tables 
+                WHERE table_schema = 'public' 
+                AND table_name = 'rule_watermarks'
+            """))
+            
+            if result.fetchone():
+                print("✅ Verified: rule_watermarks table exists")
+            else:
+                print("❌ Error: rule_watermarks table not found")
+                return False
+        
+        print("\n📊 Migration Summary:")
+        print("  - rule_watermarks table: ✅ Created")
+        print("  - company_records(updated_at) index: ✅ Created")
+        print("\n✅ Migration completed successfully!")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        db_manager.close_all()
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,59 @@
+"""Migration script for sharded scan job tracking."""
+
+import psycopg2
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.settings import settings
+
+def migrate():
+    """Run scan job migration."""
+    print("🔄 Starting scan job migration...")
+    
+    try:
+        conn = psycopg2.connect(
+            host=settings.postgres_host,
+            port=settings.postgres_port,
+            database=settings.postgres_db,
+            user=settings.postgres_user,
+            password=settings.postgres_password or ""
+        )
+        
+        cursor = conn.cursor()
+        
+        print("📝 Adding scan run columns to monitoring_jobs...")
+        # Scan runs are recorded by Celery tasks and have no name or schedule
+        cursor.execute("""
+            ALTER TABLE monitoring_jobs 
+            ALTER COLUMN job_name DROP NOT NULL,
+            ALTER COLUMN schedule_config DROP NOT NULL,
+            ADD COLUMN IF NOT EXISTS job_type VARCHAR(50),
+            ADD COLUMN IF NOT EXISTS started_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS result JSONB,
+            ADD COLUMN IF NOT EXISTS error_message TEXT;
+        """)
+        
+        print("📝 Creating index on monitoring_jobs(job_type)...")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_monitoring_jobs_job_type 
+            ON monitoring_jobs(job_type);
+        """)
+        
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        print("✅ Scan job migration completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
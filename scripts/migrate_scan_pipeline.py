@@ -0,0 +1,59 @@
+"""Migration script to create the scan checkpoint table."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from src.core.database import db_manager
+from src.models.scan_checkpoint import ScanCheckpoint
+from src.core.database import Base
+
+def migrate():
+    """Create scan_checkpoints table."""
+    print("🔄 Starting scan pipeline migration...")
+    
+    try:
+        # Initialize database
+        db_manager.initialize_postgres()
+        engine = db_manager._postgres_engine
+        
+        # Create scan checkpoints table
+        print("Creating scan_checkpoints table...")
+        Base.metadata.create_all(bind=engine, tables=[ScanCheckpoint.__table__])
+        
+        print("✅ scan_checkpoints table created successfully!")
+        
+        # Verify table exists
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT table_name 
+                FROM information_schema.tables 
+                WHERE table_schema = 'public' 
+                AND table_name = 'scan_checkpoints'
+            """))
+            
+            if result.fetchone():
+                print("✅ Verified: scan_checkpoints table exists")
+            else:
+                print("❌ Error: scan_checkpoints table not found")
+                return False
+        
+        print("\n📊 Migration Summary:")
+        print("  - scan_checkpoints table: ✅ Created")
+        print("\n✅ Migration completed successfully!")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        db_manager.close_all()
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,64 @@
+"""Migration script for the unique (rule_id, record_identifier) violation index."""
+
+import psycopg2
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.settings import settings
+
+def migrate():
+    """Run violation dedup migration."""
+    print("🔄 Starting violation dedup migration...")
+    
+    try:
+        conn = psycopg2.connect(
+            host=settings.postgres_host,
+            port=settings.postgres_port,
+            database=settings.postgres_db,
+            user=settings.postgres_user,
+            password=settings.postgres_password or ""
+        )
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        conn.autocommit = True
+        
+        cursor = conn.cursor()
+        
+        print("🔍 Checking for duplicate violations...")
+        cursor.execute("""
+            SELECT rule_id, record_identifier, COUNT(*)
+            FROM violations
+            GROUP BY rule_id, record_identifier
+            HAVING COUNT(*) > 1;
+        """)
+        duplicates = cursor.fetchall()
+        if duplicates:
+            print(f"❌ Found {len(duplicates)} (rule_id, record_identifier) pairs with duplicate violations:")
+            for rule_id, record_identifier, count in duplicates[:20]:
+                print(f"   rule={rule_id} record={record_identifier} count={count}")
+            print("   Resolve the duplicates before re-running this migration.")
+            cursor.close()
+            conn.close()
+            return False
+        
+        print("📝 Creating unique index on violations(rule_id, record_identifier)...")
+        cursor.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_violations_rule_record
+            ON violations(rule_id, record_identifier);
+        """)
+        
+        cursor.close()
+        conn.close()
+        
+        print("✅ Violation dedup migration completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,57 @@
+"""Migration script for asynchronous violation enrichment."""
+
+import psycopg2
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.settings import settings
+
+def migrate():
+    """Run violation enrichment migration."""
+    print("🔄 Starting violation enrichment migration...")
+    
+    try:
+        conn = psycopg2.connect(
+            host=settings.postgres_host,
+            port=settings.postgres_port,
+            database=settings.postgres_db,
+            user=settings.postgres_user,
+            password=settings.postgres_password or ""
+        )
+        
+        cursor = conn.cursor()
+        
+        print("📝 Adding enrichment columns to violations...")
+        # Existing violations were enriched synchronously, so they default to completed
+        cursor.execute("""
+            ALTER TABLE violations 
+            ADD COLUMN IF NOT EXISTS enrichment_status VARCHAR(20) NOT NULL DEFAULT 'completed',
+            ADD COLUMN IF NOT EXISTS enrichment_attempts INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS enrichment_started_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS enrichment_error TEXT;
+        """)
+        
+        print("📝 Creating index on violations(enrichment_status)...")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_violations_enrichment_status 
+            ON violations(enrichment_status);
+        """)
+        
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        print("✅ Violation enrichment migration completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
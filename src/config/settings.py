@@ -41,6 +41,57 @@ class Settings:
     llm_provider: str = field(default_factory=lambda: os.getenv("LLM_PROVIDER", "openai"))  # "openai" or "gemini"
     llm_model: str = field(default_factory=lambda: os.getenv("LLM_MODEL", "gpt-4"))
     
+    # LLM Batch Execution Configuration (rate limits are per provider)
+    llm_batch_concurrency: int = field(default_factory=lambda: int(os.getenv("LLM_BATCH_CONCURRENCY", "8")))
+    llm_max_retries: int = field(default_factory=lambda: int(os.getenv("LLM_MAX_RETRIES", "3")))
+    openai_rpm: int = field(default_factory=lambda: int(os.getenv("OPENAI_RPM", "500")))
+    openai_tpm: int = field(default_factory=lambda: int(os.getenv("OPENAI_TPM", "300000")))
+    gemini_rpm: int = field(default_factory=lambda: int(os.getenv("GEMINI_RPM", "60")))
+    gemini_tpm: int = field(default_factory=lambda: int(os.getenv("GEMINI_TPM", "120000")))
+    
+    # Rule Extraction Configuration (policies are split on page markers)
+    extraction_chunk_chars: int = field(default_factory=lambda: int(os.getenv("EXTRACTION_CHUNK_CHARS", "12000")))
+    extraction_concurrency: int = field(default_factory=lambda: int(os.getenv("EXTRACTION_CONCURRENCY", "4")))
+    
+    # LLM Response Cache Configuration
+    llm_cache_enabled: bool = field(default_factory=lambda: os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true")
+    llm_cache_ttl_seconds: int = field(default_factory=lambda: int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))))
+    llm_cache_disk_dir: Optional[str] = field(default_factory=lambda: os.getenv("LLM_CACHE_DISK_DIR"))
+    llm_cache_disk_max_entries: int = field(default_factory=lambda: int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "100000")))
+    
+    # Justification Mode Configuration ("auto", "template" or "llm")
+    justification_mode: str = field(default_factory=lambda: os.getenv("JUSTIFICATION_MODE", "auto"))
+    template_severities: str = field(default_factory=lambda: os.getenv("TEMPLATE_SEVERITIES", "low,medium,high"))
+    
+    # Violation Enrichment Configuration
+    enrichment_concurrency: int = field(default_factory=lambda: int(os.getenv("ENRICHMENT_CONCURRENCY", "4")))
+    enrichment_batch_size: int = field(default_factory=lambda: int(os.getenv("ENRICHMENT_BATCH_SIZE", "50")))
+    enrichment_max_attempts: int = field(default_factory=lambda: int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3")))
+    
+    # Sharded Scan Configuration (records per shard task, upper bound on shards)
+    scan_shard_size: int = field(default_factory=lambda: int(os.getenv("SCAN_SHARD_SIZE", "50000")))
+    scan_max_shards: int = field(default_factory=lambda: int(os.getenv("SCAN_MAX_SHARDS", "32")))
+    
+    # Local Scan Parallelism (1 evaluates in-process, 0 uses every core)
+    scan_processes: int = field(default_factory=lambda: int(os.getenv("SCAN_PROCESSES", "1")))
+    
+    # Delta Monitoring Configuration (re-check window before each rule's watermark)
+    delta_overlap_seconds: int = field(default_factory=lambda: int(os.getenv("DELTA_OVERLAP_SECONDS", "300")))
+    
+    # Model Registry Configuration (workers re-check the active version every poll interval)
+    model_registry_dir: str = field(default_factory=lambda: os.getenv("MODEL_REGISTRY_DIR", "./models"))
+    model_registry_poll_seconds: int = field(default_factory=lambda: int(os.getenv("MODEL_REGISTRY_POLL_SECONDS", "30")))
+    
+    # Predictor Training Configuration (records per partial_fit step)
+    predictor_training_chunk_size: int = field(default_factory=lambda: int(os.getenv("PREDICTOR_TRAINING_CHUNK_SIZE", "10000")))
+    
+    # API Response Cache Configuration (dashboard and stats endpoints, invalidated on writes)
+    response_cache_enabled: bool = field(default_factory=lambda: os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true")
+    response_cache_ttl_seconds: int = field(default_factory=lambda: int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30")))
+    
+    # Rule Accuracy Trend Configuration (weight of each new correction in a rule's EWMA accuracy)
+    rule_accuracy_ewma_alpha: float = field(default_factory=lambda: float(os.getenv("RULE_ACCURACY_EWMA_ALPHA", "0.1")))
+    
     # Email Configuration
     SMTP_HOST: str = field(default_factory=lambda: os.getenv("SMTP_HOST", "smtp.gmail.com"))
     SMTP_PORT: int = field(default_factory=lambda: int(os.getenv("SMTP_PORT", "587")))
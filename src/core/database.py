@@ -148,6 +148,12 @@ class DatabaseManager:
             raise RuntimeError("MongoDB not initialized. Call initialize_mongodb() first.")
         return self._mongo_db
     
+    def ensure_redis(self) -> Redis:
+        """Get Redis client instance, connecting on first use (for workers and scripts)."""
+        if not self._redis_client:
+            self.initialize_redis()
+        return self._redis_client
+    
     def get_redis(self) -> Redis:
         """Get Redis client instance."""
         if not self._redis_client:
@@ -18,6 +18,7 @@ from src.routes.notifications import router as notifications_router
 from src.routes.audit import router as audit_router
 from src.routes.feedback import router as feedback_router
 from src.middleware.audit_logger import AuditLoggerMiddleware
+from src.services.response_cache import install_invalidation_listeners
 
 # Setup logging
 setup_logging()
@@ -41,6 +42,9 @@ async def lifespan(app: FastAPI):
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created")
         
+        # Cached API responses are invalidated when their tables change
+        install_invalidation_listeners()
+        
     except Exception as e:
         logger.error("Failed to initialize database connections", error=str(e))
         raise
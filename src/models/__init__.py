@@ -7,6 +7,9 @@ from .job import MonitoringJob, JobExecution
 from .company_record import CompanyRecord
 from .reasoning_trace import ReasoningTrace
 from .remediation_progress import RemediationProgress
+from .scan_checkpoint import ScanCheckpoint
+from .rule_watermark import RuleWatermark
+from .rule_accuracy import RuleAccuracyDaily, RuleAccuracyTrend
 
 __all__ = [
     "PolicyDocument",
@@ -19,4 +22,8 @@ __all__ = [
     "CompanyRecord",
     "ReasoningTrace",
     "RemediationProgress",
+    "ScanCheckpoint",
+    "RuleWatermark",
+    "RuleAccuracyDaily",
+    "RuleAccuracyTrend",
 ]
@@ -29,7 +29,7 @@ class CompanyRecord(Base):
     
     # Metadata
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     def __repr__(self):
         return f"<CompanyRecord(id={self.id}, type={self.record_type})>"
@@ -1,7 +1,7 @@
 """Correction tracking models."""
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Float, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Float, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -21,9 +21,13 @@ class Correction(Base):
     """Tracks human corrections to AI decisions."""
     
     __tablename__ = "corrections"
+    __table_args__ = (
+        # Per-rule metrics and trend rebuilds read each rule's corrections in date order
+        Index("ix_corrections_rule_id_created_at", "rule_id", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    violation_id = Column(UUID(as_uuid=True), ForeignKey("violations.id"), nullable=False)
+    violation_id = Column(UUID(as_uuid=True), ForeignKey("violations.id"), nullable=False, index=True)
     rule_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rules.id"), nullable=False)
     rule_name = Column(String(255), nullable=False)
     original_decision = Column(String(50), nullable=False, default="violation_detected")
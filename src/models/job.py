@@ -19,18 +19,25 @@ class JobStatus(str, enum.Enum):
 
 
 class MonitoringJob(Base):
-    """Scheduled monitoring job."""
+    """Scheduled monitoring job, or one run of a background scan."""
     
     __tablename__ = "monitoring_jobs"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_name = Column(String(255), nullable=False)
-    schedule_config = Column(JSONB, nullable=False)
+    job_name = Column(String(255), nullable=True)
+    schedule_config = Column(JSONB, nullable=True)
     last_run_at = Column(DateTime, nullable=True)
     next_run_at = Column(DateTime, nullable=True)
     status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.SCHEDULED)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     
+    # Scan run fields (set by the Celery scan tasks)
+    job_type = Column(String(50), nullable=True, index=True)  # continuous_monitoring/manual_scan
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    result = Column(JSONB, nullable=True)  # Summary, aggregated from shard results
+    error_message = Column(Text, nullable=True)
+    
     # Relationships
     executions = relationship("JobExecution", back_populates="job", cascade="all, delete-orphan")
     
@@ -1,6 +1,6 @@
 """Prediction model for ML-based risk analysis."""
 
-from sqlalchemy import Column, String, Float, DateTime, JSON
+from sqlalchemy import Column, String, Float, DateTime, JSON, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime
@@ -11,6 +11,10 @@ class Prediction(Base):
     """Model for storing violation predictions."""
     
     __tablename__ = "predictions"
+    __table_args__ = (
+        # Latest prediction per record, read by get_high_risk_records (DISTINCT ON ... predicted_at DESC)
+        Index("ix_predictions_record_id_latest", "record_id", text("predicted_at DESC")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     record_id = Column(String, nullable=False, index=True)
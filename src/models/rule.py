@@ -33,6 +33,7 @@ class ComplianceRule(Base):
     confidence_score = Column(String(10), nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    superseded_at = Column(DateTime, nullable=True)  # Set when a policy revision replaces the rule's page
     
     # Rule graph fields
     parent_rule_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rules.id"), nullable=True)
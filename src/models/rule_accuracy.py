@@ -0,0 +1,39 @@
+"""Incrementally maintained rule accuracy models."""
+
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.core.database import Base
+
+
+class RuleAccuracyDaily(Base):
+    """Correction counts per rule and day, summed for rolling accuracy windows."""
+    
+    __tablename__ = "rule_accuracy_daily"
+    
+    rule_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rules.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    true_positives = Column(Integer, nullable=False, default=0)
+    false_positives = Column(Integer, nullable=False, default=0)
+    needs_review = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<RuleAccuracyDaily(rule_id={self.rule_id}, day={self.day}, total={self.total})>"
+
+
+class RuleAccuracyTrend(Base):
+    """Running accuracy state per rule, updated as each correction is recorded."""
+    
+    __tablename__ = "rule_accuracy_trends"
+    
+    rule_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rules.id", ondelete="CASCADE"), primary_key=True)
+    rule_name = Column(String(255), nullable=False)
+    total_reviews = Column(Integer, nullable=False, default=0)
+    ewma_accuracy = Column(Float, nullable=False)  # 0.0 to 1.0, recent corrections weighted most
+    last_correction_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<RuleAccuracyTrend(rule_id={self.rule_id}, ewma_accuracy={self.ewma_accuracy})>"
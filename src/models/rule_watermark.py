@@ -0,0 +1,21 @@
+"""Rule watermark model."""
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.core.database import Base
+
+
+class RuleWatermark(Base):
+    """High-water mark of the records a rule has been evaluated against."""
+    
+    __tablename__ = "rule_watermarks"
+    
+    rule_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rules.id", ondelete="CASCADE"), primary_key=True)
+    records_through = Column(DateTime, nullable=False)  # Latest CompanyRecord.updated_at evaluated
+    rule_version = Column(DateTime, nullable=False)  # ComplianceRule.updated_at when last backfilled
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<RuleWatermark(rule_id={self.rule_id}, records_through={self.records_through})>"
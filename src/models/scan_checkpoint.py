@@ -0,0 +1,29 @@
+"""Scan checkpoint model."""
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from src.core.database import Base
+
+
+class ScanCheckpoint(Base):
+    """Progress of a chunked violation scan, used to resume interrupted runs."""
+    
+    __tablename__ = "scan_checkpoints"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    scan_key = Column(String(255), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default="running")  # running/completed/failed
+    last_record_id = Column(UUID(as_uuid=True), nullable=True)  # Last record of the last committed chunk
+    records_scanned = Column(Integer, nullable=False, default=0)
+    violations_detected = Column(Integer, nullable=False, default=0)
+    chunks_completed = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<ScanCheckpoint(scan_key={self.scan_key}, status={self.status}, records={self.records_scanned})>"
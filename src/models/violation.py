@@ -1,7 +1,7 @@
 """Violation models."""
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLEnum, Integer
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLEnum, Integer, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -18,6 +18,14 @@ class ViolationStatus(str, enum.Enum):
     RESOLVED = "resolved"
 
 
+class EnrichmentStatus(str, enum.Enum):
+    """LLM enrichment status of a violation."""
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class ReviewAction(str, enum.Enum):
     """Review action types."""
     CONFIRM = "confirm"
@@ -29,6 +37,12 @@ class Violation(Base):
     """Detected compliance violation."""
     
     __tablename__ = "violations"
+    __table_args__ = (
+        # One violation per rule and record; scans rely on it for ON CONFLICT
+        UniqueConstraint("rule_id", "record_identifier", name="uq_violations_rule_record"),
+        # Predictor training labels records by identifier across all rules
+        Index("ix_violations_record_identifier", "record_identifier"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     rule_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rules.id"), nullable=False)
@@ -46,6 +60,13 @@ class Violation(Base):
     risk_level = Column(String(20), nullable=True)  # Low/Medium/High/Critical
     risk_factors = Column(JSONB, nullable=True)  # Breakdown of risk calculation
     
+    # Enrichment fields (justification, remediation and reasoning are generated after detection)
+    enrichment_status = Column(String(20), nullable=False, default=EnrichmentStatus.COMPLETED.value, index=True)
+    enrichment_attempts = Column(Integer, nullable=False, default=0)
+    enrichment_started_at = Column(DateTime, nullable=True)
+    enriched_at = Column(DateTime, nullable=True)
+    enrichment_error = Column(Text, nullable=True)
+    
     # Review workflow fields
     assigned_to = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     is_false_positive = Column(String(10), nullable=True, default="false")  # Using string for SQLite compatibility
@@ -1,6 +1,6 @@
 """Production-ready prompt templates for violation justification."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 from dataclasses import dataclass
 import json
 
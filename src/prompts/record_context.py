@@ -0,0 +1,54 @@
+"""Reduce violating records to the context prompts need."""
+
+from typing import Any, Dict, Optional, Set
+
+# Per-record identifiers and bookkeeping columns; they never change the
+# explanation but would make every prompt (and LLM cache key) unique
+IDENTIFIER_FIELDS = frozenset({
+    "id",
+    "record_id",
+    "record_identifier",
+    "transaction_id",
+    "created_at",
+    "updated_at",
+})
+
+
+def condition_fields(condition: Optional[Dict[str, Any]]) -> Set[str]:
+    """
+    Collect the record fields a rule condition reads.
+    
+    Args:
+        condition: Rule condition, possibly with additional_conditions
+    
+    Returns:
+        Field names referenced anywhere in the condition
+    """
+    if not isinstance(condition, dict):
+        return set()
+    
+    fields = {condition["field"]} if condition.get("field") else set()
+    for nested in condition.get("additional_conditions") or []:
+        fields |= condition_fields(nested)
+    return fields
+
+
+def prompt_record(record_data: Dict[str, Any], condition: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Reduce a record to the fields a prompt should show.
+    
+    With a condition, only the fields it reads are kept, so violations of
+    the same rule with the same relevant values share one prompt and one
+    LLM cache entry. Without one, identifier fields are dropped.
+    
+    Args:
+        record_data: Violating record
+        condition: Rule condition the record failed
+    
+    Returns:
+        Record subset for the prompt
+    """
+    fields = condition_fields(condition) - IDENTIFIER_FIELDS
+    if fields:
+        return {name: record_data[name] for name in sorted(fields) if name in record_data}
+    return {name: value for name, value in record_data.items() if name not in IDENTIFIER_FIELDS}
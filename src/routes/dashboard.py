@@ -1,13 +1,13 @@
 """Dashboard and analytics routes."""
 
+from typing import Any, Dict
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
-from typing import Optional
 
 from src.core.database import db_manager
-from src.models import Violation, ComplianceRule, CompanyRecord
-from src.services import ViolationDetector, RiskScoringEngine
+from src.services.dashboard_metrics import DashboardMetrics, VIEW_NAME
+from src.services.response_cache import cached_response, get_response_cache
 
 router = APIRouter(prefix="/api/v1/dashboard", tags=["dashboard"])
 
@@ -22,95 +22,37 @@ def get_db():
 
 
 @router.get("/metrics")
+@cached_response(VIEW_NAME, "compliance_rules")
 async def get_dashboard_metrics(db: Session = Depends(get_db)):
     """
     Get key dashboard metrics.
     
+    Violation counts come from the violation_metrics_daily rollup,
+    refreshed every 5 minutes.
+    
     Args:
         db: Database session
         
     Returns:
         Dashboard metrics
     """
-    # Total violations (all)
-    total_violations = db.query(Violation).count()
-    
-    # Active violations (not resolved)
-    active_violations = db.query(Violation).filter(
-        Violation.status != "resolved"
-    ).count()
-    
-    # Total rules
-    total_rules = db.query(ComplianceRule).filter(
-        ComplianceRule.is_active == True
-    ).count()
-    
-    # Total records
-    total_records = db.query(CompanyRecord).count()
-    
-    # Calculate compliance score based on ACTIVE (non-resolved) violations only
-    # Use a more reasonable penalty scale for better scores
-    if active_violations == 0:
-        compliance_score = 100
-    else:
-        # Get severity counts for active violations only
-        severity_counts = {
-            "critical": db.query(Violation).filter(
-                Violation.severity == "critical",
-                Violation.status != "resolved"
-            ).count(),
-            "high": db.query(Violation).filter(
-                Violation.severity == "high",
-                Violation.status != "resolved"
-            ).count(),
-            "medium": db.query(Violation).filter(
-                Violation.severity == "medium",
-                Violation.status != "resolved"
-            ).count(),
-            "low": db.query(Violation).filter(
-                Violation.severity == "low",
-                Violation.status != "resolved"
-            ).count()
-        }
-        
-        # Calculate penalty with adjusted scale (less harsh)
-        # Critical: 5 points each, High: 2 points, Medium: 1 point, Low: 0.5 points
-        penalty = (
-            severity_counts["critical"] * 5 +
-            severity_counts["high"] * 2 +
-            severity_counts["medium"] * 1 +
-            severity_counts["low"] * 0.5
-        )
-        
-        # Calculate score (minimum 0, maximum 100)
-        # Use a logarithmic scale for better distribution
-        if penalty <= 50:
-            compliance_score = int(100 - penalty)
-        else:
-            # For high penalties, use logarithmic decay
-            compliance_score = int(50 * (1 - (penalty - 50) / (penalty + 50)))
-        
-        compliance_score = max(0, min(100, compliance_score))
-    
-    # Violations by severity (all violations, not just active)
-    violations_by_severity = {
-        "critical": db.query(Violation).filter(Violation.severity == "critical").count(),
-        "high": db.query(Violation).filter(Violation.severity == "high").count(),
-        "medium": db.query(Violation).filter(Violation.severity == "medium").count(),
-        "low": db.query(Violation).filter(Violation.severity == "low").count()
-    }
+    metrics = DashboardMetrics(db)
+    summary = metrics.summary()
     
     return {
-        "total_violations": total_violations,
-        "active_violations": active_violations,
-        "total_rules": total_rules,
-        "total_records": total_records,
-        "compliance_score": compliance_score,
-        "violations_by_severity": violations_by_severity
+        "total_violations": summary["total"],
+        "active_violations": summary["active"],
+        "total_rules": metrics.active_rule_count(),
+        "total_records": metrics.record_count(),
+        # Compliance score is based on ACTIVE (non-resolved) violations only
+        "compliance_score": DashboardMetrics.compliance_score(summary["active_by_severity"]),
+        # Violations by severity (all violations, not just active)
+        "violations_by_severity": summary["by_severity"]
     }
 
 
 @router.get("/risk-score")
+@cached_response(VIEW_NAME)
 async def get_risk_score(db: Session = Depends(get_db)):
     """
     Get current compliance risk score.
@@ -121,57 +63,20 @@ async def get_risk_score(db: Session = Depends(get_db)):
     Returns:
         Risk score and breakdown
     """
-    # Count by severity efficiently (only non-resolved)
-    severity_breakdown = {
-        "critical": db.query(Violation).filter(
-            Violation.severity == "critical",
-            Violation.status != "resolved"
-        ).count(),
-        "high": db.query(Violation).filter(
-            Violation.severity == "high",
-            Violation.status != "resolved"
-        ).count(),
-        "medium": db.query(Violation).filter(
-            Violation.severity == "medium",
-            Violation.status != "resolved"
-        ).count(),
-        "low": db.query(Violation).filter(
-            Violation.severity == "low",
-            Violation.status != "resolved"
-        ).count()
-    }
-    
-    total_violations = sum(severity_breakdown.values())
-    
-    # Calculate compliance score with adjusted scale
-    if total_violations == 0:
-        score = 100
-    else:
-        # Calculate penalty with adjusted scale
-        penalty = (
-            severity_breakdown["critical"] * 5 +
-            severity_breakdown["high"] * 2 +
-            severity_breakdown["medium"] * 1 +
-            severity_breakdown["low"] * 0.5
-        )
-        
-        # Calculate score with logarithmic scale for better distribution
-        if penalty <= 50:
-            score = int(100 - penalty)
-        else:
-            score = int(50 * (1 - (penalty - 50) / (penalty + 50)))
-        
-        score = max(0, min(100, score))
+    # Severity breakdown of non-resolved violations
+    severity_breakdown = DashboardMetrics(db).summary()["active_by_severity"]
+    score = DashboardMetrics.compliance_score(severity_breakdown)
     
     return {
         "score": score,
-        "total_violations": total_violations,
+        "total_violations": sum(severity_breakdown.values()),
         "severity_breakdown": severity_breakdown,
         "status": "healthy" if score >= 80 else "at_risk" if score >= 60 else "critical"
     }
 
 
 @router.get("/trends")
+@cached_response(VIEW_NAME)
 async def get_trends(db: Session = Depends(get_db)):
     """
     Get violation trends over time.
@@ -182,35 +87,14 @@ async def get_trends(db: Session = Depends(get_db)):
     Returns:
         Trend data
     """
-    # Get violations grouped by date
-    result = db.execute(
-        text("""
-            SELECT 
-                DATE(detected_at) as date,
-                COUNT(*) as count,
-                severity
-            FROM violations
-            WHERE detected_at >= CURRENT_DATE - INTERVAL '30 days'
-            GROUP BY DATE(detected_at), severity
-            ORDER BY date DESC
-        """)
-    )
-    
-    trends = []
-    for row in result:
-        trends.append({
-            "date": str(row[0]),
-            "count": row[1],
-            "severity": row[2]
-        })
-    
     return {
-        "trends": trends,
+        "trends": DashboardMetrics(db).daily_by_severity(days=30),
         "period": "30_days"
     }
 
 
 @router.get("/risk-distribution")
+@cached_response(VIEW_NAME)
 async def get_risk_distribution(db: Session = Depends(get_db)):
     """
     Get violation count by risk level.
@@ -221,19 +105,7 @@ async def get_risk_distribution(db: Session = Depends(get_db)):
     Returns:
         Risk distribution with counts for each level
     """
-    # Count violations by risk level
-    risk_distribution = {
-        "low": 0,
-        "medium": 0,
-        "high": 0,
-        "critical": 0
-    }
-    
-    for level in ["Low", "Medium", "High", "Critical"]:
-        count = db.query(Violation).filter(
-            Violation.risk_level == level
-        ).count()
-        risk_distribution[level.lower()] = count
+    risk_distribution = DashboardMetrics(db).summary()["by_risk_level"]
     
     return {
         "distribution": risk_distribution,
@@ -242,6 +114,7 @@ async def get_risk_distribution(db: Session = Depends(get_db)):
 
 
 @router.get("/risk-trend")
+@cached_response(VIEW_NAME)
 async def get_risk_trend(
     days: int = Query(default=30, ge=1, le=90),
     db: Session = Depends(get_db)
@@ -256,10 +129,24 @@ async def get_risk_trend(
     Returns:
         Daily risk trend data
     """
-    risk_engine = RiskScoringEngine()
-    trend_data = risk_engine.calculate_risk_trend(db, days)
+    trend_data = DashboardMetrics(db).daily_risk(days)
     
     return {
         "trend": trend_data,
         "period_days": days
     }
+
+
+@router.get("/cache/metrics")
+async def get_response_cache_metrics() -> Dict[str, Any]:
+    """
+    Get response cache hit ratio and latency for dashboard and stats endpoints.
+    
+    Returns:
+        Overall hit rate and per-route hits, misses and p50/p95 latency in ms
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **cache.get_metrics()}
@@ -8,6 +8,7 @@ import logging
 
 from src.core.database import get_db
 from src.services.analytics_engine import AnalyticsEngine
+from src.services.response_cache import cached_response
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,7 @@ def parse_date(date_str: Optional[str]) -> Optional[datetime]:
 
 
 @router.get("/metrics")
+@cached_response("corrections")
 async def get_metrics(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
 
 from src.services.llm.factory import create_llm_router, create_llm_client
+from src.services.llm.cache import get_llm_cache
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -56,6 +57,21 @@ async def get_llm_metrics() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cache/metrics")
+async def get_llm_cache_metrics() -> Dict[str, Any]:
+    """
+    Get LLM response cache hit and miss metrics.
+    
+    Returns:
+        Cache hit, miss and error counts with hit rate
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **cache.get_metrics()}
+
+
 @router.post("/test")
 async def test_llm_provider(provider: str) -> Dict[str, Any]:
     """
@@ -109,6 +125,10 @@ async def reset_llm_metrics() -> Dict[str, str]:
     try:
         router_instance = get_llm_router()
         router_instance.reset_all_metrics()
+        
+        cache = get_llm_cache()
+        if cache is not None:
+            cache.reset_metrics()
         return {"message": "Metrics reset successfully"}
     except Exception as e:
         logger.error(f"Failed to reset metrics: {e}")
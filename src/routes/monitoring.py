@@ -6,8 +6,14 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 
 from src.core.database import get_db
-from src.models.job import MonitoringJob
-from src.workers.tasks import scan_violations_task, continuous_monitoring_task
+from src.models.job import MonitoringJob, JobStatus
+from src.services.violation_enricher import ViolationEnricher
+from src.workers.tasks import (
+    scan_violations_task,
+    continuous_monitoring_task,
+    enrich_violations_task,
+    rescore_violations_task
+)
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/v1/monitoring", tags=["monitoring"])
@@ -51,7 +57,7 @@ def get_monitoring_status(db: Session = Depends(get_db)):
     # Get last completed scan
     last_scan = db.query(MonitoringJob).filter(
         MonitoringJob.job_type.in_(["continuous_monitoring", "manual_scan"]),
-        MonitoringJob.status == "completed"
+        MonitoringJob.status == JobStatus.COMPLETED
     ).order_by(MonitoringJob.completed_at.desc()).first()
     
     # Count scans today
@@ -125,6 +131,50 @@ def trigger_immediate_monitoring():
         raise HTTPException(status_code=500, detail=f"Failed to trigger monitoring: {str(e)}")
 
 
+@router.get("/enrichment")
+def get_enrichment_metrics(window_hours: int = 24, db: Session = Depends(get_db)):
+    """
+    Get violation enrichment backlog and latency.
+    Latency is measured from detection to enrichment over the window.
+    """
+    return ViolationEnricher(db).metrics(window_hours=window_hours)
+
+
+@router.post("/enrichment", response_model=dict)
+def trigger_enrichment():
+    """
+    Start draining the violation enrichment backlog now.
+    """
+    try:
+        task = enrich_violations_task.delay()
+        
+        return {
+            "task_id": task.id,
+            "message": "Violation enrichment started",
+            "status": "queued"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to trigger enrichment: {str(e)}")
+
+
+@router.post("/rescore", response_model=dict)
+def trigger_rescore():
+    """
+    Recompute risk scores for all violations in the background.
+    Use after changing risk weights or thresholds.
+    """
+    try:
+        task = rescore_violations_task.delay()
+        
+        return {
+            "task_id": task.id,
+            "message": "Violation rescoring started",
+            "status": "queued"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to trigger rescoring: {str(e)}")
+
+
 @router.get("/jobs", response_model=List[JobStatusResponse])
 def get_monitoring_jobs(
     limit: int = 20,
@@ -142,7 +192,10 @@ def get_monitoring_jobs(
         query = query.filter(MonitoringJob.job_type == job_type)
     
     if status:
-        query = query.filter(MonitoringJob.status == status)
+        try:
+            query = query.filter(MonitoringJob.status == JobStatus(status))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid job status: {status}")
     
     jobs = query.order_by(MonitoringJob.started_at.desc()).limit(limit).all()
     
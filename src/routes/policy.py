@@ -14,9 +14,10 @@ from src.schemas import (
     PolicyDocumentResponse,
     PolicyUploadResponse,
     ComplianceRuleResponse,
-    RuleExtractionResponse
+    RuleExtractionResponse,
+    PolicyRevisionResponse
 )
-from src.services import PDFExtractor, RuleExtractor
+from src.services import PDFExtractor, RuleExtractor, PolicyRevisionService
 from src.models.policy import PolicyStatus
 from src.models.rule import Severity
 
@@ -84,7 +85,7 @@ async def upload_policy(
                 file_hash=file_hash,
                 status=PolicyStatus.PROCESSED,
                 extracted_text=extraction_result["text"],
-                metadata=extraction_result["metadata"]
+                document_metadata=extraction_result["metadata"]
             )
             
             db.add(policy)
@@ -176,15 +177,20 @@ async def extract_rules(
         logger.info(
             "Rules extracted successfully",
             policy_id=policy_id,
-            rules_count=len(saved_rules)
+            rules_count=len(saved_rules),
+            failed_pages=rule_extractor.last_failed_pages
         )
         
+        message = f"Extracted {len(saved_rules)} rules successfully"
+        if rule_extractor.last_failed_pages:
+            message += f" (extraction failed for pages {', '.join(rule_extractor.last_failed_pages)})"
+        
         return RuleExtractionResponse(
             policy_id=policy.id,
             rules_extracted=len(saved_rules),
             rules=[ComplianceRuleResponse.model_validate(r) for r in saved_rules],
-            status="success",
-            message=f"Extracted {len(saved_rules)} rules successfully"
+            status="partial" if rule_extractor.last_failed_pages else "success",
+            message=message
         )
         
     except HTTPException:
@@ -194,6 +200,110 @@ async def extract_rules(
         raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
 
 
+@router.post("/{policy_id}/revise", response_model=PolicyRevisionResponse)
+async def revise_policy(
+    policy_id: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a revised version of a policy PDF.
+    
+    Pages are matched to the current version by content hash. Rules on
+    unchanged pages are kept, rules on edited or removed pages are
+    superseded, and rules are extracted from the changed pages only.
+    
+    Args:
+        policy_id: Policy document ID
+        file: Revised PDF file
+        db: Database session
+        
+    Returns:
+        Revision summary with the newly extracted rules
+    """
+    try:
+        if not file.filename.endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+        
+        policy = db.query(PolicyDocument).filter(
+            PolicyDocument.id == policy_id
+        ).first()
+        
+        if not policy:
+            raise HTTPException(status_code=404, detail="Policy not found")
+        
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+            content = await file.read()
+            tmp_file.write(content)
+            tmp_path = Path(tmp_file.name)
+        
+        try:
+            pdf_extractor = PDFExtractor()
+            file_hash = pdf_extractor.calculate_file_hash(tmp_path)
+            
+            if file_hash == policy.file_hash:
+                return PolicyRevisionResponse(
+                    policy_id=policy.id,
+                    filename=policy.filename,
+                    pages_changed=[],
+                    pages_removed=[],
+                    rules_kept=db.query(ComplianceRule).filter(
+                        ComplianceRule.policy_document_id == policy.id,
+                        ComplianceRule.is_active == True
+                    ).count(),
+                    rules_superseded=0,
+                    rules_extracted=0,
+                    rules=[],
+                    status="unchanged",
+                    message="Revision is identical to the current policy"
+                )
+            
+            existing = db.query(PolicyDocument).filter(
+                PolicyDocument.file_hash == file_hash
+            ).first()
+            
+            if existing:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Policy document already exists with ID: {existing.id}"
+                )
+            
+            extraction_result = pdf_extractor.extract_text(tmp_path)
+            revision = PolicyRevisionService(db).revise(
+                policy,
+                filename=file.filename,
+                file_hash=file_hash,
+                file_size=tmp_path.stat().st_size,
+                extraction_result=extraction_result
+            )
+            
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        
+        return PolicyRevisionResponse(
+            policy_id=policy.id,
+            filename=policy.filename,
+            pages_changed=revision["pages_changed"],
+            pages_removed=revision["pages_removed"],
+            rules_kept=revision["rules_kept"],
+            rules_superseded=revision["rules_superseded"],
+            rules_extracted=len(revision["rules"]),
+            rules=[ComplianceRuleResponse.model_validate(r) for r in revision["rules"]],
+            status="success",
+            message=(
+                f"Re-extracted {len(revision['pages_changed'])} changed pages: "
+                f"{len(revision['rules'])} new rules, {revision['rules_superseded']} superseded"
+            )
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error("Policy revision failed", error=str(e), policy_id=policy_id)
+        raise HTTPException(status_code=500, detail=f"Revision failed: {str(e)}")
+
+
 @router.get("", response_model=List[PolicyDocumentResponse])
 async def list_policies(db: Session = Depends(get_db)):
     """
@@ -3,16 +3,24 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import logging
 
 from src.core.database import get_db
+from src.services.model_registry import ModelRegistryError
+from src.services.response_cache import cached_response
 from src.services.predictive_analytics import (
     get_predictor,
+    train_predictor,
+    list_model_versions,
+    activate_model_version,
+    resolve_record_ids,
+    save_predictions,
     get_high_risk_records,
     simulate_what_if
 )
 from src.models.prediction import Prediction
+from src.workers.tasks import predict_records_task, train_predictor_task
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +33,12 @@ class PredictionRequest(BaseModel):
     policy_id: Optional[str] = None
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request model for batch violation prediction."""
+    records: List[Dict[str, Any]] = Field(..., min_length=1, max_length=50000)
+    policy_id: Optional[str] = None
+
+
 class WhatIfRequest(BaseModel):
     """Request model for what-if simulation."""
     record: Dict[str, Any]
@@ -34,22 +48,36 @@ class WhatIfRequest(BaseModel):
 @router.post("/train")
 async def train_model(
     policy_id: Optional[str] = None,
+    background: bool = False,
     db: Session = Depends(get_db)
 ):
     """
-    Train the ML model on historical violations.
+    Train the ML model on company records labelled by confirmed violations.
+    
+    The trained model is published to the model registry as a new version
+    and picked up by every worker on its next registry poll.
     
     - **policy_id**: Optional policy ID to train on specific policy violations
+    - **background**: Train in a Celery worker instead of the request (for large tables)
     """
     try:
-        predictor = get_predictor()
-        result = predictor.train_model(db, policy_id)
+        if background:
+            task = train_predictor_task.delay(policy_id=policy_id)
+            return {
+                "task_id": task.id,
+                "message": "Model training started",
+                "status": "queued"
+            }
+        
+        result = train_predictor(db, policy_id)
         
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["message"])
         
         return result
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error training model: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -63,6 +91,10 @@ async def predict_violation(
     """
     Predict violation probability for a record.
     
+    The prediction is stored under the record's CompanyRecord id (matched
+    by id or transaction_id); records matching no company record are
+    predicted but not stored.
+    
     - **record**: Record data to analyze
     - **policy_id**: Optional policy ID for context
     """
@@ -70,32 +102,85 @@ async def predict_violation(
         predictor = get_predictor()
         prediction = predictor.predict_violation(request.record)
         
-        # Save prediction to database
-        db_prediction = Prediction(
-            record_id=request.record.get('transaction_id', 'unknown'),
-            policy_id=request.policy_id,
-            violation_probability=prediction['violation_probability'],
-            confidence_score=prediction['confidence_score'],
-            risk_level=prediction['risk_level'],
-            risk_factors=prediction['risk_factors'],
-            recommendations=prediction['recommendations'],
-            model_version=prediction['model_version']
-        )
-        db.add(db_prediction)
+        # Save prediction to database when the record is a known company record
+        record_ids = resolve_record_ids(db, [request.record])
+        prediction_ids = save_predictions(db, record_ids, [prediction], request.policy_id)
         db.commit()
-        db.refresh(db_prediction)
         
         return {
             **prediction,
-            "prediction_id": str(db_prediction.id),
-            "record_id": db_prediction.record_id
+            "prediction_id": str(prediction_ids[0]) if prediction_ids[0] else None,
+            "record_id": record_ids[0]
         }
-        
+    
     except Exception as e:
         logger.error(f"Error predicting violation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/batch")
+async def predict_batch(
+    request: BatchPredictionRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Predict violation probability for many records in one model pass.
+    
+    Predictions are stored as for /predict, under the CompanyRecord id.
+    
+    - **records**: Records to analyze (up to 50,000)
+    - **policy_id**: Optional policy ID for context
+    """
+    try:
+        predictor = get_predictor()
+        predictions = predictor.predict_batch(request.records)
+        
+        # Save predictions of known company records in one insert
+        record_ids = resolve_record_ids(db, request.records)
+        prediction_ids = save_predictions(db, record_ids, predictions, request.policy_id)
+        db.commit()
+        
+        return {
+            "count": len(predictions),
+            "model_version": predictor.model_version,
+            "predictions": [
+                {
+                    **prediction,
+                    "prediction_id": str(prediction_id) if prediction_id else None,
+                    "record_id": record_id
+                }
+                for prediction, prediction_id, record_id in zip(predictions, prediction_ids, record_ids)
+            ]
+        }
+    
+    except Exception as e:
+        logger.error(f"Error predicting batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/score-records")
+async def score_records(policy_id: Optional[str] = None):
+    """
+    Score all company records in the background.
+    
+    Results are stored as predictions and served by /high-risk.
+    
+    - **policy_id**: Optional policy ID recorded on the predictions
+    """
+    try:
+        task = predict_records_task.delay(policy_id=policy_id)
+        
+        return {
+            "task_id": task.id,
+            "message": "Record scoring started",
+            "status": "queued"
+        }
+    
+    except Exception as e:
+        logger.error(f"Error triggering record scoring: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/risk-score/{record_id}")
 async def get_risk_score(
     record_id: str,
@@ -104,7 +189,7 @@ async def get_risk_score(
     """
     Get the latest risk score for a specific record.
     
-    - **record_id**: ID of the record to get risk score for
+    - **record_id**: CompanyRecord ID of the record to get risk score for
     """
     try:
         # Get latest prediction for this record
@@ -119,7 +204,7 @@ async def get_risk_score(
             )
         
         return prediction.to_dict()
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -150,7 +235,7 @@ async def get_high_risk(
             "threshold": threshold,
             "policy_id": policy_id
         }
-        
+    
     except Exception as e:
         logger.error(f"Error getting high-risk records: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -175,13 +260,14 @@ async def what_if_simulation(request: WhatIfRequest):
     try:
         result = await simulate_what_if(request.record, request.changes)
         return result
-        
+    
     except Exception as e:
         logger.error(f"Error in what-if simulation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/statistics")
+@cached_response("predictions")
 async def get_prediction_statistics(
     policy_id: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -236,7 +322,7 @@ async def get_prediction_statistics(
             "predictions_with_outcome": total_with_outcome,
             "policy_id": policy_id
         }
-        
+    
     except Exception as e:
         logger.error(f"Error getting statistics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -249,15 +335,48 @@ async def get_model_info():
         predictor = get_predictor()
         
         return {
-            "model_type": "RandomForestClassifier",
+            "model_type": type(predictor.model).__name__,
             "is_trained": predictor.is_trained,
             "model_version": predictor.model_version,
             "feature_count": len(predictor.feature_names),
             "features": predictor.feature_names,
-            "n_estimators": predictor.model.n_estimators,
-            "max_depth": predictor.model.max_depth
+            "trained_at": predictor.training_metadata.get("trained_at"),
+            "training_metadata": predictor.training_metadata
         }
-        
+    
     except Exception as e:
         logger.error(f"Error getting model info: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/model-versions")
+async def get_model_versions():
+    """List trained model versions in the model registry, newest first."""
+    try:
+        return {"versions": list_model_versions()}
+    
+    except Exception as e:
+        logger.error(f"Error listing model versions: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/model-versions/{version}/activate")
+async def activate_model(version: str):
+    """
+    Make a registered model version active, e.g. to roll back a bad model.
+    
+    - **version**: Registry version to activate
+    """
+    try:
+        predictor = activate_model_version(version)
+        
+        return {
+            "model_version": predictor.model_version,
+            "training_metadata": predictor.training_metadata
+        }
+    
+    except ModelRegistryError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error activating model version: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
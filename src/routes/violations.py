@@ -7,9 +7,12 @@ from sqlalchemy import text
 
 from src.core.database import db_manager
 from src.core.logging import get_logger
-from src.models import Violation, ComplianceRule, CompanyRecord, ReasoningTrace
+from src.models import Violation, ReasoningTrace
 from src.schemas import ViolationResponse, ViolationDetailResponse
-from src.services import ViolationDetector, RuleExtractor, RiskScoringEngine, ReasoningTraceGenerator
+from src.services import ReasoningTraceGenerator
+from src.services.response_cache import cached_response
+from src.services.violation_scanner import ViolationScanner
+from src.workers.tasks import enrich_violations_task
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1/violations", tags=["violations"])
@@ -25,155 +28,60 @@ def get_db():
 
 
 @router.post("/scan")
-async def scan_for_violations(db: Session = Depends(get_db)):
+async def scan_for_violations(
+    resume: bool = Query(True),
+    chunk_size: int = Query(ViolationScanner.DEFAULT_CHUNK_SIZE, ge=100, le=50000),
+    db: Session = Depends(get_db)
+):
     """
     Scan all company records against active rules to detect violations.
     
+    Records are streamed in chunks and violations are committed per chunk,
+    so memory stays bounded and an interrupted scan can be resumed.
+    Simple rules get templated justifications at detection time; the rest
+    are explained afterwards by the LLM enrichment worker.
+    
     Args:
+        resume: Continue the last unfinished scan from its checkpoint
+        chunk_size: Number of records evaluated per chunk
         db: Database session
         
     Returns:
         Scan results
     """
     try:
-        # Get active rules
-        rules = db.query(ComplianceRule).filter(
-            ComplianceRule.is_active == True
-        ).all()
+        scanner = ViolationScanner(db, chunk_size=chunk_size)
+        result = scanner.scan(resume=resume)
         
-        if not rules:
+        if result["violations_created"]:
+            try:
+                enrich_violations_task.delay()
+            except Exception as e:
+                # The periodic enrichment sweep picks the violations up later
+                logger.warning("Failed to queue violation enrichment", error=str(e))
+        
+        if not result["rules_evaluated"]:
             return {
                 "status": "success",
                 "message": "No active rules to scan",
                 "violations_detected": 0
             }
         
-        # Get company records
-        records = db.query(CompanyRecord).all()
-        
-        if not records:
+        if not result["records_scanned"] and not result["resumed_from"]:
             return {
                 "status": "success",
                 "message": "No records to scan",
                 "violations_detected": 0
             }
         
-        # Initialize services
-        violation_detector = ViolationDetector()
-        rule_extractor = RuleExtractor()
-        risk_engine = RiskScoringEngine()
-        reasoning_generator = ReasoningTraceGenerator()
-        
-        violations_created = 0
-        
-        # Scan each record against each rule
-        for record in records:
-            record_data = {
-                "id": str(record.id),
-                "transaction_id": record.transaction_id,
-                "amount": record.amount,
-                "transaction_type": record.transaction_type,
-                "from_account": record.from_account,
-                "to_account": record.to_account,
-                "timestamp": record.timestamp.isoformat() if record.timestamp else None,
-                **record.data
-            }
-            
-            for rule in rules:
-                rule_dict = {
-                    "id": str(rule.id),
-                    "description": rule.description,
-                    "validation_logic": rule.validation_logic,
-                    "severity": rule.severity.value
-                }
-                
-                # Check if violation exists
-                violation_result = violation_detector.evaluate_record(
-                    record_data,
-                    rule_dict
-                )
-                
-                if violation_result:
-                    # Check if violation already exists
-                    existing = db.query(Violation).filter(
-                        Violation.rule_id == rule.id,
-                        Violation.record_identifier == str(record.id)
-                    ).first()
-                    
-                    if not existing:
-                        # Generate justification
-                        justification = rule_extractor.generate_justification(
-                            rule.description,
-                            record_data,
-                            violation_result["violation_details"]
-                        )
-                        
-                        # Generate remediation steps
-                        remediation = rule_extractor.generate_remediation_steps(
-                            rule.description,
-                            justification,
-                            record_data
-                        )
-                        
-                        # Create violation
-                        violation = Violation(
-                            rule_id=rule.id,
-                            record_identifier=str(record.id),
-                            table_name="company_records",
-                            justification=justification,
-                            record_snapshot=record_data,
-                            severity=rule.severity.value,
-                            remediation_steps=remediation
-                        )
-                        
-                        db.add(violation)
-                        db.flush()  # Get violation ID
-                        
-                        # Calculate risk score
-                        risk_data = risk_engine.calculate_risk_score(
-                            violation,
-                            record_data,
-                            db
-                        )
-                        
-                        violation.risk_score = risk_data["score"]
-                        violation.risk_level = risk_data["level"]
-                        violation.risk_factors = risk_data["factors"]
-                        
-                        # Generate reasoning trace
-                        try:
-                            reasoning_steps = reasoning_generator.generate_trace(
-                                rule.description,
-                                rule.severity.value,
-                                record_data,
-                                violation_result["violation_details"]
-                            )
-                            
-                            reasoning_trace = ReasoningTrace(
-                                violation_id=violation.id,
-                                steps=reasoning_steps
-                            )
-                            db.add(reasoning_trace)
-                        except Exception as e:
-                            logger.warning(f"Failed to generate reasoning trace: {e}")
-                        
-                        violations_created += 1
-        
-        db.commit()
-        
-        logger.info(
-            "Violation scan completed",
-            rules_scanned=len(rules),
-            records_scanned=len(records),
-            violations_created=violations_created
-        )
-        
         return {
             "status": "success",
             "message": f"Scan completed successfully",
-            "rules_scanned": len(rules),
-            "records_scanned": len(records),
-            "violations_detected": violations_created
+            "rules_scanned": result["rules_evaluated"],
+            "records_scanned": result["records_scanned"],
+            "violations_detected": result["violations_created"],
+            "chunks": result["chunks"],
+            "resumed_from": result["resumed_from"]
         }
         
     except Exception as e:
@@ -257,6 +165,7 @@ async def get_violation(violation_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/stats/summary")
+@cached_response("violations")
 async def get_violation_stats(db: Session = Depends(get_db)):
     """
     Get violation statistics summary.
@@ -1,7 +1,7 @@
 """Pydantic schemas for API validation."""
 
 from .policy import PolicyDocumentResponse, PolicyUploadResponse
-from .rule import ComplianceRuleResponse, RuleExtractionResponse
+from .rule import ComplianceRuleResponse, RuleExtractionResponse, PolicyRevisionResponse
 from .violation import ViolationResponse, ViolationDetailResponse
 from .health import HealthResponse
 
@@ -10,6 +10,7 @@ __all__ = [
     "PolicyUploadResponse",
     "ComplianceRuleResponse",
     "RuleExtractionResponse",
+    "PolicyRevisionResponse",
     "ViolationResponse",
     "ViolationDetailResponse",
     "HealthResponse",
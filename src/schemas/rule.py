@@ -29,3 +29,17 @@ class RuleExtractionResponse(BaseModel):
     rules: List[ComplianceRuleResponse]
     status: str
     message: str
+
+
+class PolicyRevisionResponse(BaseModel):
+    """Response after applying a revised policy document."""
+    policy_id: UUID
+    filename: str
+    pages_changed: List[int]
+    pages_removed: List[int]
+    rules_kept: int
+    rules_superseded: int
+    rules_extracted: int
+    rules: List[ComplianceRuleResponse]
+    status: str
+    message: str
@@ -18,6 +18,7 @@ class ViolationResponse(BaseModel):
     justification: str
     risk_score: Optional[int] = None
     risk_level: Optional[str] = None
+    enrichment_status: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -38,6 +39,8 @@ class ViolationDetailResponse(BaseModel):
     risk_score: Optional[int] = None
     risk_level: Optional[str] = None
     risk_factors: Optional[Dict[str, Any]] = None
+    enrichment_status: Optional[str] = None
+    enriched_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -3,13 +3,26 @@
 from .pdf_extractor import PDFExtractor
 from .rule_extractor import RuleExtractor
 from .violation_detector import ViolationDetector
+from .rule_compiler import RuleCompiler, CompiledRule
+from .record_batch import RecordBatch
 from .risk_scoring import RiskScoringEngine
 from .reasoning_trace import ReasoningTraceGenerator
+from .policy_revision import PolicyRevisionService
+from .model_registry import ModelRegistry
+from .dashboard_metrics import DashboardMetrics
+from .response_cache import ResponseCache
 
 __all__ = [
     "PDFExtractor",
     "RuleExtractor",
     "ViolationDetector",
+    "RuleCompiler",
+    "CompiledRule",
+    "RecordBatch",
     "RiskScoringEngine",
     "ReasoningTraceGenerator",
+    "PolicyRevisionService",
+    "ModelRegistry",
+    "DashboardMetrics",
+    "ResponseCache",
 ]
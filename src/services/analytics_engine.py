@@ -1,13 +1,15 @@
 """Service for analyzing corrections and generating insights."""
 
 import logging
+import uuid
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
 from src.models.correction import Correction, CorrectedDecision
 from src.models.user import User
+from src.services.rule_accuracy import ACCURACY_WINDOWS, RuleAccuracyTracker
 
 logger = logging.getLogger(__name__)
 
@@ -23,16 +25,13 @@ class AnalyticsEngine:
     ) -> Dict[str, Any]:
         """Calculate overall accuracy metrics."""
         try:
-            query = db.query(Correction)
-            
-            # Apply date filters
-            if start_date:
-                query = query.filter(Correction.created_at >= start_date)
-            if end_date:
-                query = query.filter(Correction.created_at <= end_date)
-            
-            corrections = query.all()
-            total = len(corrections)
+            query = AnalyticsEngine._filter_dates(
+                db.query(*AnalyticsEngine._decision_counts(Correction)),
+                start_date,
+                end_date
+            )
+            row = query.one()
+            total = row.total
             
             if total == 0:
                 return {
@@ -44,22 +43,13 @@ class AnalyticsEngine:
                     "avg_confidence": 0.0
                 }
             
-            # Count by decision type
-            true_positives = sum(1 for c in corrections if c.corrected_decision == CorrectedDecision.TRUE_POSITIVE)
-            false_positives = sum(1 for c in corrections if c.corrected_decision == CorrectedDecision.FALSE_POSITIVE)
-            needs_review = sum(1 for c in corrections if c.corrected_decision == CorrectedDecision.NEEDS_REVIEW)
-            
-            # Calculate confidence average
-            confidences = [c.ai_confidence for c in corrections if c.ai_confidence is not None]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            
             return {
                 "total_corrections": total,
-                "accuracy": round(true_positives / total * 100, 2),
-                "false_positive_rate": round(false_positives / total * 100, 2),
-                "true_positive_rate": round(true_positives / total * 100, 2),
-                "needs_review_rate": round(needs_review / total * 100, 2),
-                "avg_confidence": round(avg_confidence, 3)
+                "accuracy": round(row.true_positives / total * 100, 2),
+                "false_positive_rate": round(row.false_positives / total * 100, 2),
+                "true_positive_rate": round(row.true_positives / total * 100, 2),
+                "needs_review_rate": round(row.needs_review / total * 100, 2),
+                "avg_confidence": round(float(row.avg_confidence or 0.0), 3)
             }
             
         except Exception as e:
@@ -74,64 +64,45 @@ class AnalyticsEngine:
     ) -> List[Dict[str, Any]]:
         """Calculate per-rule accuracy metrics."""
         try:
-            query = db.query(Correction)
-            
-            # Apply date filters
-            if start_date:
-                query = query.filter(Correction.created_at >= start_date)
-            if end_date:
-                query = query.filter(Correction.created_at <= end_date)
-            
-            corrections = query.all()
-            
-            # Group by rule_id
-            rules_data = {}
-            for correction in corrections:
-                rule_id = str(correction.rule_id)
-                if rule_id not in rules_data:
-                    rules_data[rule_id] = {
-                        "rule_id": rule_id,
-                        "rule_name": correction.rule_name,
-                        "corrections": []
-                    }
-                rules_data[rule_id]["corrections"].append(correction)
+            rows = AnalyticsEngine._filter_dates(
+                db.query(
+                    Correction.rule_id,
+                    func.max(Correction.rule_name).label("rule_name"),
+                    *AnalyticsEngine._decision_counts(Correction)
+                ),
+                start_date,
+                end_date
+            ).group_by(Correction.rule_id).order_by(func.count().desc()).all()
+            
+            # Trends come from the state maintained as corrections are recorded
+            trends = RuleAccuracyTracker.get_rule_trends(db, [row.rule_id for row in rows])
             
-            # Calculate metrics for each rule
             results = []
-            for rule_id, data in rules_data.items():
-                corrections_list = data["corrections"]
-                total = len(corrections_list)
-                
-                true_positives = sum(1 for c in corrections_list if c.corrected_decision == CorrectedDecision.TRUE_POSITIVE)
-                false_positives = sum(1 for c in corrections_list if c.corrected_decision == CorrectedDecision.FALSE_POSITIVE)
-                needs_review = sum(1 for c in corrections_list if c.corrected_decision == CorrectedDecision.NEEDS_REVIEW)
-                
-                confidences = [c.ai_confidence for c in corrections_list if c.ai_confidence is not None]
-                avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-                
-                accuracy = (true_positives / total * 100) if total > 0 else 0.0
-                fp_rate = (false_positives / total * 100) if total > 0 else 0.0
-                
-                # Determine trend
-                trend = AnalyticsEngine._calculate_trend(corrections_list, total)
+            for row in rows:
+                total = row.total
+                accuracy = row.true_positives / total * 100
+                fp_rate = row.false_positives / total * 100
+                trend_state = trends.get(str(row.rule_id))
                 
                 results.append({
-                    "rule_id": rule_id,
-                    "rule_name": data["rule_name"],
+                    "rule_id": str(row.rule_id),
+                    "rule_name": row.rule_name,
                     "total_reviews": total,
                     "accuracy": round(accuracy, 2),
                     "false_positive_rate": round(fp_rate, 2),
-                    "true_positive_count": true_positives,
-                    "false_positive_count": false_positives,
-                    "needs_review_count": needs_review,
-                    "avg_confidence": round(avg_confidence, 3),
-                    "trend": trend,
+                    "true_positive_count": row.true_positives,
+                    "false_positive_count": row.false_positives,
+                    "needs_review_count": row.needs_review,
+                    "avg_confidence": round(float(row.avg_confidence or 0.0), 3),
+                    "trend": AnalyticsEngine._trend_from_state(trend_state),
+                    "accuracy_windows": {
+                        f"{days}d": trend_state[f"accuracy_{days}d"] if trend_state else None
+                        for days in ACCURACY_WINDOWS
+                    },
+                    "ewma_accuracy": trend_state["ewma_accuracy"] if trend_state else None,
                     "high_fp_rate": fp_rate > 30
                 })
             
-            # Sort by total reviews descending
-            results.sort(key=lambda x: x["total_reviews"], reverse=True)
-            
             return results
             
         except Exception as e:
@@ -228,48 +199,29 @@ class AnalyticsEngine:
     ) -> List[Dict[str, Any]]:
         """Get time-series data for correction trends."""
         try:
-            corrections = db.query(Correction).filter(
+            unit = granularity if granularity in ("day", "week") else "month"
+            period = func.date_trunc(unit, Correction.created_at).label("period")
+            
+            rows = db.query(
+                period,
+                *AnalyticsEngine._decision_counts(Correction)
+            ).filter(
                 and_(
                     Correction.created_at >= start_date,
                     Correction.created_at <= end_date
                 )
-            ).all()
+            ).group_by(period).order_by(period).all()
             
-            # Group by time period
-            trends = {}
-            for correction in corrections:
-                if granularity == "day":
-                    period = correction.created_at.date().isoformat()
-                elif granularity == "week":
-                    period = correction.created_at.isocalendar()[:2]
-                    period = f"{period[0]}-W{period[1]}"
-                else:  # month
-                    period = correction.created_at.strftime("%Y-%m")
-                
-                if period not in trends:
-                    trends[period] = {
-                        "date": period,
-                        "total_corrections": 0,
-                        "true_positives": 0,
-                        "false_positives": 0,
-                        "needs_review": 0
-                    }
-                
-                trends[period]["total_corrections"] += 1
-                if correction.corrected_decision == CorrectedDecision.TRUE_POSITIVE:
-                    trends[period]["true_positives"] += 1
-                elif correction.corrected_decision == CorrectedDecision.FALSE_POSITIVE:
-                    trends[period]["false_positives"] += 1
-                else:
-                    trends[period]["needs_review"] += 1
-            
-            # Calculate accuracy for each period
             results = []
-            for period, data in sorted(trends.items()):
-                total = data["total_corrections"]
-                accuracy = (data["true_positives"] / total * 100) if total > 0 else 0.0
-                data["accuracy"] = round(accuracy, 2)
-                results.append(data)
+            for row in rows:
+                results.append({
+                    "date": AnalyticsEngine._period_label(row.period, unit),
+                    "total_corrections": row.total,
+                    "true_positives": row.true_positives,
+                    "false_positives": row.false_positives,
+                    "needs_review": row.needs_review,
+                    "accuracy": round(row.true_positives / row.total * 100, 2)
+                })
             
             return results
             
@@ -285,78 +237,104 @@ class AnalyticsEngine:
     ) -> List[Dict[str, Any]]:
         """Calculate per-reviewer statistics."""
         try:
-            query = db.query(Correction)
-            
-            if start_date:
-                query = query.filter(Correction.created_at >= start_date)
-            if end_date:
-                query = query.filter(Correction.created_at <= end_date)
-            
-            corrections = query.all()
-            
-            # Group by reviewer
-            reviewers_data = {}
-            for correction in corrections:
-                reviewer_id = str(correction.corrected_by)
-                if reviewer_id not in reviewers_data:
-                    reviewers_data[reviewer_id] = {
-                        "corrections": [],
-                        "reviewer_id": reviewer_id
-                    }
-                reviewers_data[reviewer_id]["corrections"].append(correction)
-            
-            # Calculate stats for each reviewer
-            results = []
-            for reviewer_id, data in reviewers_data.items():
-                corrections_list = data["corrections"]
-                total = len(corrections_list)
-                
-                confirm_count = sum(1 for c in corrections_list if c.corrected_decision == CorrectedDecision.TRUE_POSITIVE)
-                dismiss_count = sum(1 for c in corrections_list if c.corrected_decision == CorrectedDecision.FALSE_POSITIVE)
-                request_info_count = sum(1 for c in corrections_list if c.corrected_decision == CorrectedDecision.NEEDS_REVIEW)
-                
-                # Get reviewer info
-                reviewer = db.query(User).filter(User.id == reviewer_id).first()
-                reviewer_name = reviewer.name if reviewer else "Unknown"
-                
-                results.append({
-                    "reviewer_id": reviewer_id,
-                    "reviewer_name": reviewer_name,
-                    "total_reviews": total,
-                    "confirm_count": confirm_count,
-                    "dismiss_count": dismiss_count,
-                    "request_info_count": request_info_count
-                })
-            
-            # Sort by total reviews
-            results.sort(key=lambda x: x["total_reviews"], reverse=True)
-            
-            return results
+            rows = AnalyticsEngine._filter_dates(
+                db.query(
+                    Correction.corrected_by,
+                    *AnalyticsEngine._decision_counts(Correction)
+                ),
+                start_date,
+                end_date
+            ).group_by(Correction.corrected_by).order_by(func.count().desc()).all()
+            
+            reviewer_names = AnalyticsEngine._reviewer_names(db, [row.corrected_by for row in rows])
+            
+            return [
+                {
+                    "reviewer_id": str(row.corrected_by),
+                    "reviewer_name": reviewer_names.get(str(row.corrected_by), "Unknown"),
+                    "total_reviews": row.total,
+                    "confirm_count": row.true_positives,
+                    "dismiss_count": row.false_positives,
+                    "request_info_count": row.needs_review
+                }
+                for row in rows
+            ]
             
         except Exception as e:
             logger.error(f"Error getting reviewer statistics: {str(e)}")
             raise
     
     @staticmethod
-    def _calculate_trend(corrections: List[Correction], total_reviews: int) -> str:
-        """Determine trend direction based on recent vs older corrections."""
-        if total_reviews < 10:
-            return "insufficient_data"
+    def _decision_counts(columns) -> List[Any]:
+        """
+        Aggregate columns counting corrections by decision.
         
-        # Sort by date
-        sorted_corrections = sorted(corrections, key=lambda c: c.created_at)
+        Args:
+            columns: Correction model or subquery columns with corrected_decision and ai_confidence
         
-        # Split into two halves
-        mid = len(sorted_corrections) // 2
-        older_half = sorted_corrections[:mid]
-        recent_half = sorted_corrections[mid:]
+        Returns:
+            Labeled total, true_positives, false_positives, needs_review and avg_confidence
+        """
+        decision = columns.corrected_decision
+        return [
+            func.count().label("total"),
+            func.count().filter(decision == CorrectedDecision.TRUE_POSITIVE).label("true_positives"),
+            func.count().filter(decision == CorrectedDecision.FALSE_POSITIVE).label("false_positives"),
+            func.count().filter(decision == CorrectedDecision.NEEDS_REVIEW).label("needs_review"),
+            func.avg(columns.ai_confidence).label("avg_confidence"),
+        ]
+    
+    @staticmethod
+    def _filter_dates(query, start_date: Optional[datetime], end_date: Optional[datetime]):
+        """Restrict a corrections query to a created_at range."""
+        if start_date:
+            query = query.filter(Correction.created_at >= start_date)
+        if end_date:
+            query = query.filter(Correction.created_at <= end_date)
+        return query
+    
+    @staticmethod
+    def _period_label(period: datetime, unit: str) -> str:
+        """Format a date_trunc period as 2024-05-06, 2024-W19 or 2024-05."""
+        if unit == "day":
+            return period.date().isoformat()
+        if unit == "week":
+            iso_year, iso_week, _ = period.isocalendar()
+            return f"{iso_year}-W{iso_week}"
+        return period.strftime("%Y-%m")
+    
+    @staticmethod
+    def _reviewer_names(db: Session, reviewer_ids: List[str]) -> Dict[str, str]:
+        """Look up reviewer names in one query, skipping ids that are not user UUIDs."""
+        user_ids = []
+        for reviewer_id in reviewer_ids:
+            try:
+                user_ids.append(uuid.UUID(str(reviewer_id)))
+            except ValueError:
+                continue
         
-        # Calculate accuracy for each half
-        older_tp = sum(1 for c in older_half if c.corrected_decision == CorrectedDecision.TRUE_POSITIVE)
-        recent_tp = sum(1 for c in recent_half if c.corrected_decision == CorrectedDecision.TRUE_POSITIVE)
+        if not user_ids:
+            return {}
         
-        older_accuracy = (older_tp / len(older_half) * 100) if older_half else 0
-        recent_accuracy = (recent_tp / len(recent_half) * 100) if recent_half else 0
+        users = db.query(User.id, User.name).filter(User.id.in_(user_ids)).all()
+        return {str(user_id): name for user_id, name in users}
+    
+    @staticmethod
+    def _trend_from_state(trend_state: Optional[Dict[str, Any]]) -> str:
+        """Compare a rule's EWMA accuracy with its 90-day window accuracy."""
+        if not trend_state or trend_state["accuracy_90d"] is None:
+            return "insufficient_data"
+        return AnalyticsEngine._classify_trend(
+            trend_state["accuracy_90d"],
+            trend_state["ewma_accuracy"],
+            trend_state["reviews_90d"]
+        )
+    
+    @staticmethod
+    def _classify_trend(older_accuracy: float, recent_accuracy: float, total_reviews: int) -> str:
+        """Determine trend direction from a baseline accuracy vs recent accuracy."""
+        if total_reviews < 10:
+            return "insufficient_data"
         
         diff = recent_accuracy - older_accuracy
         
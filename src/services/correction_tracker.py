@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from src.models.correction import Correction, CorrectedDecision
 from src.models.violation import Violation, ReviewAction
 from src.models.rule import ComplianceRule
+from src.services.rule_accuracy import RuleAccuracyTracker
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +71,10 @@ class CorrectionTracker:
             )
             
             db.add(correction)
+            db.flush()
+            
+            # Rolling windows and EWMA are updated in the same transaction
+            RuleAccuracyTracker.record(db, correction)
             db.commit()
             db.refresh(correction)
             
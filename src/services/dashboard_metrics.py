@@ -0,0 +1,234 @@
+"""Pre-aggregated violation metrics for the dashboard."""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.logging import get_logger
+from src.models import CompanyRecord, ComplianceRule
+from src.services.response_cache import invalidate_responses
+
+logger = get_logger(__name__)
+
+# Daily rollup of violations; one row per day, status, severity and risk level
+VIEW_NAME = "violation_metrics_daily"
+
+SEVERITIES = ["critical", "high", "medium", "low"]
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+
+# Grouping shared by the view definition and the live fallback query
+_ROLLUP_SELECT = """
+    SELECT
+        date_trunc('day', detected_at)::date AS day,
+        lower(status::text) AS status,
+        lower(severity) AS severity,
+        lower(coalesce(risk_level, 'unscored')) AS risk_level,
+        count(*) AS violation_count,
+        count(risk_score) AS scored_count,
+        coalesce(sum(risk_score), 0) AS risk_score_sum
+    FROM violations
+    GROUP BY 1, 2, 3, 4
+"""
+
+CREATE_VIEW_SQL = f"CREATE MATERIALIZED VIEW IF NOT EXISTS {VIEW_NAME} AS {_ROLLUP_SELECT}"
+
+# REFRESH ... CONCURRENTLY needs a unique index covering every row
+CREATE_VIEW_INDEX_SQL = f"""
+    CREATE UNIQUE INDEX IF NOT EXISTS ix_{VIEW_NAME}_key
+    ON {VIEW_NAME} (day, status, severity, risk_level)
+"""
+
+# Above this many rows, record counts use the planner estimate instead of count(*)
+EXACT_COUNT_LIMIT = 1_000_000
+
+
+class DashboardMetrics:
+    """
+    Read dashboard metrics from the violation_metrics_daily materialized view.
+    
+    The view is refreshed periodically by a Celery task, so reads touch a
+    bounded number of rollup rows instead of the violations table. Until the
+    view is created (scripts/migrate_dashboard_metrics.py), metrics fall
+    back to a single grouped query over violations.
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize dashboard metrics.
+        
+        Args:
+            db: Database session
+        """
+        self.db = db
+        self._source = None
+    
+    @property
+    def source(self) -> str:
+        """Relation to read rollup rows from: the view, or a live subquery."""
+        if self._source is None:
+            exists = self.db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": VIEW_NAME}).scalar()
+            self._source = VIEW_NAME if exists else f"({_ROLLUP_SELECT}) AS live_rollup"
+            if not exists:
+                logger.warning("Dashboard metrics view missing, aggregating live", view=VIEW_NAME)
+        return self._source
+    
+    def totals(self) -> List[Dict[str, Any]]:
+        """
+        Get violation counts by status, severity and risk level across all days.
+        
+        Returns:
+            Rollup rows with status, severity, risk_level and violation_count
+        """
+        rows = self.db.execute(text(f"""
+            SELECT status, severity, risk_level, sum(violation_count) AS violation_count
+            FROM {self.source}
+            GROUP BY status, severity, risk_level
+        """))
+        return [dict(row._mapping) for row in rows]
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get violation totals by severity and risk level.
+        
+        Returns:
+            Total and active (not resolved) counts, with severity and risk level breakdowns
+        """
+        summary = {
+            "total": 0,
+            "active": 0,
+            "by_severity": {severity: 0 for severity in SEVERITIES},
+            "active_by_severity": {severity: 0 for severity in SEVERITIES},
+            "by_risk_level": {level: 0 for level in RISK_LEVELS},
+        }
+        
+        for row in self.totals():
+            count = int(row["violation_count"])
+            active = row["status"] != "resolved"
+            
+            summary["total"] += count
+            if row["severity"] in summary["by_severity"]:
+                summary["by_severity"][row["severity"]] += count
+            if row["risk_level"] in summary["by_risk_level"]:
+                summary["by_risk_level"][row["risk_level"]] += count
+            if active:
+                summary["active"] += count
+                if row["severity"] in summary["active_by_severity"]:
+                    summary["active_by_severity"][row["severity"]] += count
+        
+        return summary
+    
+    def daily_by_severity(self, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Get daily violation counts per severity, newest day first.
+        
+        Args:
+            days: Number of days to include
+        
+        Returns:
+            Rows with date, count and severity
+        """
+        rows = self.db.execute(text(f"""
+            SELECT day, severity, sum(violation_count) AS violation_count
+            FROM {self.source}
+            WHERE day >= :since
+            GROUP BY day, severity
+            ORDER BY day DESC
+        """), {"since": date.today() - timedelta(days=days)})
+        return [
+            {"date": str(row.day), "count": int(row.violation_count), "severity": row.severity}
+            for row in rows
+        ]
+    
+    def daily_risk(self, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Get the daily average risk score of scored violations, oldest day first.
+        
+        Args:
+            days: Number of days to include
+        
+        Returns:
+            Rows with date, average_risk and violation_count
+        """
+        rows = self.db.execute(text(f"""
+            SELECT day, sum(risk_score_sum) AS risk_score_sum, sum(scored_count) AS scored_count
+            FROM {self.source}
+            WHERE day >= :since
+            GROUP BY day
+            HAVING sum(scored_count) > 0
+            ORDER BY day
+        """), {"since": date.today() - timedelta(days=days)})
+        return [
+            {
+                "date": row.day.isoformat(),
+                "average_risk": round(float(row.risk_score_sum) / int(row.scored_count), 2),
+                "violation_count": int(row.scored_count)
+            }
+            for row in rows
+        ]
+    
+    def active_rule_count(self) -> int:
+        """Count active compliance rules (a small table)."""
+        return self.db.query(ComplianceRule).filter(ComplianceRule.is_active == True).count()
+    
+    def record_count(self) -> int:
+        """
+        Count company records, using the planner estimate for large tables.
+        
+        Returns:
+            Exact count up to EXACT_COUNT_LIMIT rows, estimated above it
+        """
+        estimate = self.db.execute(text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass('company_records')"
+        )).scalar()
+        if estimate is not None and estimate >= EXACT_COUNT_LIMIT:
+            return int(estimate)
+        return self.db.query(CompanyRecord).count()
+    
+    @staticmethod
+    def compliance_score(severity_counts: Dict[str, int]) -> int:
+        """
+        Score compliance from active violation counts by severity.
+        
+        Critical: 5 points each, High: 2 points, Medium: 1 point, Low: 0.5
+        points; penalties above 50 decay logarithmically.
+        
+        Args:
+            severity_counts: Active violations per severity
+        
+        Returns:
+            Score from 0 to 100
+        """
+        if sum(severity_counts.values()) == 0:
+            return 100
+        
+        penalty = (
+            severity_counts.get("critical", 0) * 5 +
+            severity_counts.get("high", 0) * 2 +
+            severity_counts.get("medium", 0) * 1 +
+            severity_counts.get("low", 0) * 0.5
+        )
+        
+        if penalty <= 50:
+            score = int(100 - penalty)
+        else:
+            score = int(50 * (1 - (penalty - 50) / (penalty + 50)))
+        
+        return max(0, min(100, score))
+    
+    def refresh(self) -> bool:
+        """
+        Refresh the materialized view without blocking readers.
+        
+        Returns:
+            False if the view has not been created yet
+        """
+        if self.source != VIEW_NAME:
+            return False
+        
+        self.db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {VIEW_NAME}"))
+        self.db.commit()
+        invalidate_responses(VIEW_NAME)
+        logger.info("Dashboard metrics refreshed", view=VIEW_NAME)
+        return True
@@ -0,0 +1,157 @@
+"""High-water marks for incremental continuous monitoring."""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.core.logging import get_logger
+from src.models import ComplianceRule, CompanyRecord, RuleWatermark
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class DeltaPlan:
+    """Which rules need a delta scan and which need a full backfill."""
+    # Unchanged rules, evaluated only against records updated since their watermark
+    delta_rules: List[ComplianceRule] = field(default_factory=list)
+    # New or edited rules, evaluated against every record
+    backfill_rules: List[ComplianceRule] = field(default_factory=list)
+    # Lower bound on CompanyRecord.updated_at for the delta scan
+    updated_after: Optional[datetime] = None
+    # Upper bound on CompanyRecord.updated_at for this run; the next watermark
+    records_through: Optional[datetime] = None
+
+
+class DeltaMonitor:
+    """Plan delta vs. backfill scans from per-rule watermarks and advance them."""
+    
+    def __init__(self, db: Session, overlap_seconds: Optional[int] = None):
+        """
+        Initialize delta monitor.
+        
+        Args:
+            db: Database session
+            overlap_seconds: How far before the watermark delta scans start,
+                to catch records committed after a scan read the table
+        """
+        self.db = db
+        self.overlap = timedelta(
+            seconds=settings.delta_overlap_seconds if overlap_seconds is None else overlap_seconds
+        )
+    
+    def plan(self, rules: List[ComplianceRule]) -> DeltaPlan:
+        """
+        Split rules into delta and backfill sets.
+        
+        A rule needs a backfill when it has no watermark or was edited
+        (its updated_at differs from the version that was backfilled).
+        
+        Args:
+            rules: Active rules
+        
+        Returns:
+            Delta plan
+        """
+        watermarks = {
+            str(watermark.rule_id): watermark
+            for watermark in self.db.query(RuleWatermark).filter(
+                RuleWatermark.rule_id.in_([rule.id for rule in rules])
+            )
+        } if rules else {}
+        
+        plan = DeltaPlan(records_through=self.records_high_water())
+        delta_since = []
+        
+        for rule in rules:
+            watermark = watermarks.get(str(rule.id))
+            if watermark is None or watermark.rule_version != rule.updated_at:
+                plan.backfill_rules.append(rule)
+            else:
+                plan.delta_rules.append(rule)
+                delta_since.append(watermark.records_through)
+        
+        if delta_since:
+            plan.updated_after = min(delta_since) - self.overlap
+        
+        return plan
+    
+    def records_high_water(self) -> datetime:
+        """
+        Get the latest record update time, the bound for this run.
+        
+        Returns:
+            Max CompanyRecord.updated_at, or now for an empty table
+        """
+        return self.db.query(func.max(CompanyRecord.updated_at)).scalar() or datetime.utcnow()
+    
+    def advance(self, rule_versions: Dict[str, datetime], records_through: datetime) -> None:
+        """
+        Record that rules have been evaluated against records through a time.
+        
+        Args:
+            rule_versions: Rule ID -> rule updated_at the scan evaluated
+            records_through: Latest record update time covered by the scan
+        """
+        if not rule_versions:
+            return
+        
+        statement = pg_insert(RuleWatermark).values([
+            {
+                "rule_id": rule_id,
+                "records_through": records_through,
+                "rule_version": rule_version,
+                "updated_at": datetime.utcnow()
+            }
+            for rule_id, rule_version in rule_versions.items()
+        ])
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=["rule_id"],
+            set_={
+                "records_through": func.greatest(RuleWatermark.records_through, statement.excluded.records_through),
+                "rule_version": statement.excluded.rule_version,
+                "updated_at": statement.excluded.updated_at
+            }
+        ))
+        self.db.commit()
+        
+        logger.info("Rule watermarks advanced", rules=len(rule_versions), records_through=records_through.isoformat())
+    
+    @staticmethod
+    def backfill_state(rules: List[ComplianceRule], records_through: datetime) -> Dict[str, Any]:
+        """
+        Serialize a pending backfill for the job result, to apply once it completes.
+        
+        Args:
+            rules: Rules being backfilled
+            records_through: Record high-water mark at dispatch
+        
+        Returns:
+            JSON-serializable backfill state
+        """
+        return {
+            "records_through": records_through.isoformat(),
+            "rules": {str(rule.id): rule.updated_at.isoformat() for rule in rules}
+        }
+    
+    def complete_backfill(self, state: Optional[Dict[str, Any]]) -> None:
+        """
+        Advance watermarks for a finished backfill.
+        
+        The rule versions recorded at dispatch are used, so a rule edited
+        while its backfill ran is backfilled again on the next run.
+        
+        Args:
+            state: Output of backfill_state (None when there was no backfill)
+        """
+        if not state:
+            return
+        self.advance(
+            {rule_id: datetime.fromisoformat(version) for rule_id, version in state["rules"].items()},
+            datetime.fromisoformat(state["records_through"])
+        )
@@ -4,6 +4,8 @@ from .base import LLMClient, LLMResponse, LLMMetrics
 from .openai_client import OpenAIClient
 from .gemini_client import GeminiClient
 from .router import LLMRouter
+from .cache import LLMResponseCache, CachedLLMClient, get_llm_cache
+from .batch import LLMBatchExecutor, BatchRequest, BatchResult, TokenBucket
 
 __all__ = [
     "LLMClient",
@@ -12,4 +14,11 @@ __all__ = [
     "OpenAIClient",
     "GeminiClient",
     "LLMRouter",
+    "LLMResponseCache",
+    "CachedLLMClient",
+    "get_llm_cache",
+    "LLMBatchExecutor",
+    "BatchRequest",
+    "BatchResult",
+    "TokenBucket",
 ]
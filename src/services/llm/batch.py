@@ -0,0 +1,318 @@
+"""Concurrent LLM batch execution with rate limiting, retries and fallback."""
+
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .base import LLMClient, LLMResponse
+from .cache import CachedLLMClient
+from .router import LLMRouter
+from src.config.settings import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BatchRequest:
+    """A single completion request in a batch."""
+    prompt: str
+    system_message: Optional[str] = None
+    temperature: float = 0.7
+    max_tokens: int = 1000
+    
+    @property
+    def estimated_tokens(self) -> int:
+        """Rough token estimate for rate limiting (1 token ≈ 4 characters)."""
+        return (len(self.prompt) + len(self.system_message or "")) // 4 + self.max_tokens
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch request, in the position of its request."""
+    index: int
+    response: Optional[LLMResponse] = None
+    error: Optional[str] = None
+    provider: Optional[str] = None
+    attempts: int = 0
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the request produced a response."""
+        return self.response is not None
+    
+    @property
+    def content(self) -> Optional[str]:
+        """Response content, or None if the request failed."""
+        return self.response.content if self.response else None
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a per-minute rate."""
+    
+    def __init__(self, per_minute: int, capacity: Optional[int] = None):
+        """
+        Initialize token bucket.
+        
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Maximum burst size (defaults to one minute of tokens)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def acquire(self, amount: int = 1) -> None:
+        """
+        Wait until the requested number of tokens is available and take them.
+        
+        Requests larger than the capacity are clamped so they can proceed.
+        
+        Args:
+            amount: Number of tokens to take
+        """
+        amount = min(amount, self.capacity)
+        async with self._loop_lock():
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+    
+    def adjust(self, amount: int) -> None:
+        """
+        Correct an earlier estimate once actual usage is known.
+        
+        Args:
+            amount: Tokens to give back (positive) or take (negative)
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+    
+    def _loop_lock(self) -> asyncio.Lock:
+        """Get a lock for the running loop; bucket state persists across loops."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class ProviderLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one provider."""
+    
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Initialize provider limiter.
+        
+        Args:
+            rpm: Requests per minute
+            tpm: Tokens per minute
+        """
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+    
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait for one request slot and the estimated tokens."""
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+
+class LLMBatchExecutor:
+    """Run many completions concurrently over an LLMRouter's providers."""
+    
+    def __init__(
+        self,
+        router: LLMRouter,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        limits: Optional[Dict[str, Dict[str, int]]] = None
+    ):
+        """
+        Initialize batch executor.
+        
+        Args:
+            router: Router whose primary and fallback clients are used
+            concurrency: Maximum requests in flight
+            max_retries: Retries per provider before falling back
+            base_delay: Initial backoff delay in seconds
+            max_delay: Maximum backoff delay in seconds
+            limits: Per-provider {"rpm": ..., "tpm": ...} (defaults from settings)
+        """
+        self.router = router
+        self.concurrency = concurrency or settings.llm_batch_concurrency
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limits = limits or {
+            "openai": {"rpm": settings.openai_rpm, "tpm": settings.openai_tpm},
+            "gemini": {"rpm": settings.gemini_rpm, "tpm": settings.gemini_tpm},
+        }
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def run_sync(self, requests: Sequence[BatchRequest]) -> List[BatchResult]:
+        """
+        Run a batch from synchronous code (Celery tasks, services).
+        
+        Reuses one event loop per executor so the async SDK clients keep
+        their connection pools between batches.
+        
+        Args:
+            requests: Completion requests
+        
+        Returns:
+            Results in request order
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.run(requests))
+    
+    async def run(self, requests: Sequence[BatchRequest]) -> List[BatchResult]:
+        """
+        Run a batch of completions with bounded concurrency.
+        
+        Args:
+            requests: Completion requests
+        
+        Returns:
+            Results in request order; failed items carry an error instead of
+            raising, so one bad item never fails the batch
+        """
+        if not requests:
+            return []
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.time()
+        
+        async def bounded(index: int, request: BatchRequest) -> BatchResult:
+            async with semaphore:
+                return await self._run_one(index, request)
+        
+        results = await asyncio.gather(
+            *(bounded(index, request) for index, request in enumerate(requests))
+        )
+        
+        failed = sum(1 for result in results if not result.ok)
+        logger.info(
+            "LLM batch completed",
+            requests=len(requests),
+            failed=failed,
+            concurrency=self.concurrency,
+            duration_ms=f"{(time.time() - started) * 1000:.2f}"
+        )
+        return list(results)
+    
+    async def _run_one(self, index: int, request: BatchRequest) -> BatchResult:
+        """Run one request, retrying on each provider before falling back."""
+        result = BatchResult(index=index)
+        errors = []
+        params = {
+            "prompt": request.prompt,
+            "system_message": request.system_message,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens
+        }
+        
+        for client in self._clients():
+            provider = client.get_metrics().provider
+            limiter = self._limiter(provider)
+            
+            # Cache hits never reach the provider, so they do not spend its rate limits
+            cached = client if isinstance(client, CachedLLMClient) else None
+            if cached is not None:
+                response = cached.lookup(**params)
+                if response is not None:
+                    result.response = response
+                    result.provider = provider
+                    return result
+            complete = cached.fill if cached is not None else client.complete
+            
+            for attempt in range(self.max_retries + 1):
+                result.attempts += 1
+                estimated = request.estimated_tokens
+                await limiter.acquire(estimated)
+                
+                try:
+                    response = await complete(**params)
+                    limiter.tokens.adjust(estimated - response.tokens_used)
+                    result.response = response
+                    result.provider = provider
+                    result.error = None
+                    return result
+                
+                except Exception as e:
+                    # A failed request is not charged for the tokens it was expected to use
+                    limiter.tokens.adjust(estimated)
+                    errors.append(f"{provider}: {e}")
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self._backoff(attempt))
+            
+            logger.warning(
+                "LLM batch item exhausted provider",
+                index=index,
+                provider=provider,
+                attempts=result.attempts
+            )
+        
+        result.error = "; ".join(errors[-2:])
+        return result
+    
+    def _clients(self) -> List[LLMClient]:
+        """Get the providers to try in order, without repeating the same client."""
+        clients = [self.router.primary]
+        fallback = self.router.fallback
+        if fallback is not None and _unwrap(fallback) is not _unwrap(self.router.primary):
+            clients.append(fallback)
+        return clients
+    
+    def _limiter(self, provider: str) -> ProviderLimiter:
+        """Get or create the rate limiter for a provider."""
+        if provider not in self._limiters:
+            limits = self.limits.get(provider) or self.limits["openai"]
+            self._limiters[provider] = ProviderLimiter(limits["rpm"], limits["tpm"])
+        return self._limiters[provider]
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def _unwrap(client: LLMClient) -> LLMClient:
+    """Get the provider client behind a response-cache wrapper."""
+    return client.client if isinstance(client, CachedLLMClient) else client
+
+
+def parse_json_response(content: str) -> Any:
+    """
+    Parse a JSON completion, tolerating Markdown code fences.
+    
+    Args:
+        content: Completion content
+    
+    Returns:
+        Parsed JSON value
+    
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON
+    """
+    content = content.strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", content, re.DOTALL)
+    if fenced:
+        content = fenced.group(1)
+    return json.loads(content)
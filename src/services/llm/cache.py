@@ -0,0 +1,439 @@
+"""Content-addressed cache for LLM responses."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from redis import Redis
+
+from .base import LLMClient, LLMResponse, LLMMetrics
+from src.config.settings import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Two-tier LLM response cache keyed on a hash of the request.
+    
+    Redis is the shared tier (entries expire after the TTL and are evicted
+    LRU under Redis' volatile-lru policy); an optional on-disk tier keeps
+    responses local to a worker across Redis flushes and restarts.
+    Cache failures are logged and treated as misses, never raised.
+    """
+    
+    KEY_PREFIX = "llm:cache:"
+    STATS_KEY = "llm:cache:stats"
+    
+    # Prune the disk tier every this many writes
+    DISK_PRUNE_INTERVAL = 256
+    
+    def __init__(
+        self,
+        redis_client: Optional[Redis] = None,
+        ttl_seconds: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        disk_max_entries: Optional[int] = None
+    ):
+        """
+        Initialize LLM response cache.
+        
+        Args:
+            redis_client: Redis client for the shared tier (None disables it)
+            ttl_seconds: Time to live for cached responses
+            disk_dir: Directory for the local tier (None disables it)
+            disk_max_entries: Maximum entries kept in the local tier
+        """
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds or settings.llm_cache_ttl_seconds
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries or settings.llm_cache_disk_max_entries
+        
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self._stats = {"hits": 0, "misses": 0, "redis_hits": 0, "disk_hits": 0, "errors": 0}
+        
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(
+        model: str,
+        system_message: Optional[str],
+        prompt: str,
+        temperature: float,
+        **params: Any
+    ) -> str:
+        """
+        Build the cache key for a completion request.
+        
+        Whitespace is normalized so formatting-only differences in prompts
+        share an entry. Extra params (max_tokens, response_format) are part
+        of the key because they change the response.
+        
+        Args:
+            model: Model name
+            system_message: System prompt
+            prompt: User prompt
+            temperature: Sampling temperature
+            **params: Other request parameters that affect the output
+        
+        Returns:
+            Cache key
+        """
+        payload = json.dumps(
+            {
+                "model": model,
+                "system": _normalize(system_message or ""),
+                "prompt": _normalize(prompt),
+                "temperature": round(float(temperature), 3),
+                "params": params,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return LLMResponseCache.KEY_PREFIX + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_key
+        
+        Returns:
+            Cached content or None on a miss
+        """
+        content = self._redis_get(key)
+        if content is not None:
+            self._count("hits", "redis_hits")
+            return content
+        
+        content = self._disk_get(key)
+        if content is not None:
+            self._count("hits", "disk_hits")
+            # Promote to the shared tier for other workers
+            self._redis_set(key, content)
+            return content
+        
+        self._count("misses")
+        return None
+    
+    def set(self, key: str, content: str) -> None:
+        """
+        Store a response in every enabled tier.
+        
+        Args:
+            key: Cache key from make_key
+            content: Response content
+        """
+        if content is None:
+            return
+        self._redis_set(key, content)
+        self._disk_set(key, content)
+    
+    def get_or_create(self, key: str, producer: Callable[[], str]) -> str:
+        """
+        Return the cached response, calling producer and caching on a miss.
+        
+        Exceptions from producer propagate and nothing is cached.
+        
+        Args:
+            key: Cache key from make_key
+            producer: Callable that performs the LLM request
+        
+        Returns:
+            Response content
+        """
+        content = self.get(key)
+        if content is None:
+            content = producer()
+            self.set(key, content)
+        return content
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get hit and miss counts.
+        
+        Counts are shared across processes through Redis when available,
+        otherwise they cover this process only.
+        
+        Returns:
+            Hit, miss and error counts with hit rate
+        """
+        stats = None
+        if self.redis is not None:
+            try:
+                stats = {k: int(v) for k, v in self.redis.hgetall(self.STATS_KEY).items()}
+            except Exception as e:
+                logger.warning("Failed to read LLM cache stats", error=str(e))
+        
+        if stats is None:
+            with self._lock:
+                stats = dict(self._stats)
+        
+        stats = {name: stats.get(name, 0) for name in self._stats}
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["scope"] = "shared" if self.redis is not None else "process"
+        return stats
+    
+    def reset_metrics(self) -> None:
+        """Reset hit and miss counts."""
+        with self._lock:
+            self._stats = {name: 0 for name in self._stats}
+        if self.redis is not None:
+            try:
+                self.redis.delete(self.STATS_KEY)
+            except Exception as e:
+                logger.warning("Failed to reset LLM cache stats", error=str(e))
+    
+    def _count(self, *names: str) -> None:
+        """Increment local counters and their shared Redis copies."""
+        with self._lock:
+            for name in names:
+                self._stats[name] += 1
+        
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for name in names:
+                    pipe.hincrby(self.STATS_KEY, name, 1)
+                pipe.execute()
+            except Exception:
+                pass
+    
+    def _redis_get(self, key: str) -> Optional[str]:
+        """Read from the Redis tier."""
+        if self.redis is None:
+            return None
+        try:
+            return self.redis.get(key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning("LLM cache read failed", tier="redis", error=str(e))
+            return None
+    
+    def _redis_set(self, key: str, content: str) -> None:
+        """Write to the Redis tier with the TTL."""
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(key, self.ttl_seconds, content)
+        except Exception as e:
+            self._count("errors")
+            logger.warning("LLM cache write failed", tier="redis", error=str(e))
+    
+    def _disk_path(self, key: str) -> str:
+        """Get the file path for a key, sharded by hash prefix."""
+        digest = key[len(self.KEY_PREFIX):]
+        return os.path.join(self.disk_dir, digest[:2], f"{digest}.json")
+    
+    def _disk_get(self, key: str) -> Optional[str]:
+        """Read from the disk tier, dropping expired entries."""
+        if not self.disk_dir:
+            return None
+        
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self._count("errors")
+            logger.warning("LLM cache read failed", tier="disk", error=str(e))
+            return None
+        
+        if entry.get("expires_at", 0) < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        
+        try:
+            # Access time drives LRU pruning
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get("content")
+    
+    def _disk_set(self, key: str, content: str) -> None:
+        """Atomically write to the disk tier."""
+        if not self.disk_dir:
+            return
+        
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"content": content, "expires_at": time.time() + self.ttl_seconds}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self._count("errors")
+            logger.warning("LLM cache write failed", tier="disk", error=str(e))
+            return
+        
+        with self._lock:
+            self._disk_writes += 1
+            should_prune = self._disk_writes % self.DISK_PRUNE_INTERVAL == 0
+        if should_prune:
+            self._prune_disk()
+    
+    def _prune_disk(self) -> None:
+        """Remove least recently used entries beyond disk_max_entries."""
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        entries.append((os.path.getmtime(path), path))
+                    except OSError:
+                        continue
+        
+        excess = len(entries) - self.disk_max_entries
+        if excess <= 0:
+            return
+        
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        logger.info("Pruned LLM disk cache", removed=excess)
+
+
+class CachedLLMClient(LLMClient):
+    """LLMClient wrapper that serves repeated requests from the response cache."""
+    
+    def __init__(self, client: LLMClient, cache: LLMResponseCache):
+        """
+        Initialize cached client.
+        
+        Args:
+            client: Wrapped LLM client
+            cache: Response cache
+        """
+        self.client = client
+        self.cache = cache
+        # Gemini keeps the name in model_name and the SDK object in model
+        self.model_name = getattr(client, "model_name", None) or getattr(client, "model", "")
+    
+    async def complete(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        """Return a cached completion, or complete with the wrapped client and cache it."""
+        response = self.lookup(prompt, system_message, temperature, max_tokens)
+        if response is not None:
+            return response
+        return await self.fill(prompt, system_message, temperature, max_tokens)
+    
+    def lookup(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> Optional[LLMResponse]:
+        """
+        Serve a completion from the cache without calling the provider.
+        
+        Returns:
+            Cached response (tokens_used is 0), or None on a miss
+        """
+        start_time = time.time()
+        content = self.cache.get(self._key(prompt, system_message, temperature, max_tokens))
+        if content is None:
+            return None
+        return LLMResponse(
+            content=content,
+            tokens_used=0,
+            response_time_ms=(time.time() - start_time) * 1000,
+            provider=self.get_metrics().provider,
+            model=self.model_name,
+            cost_estimate=0.0
+        )
+    
+    async def fill(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        """Complete with the wrapped client and cache the response, skipping the lookup."""
+        response = await self.client.complete(
+            prompt=prompt,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        self.cache.set(self._key(prompt, system_message, temperature, max_tokens), response.content)
+        return response
+    
+    def _key(self, prompt: str, system_message: Optional[str], temperature: float, max_tokens: int) -> str:
+        return self.cache.make_key(
+            self.model_name,
+            system_message,
+            prompt,
+            temperature,
+            max_tokens=max_tokens
+        )
+    
+    def get_metrics(self) -> LLMMetrics:
+        """Get usage metrics of the wrapped client."""
+        return self.client.get_metrics()
+    
+    def reset_metrics(self):
+        """Reset usage metrics of the wrapped client."""
+        self.client.reset_metrics()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache.
+    
+    Returns:
+        Shared cache instance, or None when caching is disabled
+    """
+    global _cache
+    if not settings.llm_cache_enabled:
+        return None
+    
+    with _cache_lock:
+        if _cache is None:
+            from src.core.database import db_manager
+            
+            redis_client = None
+            try:
+                redis_client = db_manager.ensure_redis()
+            except Exception as e:
+                logger.warning("Redis unavailable, LLM cache uses local tier only", error=str(e))
+            
+            _cache = LLMResponseCache(
+                redis_client=redis_client,
+                disk_dir=settings.llm_cache_disk_dir
+            )
+        return _cache
+
+
+def _normalize(text: str) -> str:
+    """Collapse runs of whitespace so formatting does not change the key."""
+    return " ".join(text.split())
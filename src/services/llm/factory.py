@@ -6,6 +6,8 @@ from .base import LLMClient
 from .openai_client import OpenAIClient
 from .gemini_client import GeminiClient
 from .router import LLMRouter
+from .cache import CachedLLMClient, get_llm_cache
+from .batch import LLMBatchExecutor
 from src.config.settings import settings
 from src.core.logging import get_logger
 
@@ -50,7 +52,10 @@ def create_llm_router() -> LLMRouter:
         fallback = gemini_client if gemini_client else openai_client
         logger.info("Using OpenAI as primary" + (", Gemini as fallback" if gemini_client else ""))
     
-    return LLMRouter(primary=primary, fallback=fallback)
+    # Wrap once when there is no second provider, so callers can tell the fallback is the primary
+    primary_client = _with_cache(primary)
+    fallback_client = primary_client if fallback is primary else _with_cache(fallback)
+    return LLMRouter(primary_client=primary_client, fallback_client=fallback_client)
 
 
 def create_llm_client(provider: str = "openai") -> LLMClient:
@@ -59,23 +64,42 @@ def create_llm_client(provider: str = "openai") -> LLMClient:
     
     Args:
         provider: "openai" or "gemini"
-        
+    
     Returns:
         LLMClient instance
     """
     if provider == "openai":
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required")
-        return OpenAIClient(
+        return _with_cache(OpenAIClient(
             api_key=settings.openai_api_key,
             model=settings.llm_model
-        )
+        ))
     elif provider == "gemini":
         if not settings.google_api_key:
             raise ValueError("GOOGLE_API_KEY is required")
-        return GeminiClient(
+        return _with_cache(GeminiClient(
             api_key=settings.google_api_key,
             model="gemini-pro"
-        )
+        ))
     else:
         raise ValueError(f"Unknown provider: {provider}")
+
+
+def create_llm_batch_executor(concurrency: Optional[int] = None) -> LLMBatchExecutor:
+    """
+    Create a batch executor over the configured primary and fallback providers.
+    
+    Args:
+        concurrency: Maximum requests in flight (defaults to LLM_BATCH_CONCURRENCY)
+    
+    Returns:
+        LLMBatchExecutor instance
+    """
+    return LLMBatchExecutor(create_llm_router(), concurrency=concurrency)
+
+
+def _with_cache(client: LLMClient) -> LLMClient:
+    """Wrap a client with the response cache when caching is enabled."""
+    cache = get_llm_cache()
+    return CachedLLMClient(client, cache) if cache else client
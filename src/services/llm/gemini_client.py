@@ -1,9 +1,14 @@
 """Google Gemini LLM client implementation."""
 
 import time
-import google.generativeai as genai
 from typing import Optional
 
+# Optional dependency: Gemini is only used when GOOGLE_API_KEY is configured
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
 from .base import LLMClient, LLMResponse, LLMMetrics
 from src.core.logging import get_logger
 
@@ -27,6 +32,9 @@ class GeminiClient(LLMClient):
             api_key: Google API key
             model: Model to use
         """
+        if genai is None:
+            raise ImportError("google-generativeai is required for the Gemini client")
+        
         genai.configure(api_key=api_key)
         self.model_name = model
         self.model = genai.GenerativeModel(model)
@@ -60,7 +68,7 @@ class GeminiClient(LLMClient):
                 max_output_tokens=max_tokens,
             )
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content_async(
                 full_prompt,
                 generation_config=generation_config
             )
@@ -1,7 +1,7 @@
 """OpenAI LLM client implementation."""
 
 import time
-from openai import OpenAI
+from openai import AsyncOpenAI
 from typing import Optional
 
 from .base import LLMClient, LLMResponse, LLMMetrics
@@ -28,7 +28,7 @@ class OpenAIClient(LLMClient):
             api_key: OpenAI API key
             model: Model to use
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key)
         self.model = model
         
         # Metrics tracking
@@ -54,7 +54,7 @@ class OpenAIClient(LLMClient):
                 messages.append({"role": "system", "content": system_message})
             messages.append({"role": "user", "content": prompt})
             
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
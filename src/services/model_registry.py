@@ -0,0 +1,174 @@
+"""Versioned on-disk registry for trained ML models."""
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+
+from src.config.settings import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ModelRegistryError(Exception):
+    """Model registry error."""
+    pass
+
+
+class ModelRegistry:
+    """
+    Store fitted models as immutable versions with a movable LATEST pointer.
+    
+    Layout: {root}/{name}/{version}/model.joblib + metadata.json, and
+    {root}/{name}/LATEST holding the active version. Artifacts are written
+    uncompressed so workers can load them with mmap_mode="r" and share the
+    numpy arrays through the page cache instead of each holding a copy.
+    The root can be a mounted volume or object-storage filesystem shared by
+    every worker.
+    """
+    
+    ARTIFACT_FILE = "model.joblib"
+    METADATA_FILE = "metadata.json"
+    LATEST_FILE = "LATEST"
+    
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize model registry.
+        
+        Args:
+            root: Registry directory (defaults to MODEL_REGISTRY_DIR)
+        """
+        self.root = root or settings.model_registry_dir
+    
+    def save(self, name: str, artifacts: Dict[str, Any], metadata: Dict[str, Any]) -> str:
+        """
+        Save a new model version and make it the latest.
+        
+        The version directory is written under a temporary name and renamed
+        into place, so readers never see a partial version.
+        
+        Args:
+            name: Model name
+            artifacts: Objects to serialize (model, scaler, feature names)
+            metadata: Training metadata stored alongside the artifacts
+        
+        Returns:
+            New version identifier
+        """
+        version = f"{datetime.utcnow():%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+        model_dir = os.path.join(self.root, name)
+        os.makedirs(model_dir, exist_ok=True)
+        
+        tmp_dir = tempfile.mkdtemp(dir=model_dir, prefix=".tmp-")
+        try:
+            joblib.dump(artifacts, os.path.join(tmp_dir, self.ARTIFACT_FILE))
+            with open(os.path.join(tmp_dir, self.METADATA_FILE), "w", encoding="utf-8") as f:
+                json.dump(
+                    {**metadata, "version": version, "saved_at": datetime.utcnow().isoformat()},
+                    f,
+                    default=str,
+                    indent=2
+                )
+            os.replace(tmp_dir, os.path.join(model_dir, version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        
+        self.activate(name, version)
+        logger.info("Model version saved", model=name, version=version)
+        return version
+    
+    def load(self, name: str, version: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Load a model version, memory-mapping its arrays.
+        
+        Args:
+            name: Model name
+            version: Version to load (defaults to the latest)
+        
+        Returns:
+            Artifacts and metadata
+        
+        Raises:
+            ModelRegistryError: If no such version exists
+        """
+        version = version or self.latest_version(name)
+        if not version:
+            raise ModelRegistryError(f"No saved versions for model {name}")
+        
+        version_dir = os.path.join(self.root, name, version)
+        try:
+            artifacts = joblib.load(os.path.join(version_dir, self.ARTIFACT_FILE), mmap_mode="r")
+            with open(os.path.join(version_dir, self.METADATA_FILE), "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            raise ModelRegistryError(f"Model {name} version {version} not found")
+        
+        logger.info("Model version loaded", model=name, version=version)
+        return artifacts, metadata
+    
+    def latest_version(self, name: str) -> Optional[str]:
+        """
+        Get the active version of a model.
+        
+        Args:
+            name: Model name
+        
+        Returns:
+            Version identifier, or None if nothing has been saved
+        """
+        try:
+            with open(os.path.join(self.root, name, self.LATEST_FILE), "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def activate(self, name: str, version: str) -> None:
+        """
+        Point LATEST at a version; running workers pick it up on their next poll.
+        
+        Args:
+            name: Model name
+            version: Existing version to activate (also used for rollback)
+        
+        Raises:
+            ModelRegistryError: If the version does not exist
+        """
+        model_dir = os.path.join(self.root, name)
+        if not os.path.isdir(os.path.join(model_dir, version)):
+            raise ModelRegistryError(f"Model {name} version {version} not found")
+        
+        fd, tmp_path = tempfile.mkstemp(dir=model_dir, prefix=".latest-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(model_dir, self.LATEST_FILE))
+    
+    def list_versions(self, name: str) -> List[Dict[str, Any]]:
+        """
+        List saved versions with their metadata, newest first.
+        
+        Args:
+            name: Model name
+        
+        Returns:
+            Metadata per version, with an "active" flag
+        """
+        model_dir = os.path.join(self.root, name)
+        if not os.path.isdir(model_dir):
+            return []
+        
+        latest = self.latest_version(name)
+        versions = []
+        for version in os.listdir(model_dir):
+            metadata_path = os.path.join(model_dir, version, self.METADATA_FILE)
+            if version.startswith(".") or not os.path.isfile(metadata_path):
+                continue
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                versions.append({**json.load(f), "active": version == latest})
+        return sorted(versions, key=lambda metadata: metadata["saved_at"], reverse=True)
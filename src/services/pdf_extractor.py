@@ -67,6 +67,22 @@ class PDFExtractor:
                 sha256_hash.update(byte_block)
         return sha256_hash.hexdigest()
     
+    @staticmethod
+    def hash_page_text(text: str) -> str:
+        """
+        Calculate SHA-256 hash of a page's text.
+        
+        Whitespace is normalized so re-rendering the same page content
+        produces the same hash.
+        
+        Args:
+            text: Extracted page text
+            
+        Returns:
+            Hex digest of page text hash
+        """
+        return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+    
     def extract_text(self, file_path: Path) -> Dict[str, Any]:
         """
         Extract text from PDF with page numbers.
@@ -111,6 +127,12 @@ class PDFExtractor:
             if not pages_text:
                 raise PDFExtractionError("No text could be extracted from PDF")
             
+            # Per-page hashes let revisions re-extract only the pages that changed
+            metadata["page_hashes"] = {
+                str(p["page_number"]): self.hash_page_text(p["text"])
+                for p in pages_text
+            }
+            
             # Combine all pages
             full_text = "\n\n".join([
                 f"[Page {p['page_number']}]\n{p['text']}" 
@@ -0,0 +1,188 @@
+"""Split extracted policy text into page-aligned chunks and merge chunk results."""
+
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+# Marker written by PDFExtractor.extract_text before each page
+PAGE_MARKER = re.compile(r"^\[Page (\d+)\]\s*$", re.MULTILINE)
+
+
+@dataclass
+class PolicyChunk:
+    """A run of consecutive pages sent to the LLM in one extraction request."""
+    index: int
+    pages: List[int] = field(default_factory=list)
+    text: str = ""
+    
+    @property
+    def page_range(self) -> str:
+        """Human-readable page range for logs and errors."""
+        if not self.pages:
+            return "unpaged"
+        if len(self.pages) == 1:
+            return str(self.pages[0])
+        return f"{self.pages[0]}-{self.pages[-1]}"
+
+
+class PolicyChunker:
+    """Chunk policy text on PDF page markers and deduplicate extracted rules."""
+    
+    # Rules whose descriptions are at least this similar are treated as one rule
+    DUPLICATE_SIMILARITY = 0.9
+    
+    @staticmethod
+    def split_pages(text: str) -> List[Tuple[Optional[int], str]]:
+        """
+        Split extracted text into pages using the [Page N] markers.
+        
+        Args:
+            text: Text produced by PDFExtractor.extract_text
+        
+        Returns:
+            (page number, page text) pairs; a single (None, text) pair when
+            the text has no page markers
+        """
+        markers = list(PAGE_MARKER.finditer(text))
+        if not markers:
+            return [(None, text.strip())] if text.strip() else []
+        
+        pages = []
+        for position, marker in enumerate(markers):
+            end = markers[position + 1].start() if position + 1 < len(markers) else len(text)
+            page_text = text[marker.end():end].strip()
+            if page_text:
+                pages.append((int(marker.group(1)), page_text))
+        return pages
+    
+    @staticmethod
+    def chunk(text: str, max_chars: int) -> List[PolicyChunk]:
+        """
+        Group consecutive pages into chunks of at most max_chars.
+        
+        Page markers are kept in the chunk text so the model can cite pages.
+        A single page longer than max_chars is split on paragraph breaks.
+        
+        Args:
+            text: Text produced by PDFExtractor.extract_text
+            max_chars: Maximum characters per chunk
+        
+        Returns:
+            Chunks in document order
+        """
+        chunks: List[PolicyChunk] = []
+        current = PolicyChunk(index=0)
+        
+        def flush():
+            nonlocal current
+            if current.text:
+                chunks.append(current)
+                current = PolicyChunk(index=len(chunks))
+        
+        for page_number, page_text in PolicyChunker.split_pages(text):
+            for part in PolicyChunker._split_long(page_text, max_chars):
+                block = f"[Page {page_number}]\n{part}" if page_number is not None else part
+                
+                if current.text and len(current.text) + len(block) + 2 > max_chars:
+                    flush()
+                
+                current.text = f"{current.text}\n\n{block}" if current.text else block
+                if page_number is not None and page_number not in current.pages:
+                    current.pages.append(page_number)
+        
+        flush()
+        return chunks
+    
+    @staticmethod
+    def attach_page_number(rule: Dict[str, Any], chunk: PolicyChunk) -> Dict[str, Any]:
+        """
+        Set a rule's page_number from its page_reference, bounded to the chunk.
+        
+        Args:
+            rule: Rule extracted from the chunk
+            chunk: Chunk the rule came from
+        
+        Returns:
+            The rule with page_number set (None for unpaged text)
+        """
+        page_number = None
+        reference = re.search(r"\d+", str(rule.get("page_reference") or ""))
+        if reference and int(reference.group()) in chunk.pages:
+            page_number = int(reference.group())
+        elif chunk.pages:
+            page_number = chunk.pages[0]
+        
+        rule["page_number"] = str(page_number) if page_number is not None else None
+        return rule
+    
+    @staticmethod
+    def deduplicate(rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge near-identical rules extracted from different chunks.
+        
+        Rules are duplicates when they test the same field with the same
+        operator and value and their descriptions are nearly identical.
+        The higher-confidence rule is kept, in its original position.
+        
+        Args:
+            rules: Rules from all chunks in document order
+        
+        Returns:
+            Deduplicated rules
+        """
+        kept: List[Dict[str, Any]] = []
+        normalized: List[str] = []
+        
+        for rule in rules:
+            description = " ".join(str(rule.get("description", "")).lower().split())
+            duplicate_of = None
+            
+            for position, other in enumerate(kept):
+                if PolicyChunker._condition_key(rule) != PolicyChunker._condition_key(other):
+                    continue
+                if SequenceMatcher(None, description, normalized[position]).ratio() >= PolicyChunker.DUPLICATE_SIMILARITY:
+                    duplicate_of = position
+                    break
+            
+            if duplicate_of is None:
+                kept.append(rule)
+                normalized.append(description)
+            elif _confidence(rule) > _confidence(kept[duplicate_of]):
+                kept[duplicate_of] = rule
+                normalized[duplicate_of] = description
+        
+        return kept
+    
+    @staticmethod
+    def _condition_key(rule: Dict[str, Any]) -> Tuple[str, str, str]:
+        condition = rule.get("condition") or {}
+        return (
+            str(condition.get("field", "")).lower(),
+            str(condition.get("operator", "")).lower(),
+            str(condition.get("value", "")).lower(),
+        )
+    
+    @staticmethod
+    def _split_long(text: str, max_chars: int) -> List[str]:
+        """Split text longer than max_chars on paragraph breaks."""
+        if len(text) <= max_chars:
+            return [text]
+        
+        parts, current = [], ""
+        for paragraph in text.split("\n\n"):
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                parts.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            parts.append(current)
+        return parts
+
+
+def _confidence(rule: Dict[str, Any]) -> float:
+    """Get a rule's confidence score as a float."""
+    try:
+        return float(rule.get("confidence_score") or 0)
+    except (TypeError, ValueError):
+        return 0.0
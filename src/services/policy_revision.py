@@ -0,0 +1,212 @@
+"""Incremental rule re-extraction for revised policy documents."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.logging import get_logger
+from src.models import PolicyDocument, ComplianceRule
+from src.models.policy import PolicyStatus
+from src.models.rule import Severity
+from src.services.pdf_extractor import PDFExtractor
+from src.services.policy_chunker import PolicyChunker
+from src.services.rule_extractor import RuleExtractor, RuleExtractionError
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PageDiff:
+    """Page-level difference between two revisions of a policy."""
+    # Old page number -> new page number for pages whose content is unchanged
+    kept: Dict[int, int] = field(default_factory=dict)
+    # New pages with new or edited content
+    changed: List[int] = field(default_factory=list)
+    # Old pages whose content no longer appears in the revision
+    removed: List[int] = field(default_factory=list)
+
+
+class PolicyRevisionService:
+    """Apply a revised PDF to a policy, re-extracting only the changed pages."""
+    
+    def __init__(self, db: Session, rule_extractor: Optional[RuleExtractor] = None):
+        """
+        Initialize policy revision service.
+        
+        Args:
+            db: Database session
+            rule_extractor: Rule extractor (created on demand)
+        """
+        self.db = db
+        self.rule_extractor = rule_extractor or RuleExtractor()
+    
+    @staticmethod
+    def page_hashes(policy: PolicyDocument) -> Dict[int, str]:
+        """
+        Get per-page content hashes for a stored policy.
+        
+        Policies uploaded before page hashes were recorded are hashed from
+        their extracted text.
+        
+        Args:
+            policy: Policy document
+        
+        Returns:
+            Page number -> content hash
+        """
+        stored = (policy.document_metadata or {}).get("page_hashes")
+        if stored:
+            return {int(page): digest for page, digest in stored.items()}
+        
+        return {
+            page_number: PDFExtractor.hash_page_text(text)
+            for page_number, text in PolicyChunker.split_pages(policy.extracted_text or "")
+            if page_number is not None
+        }
+    
+    @staticmethod
+    def diff_pages(old_hashes: Dict[int, str], new_hashes: Dict[int, str]) -> PageDiff:
+        """
+        Match pages between revisions by content hash.
+        
+        Matching on content rather than page number means inserting a page
+        only re-extracts the inserted page; the pages after it are kept and
+        their rules renumbered.
+        
+        Args:
+            old_hashes: Page hashes of the current revision
+            new_hashes: Page hashes of the new revision
+        
+        Returns:
+            Page diff
+        """
+        old_by_hash: Dict[str, List[int]] = {}
+        for page in sorted(old_hashes):
+            old_by_hash.setdefault(old_hashes[page], []).append(page)
+        
+        diff = PageDiff()
+        for page in sorted(new_hashes):
+            matches = old_by_hash.get(new_hashes[page])
+            if matches:
+                diff.kept[matches.pop(0)] = page
+            else:
+                diff.changed.append(page)
+        
+        diff.removed = sorted(page for page in old_hashes if page not in diff.kept)
+        return diff
+    
+    def revise(
+        self,
+        policy: PolicyDocument,
+        filename: str,
+        file_hash: str,
+        file_size: int,
+        extraction_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Replace a policy's content with a revision and update its rules.
+        
+        Rules on unchanged pages are kept (renumbered if their page moved),
+        rules on edited or removed pages are deactivated and marked
+        superseded, and rules are extracted for the changed pages only.
+        Extraction runs before anything is written, so a failure leaves the
+        policy and its rules untouched.
+        
+        Args:
+            policy: Policy document to revise
+            filename: Filename of the revision
+            file_hash: SHA-256 hash of the revision file
+            file_size: Size of the revision file in bytes
+            extraction_result: Output of PDFExtractor.extract_text
+        
+        Returns:
+            Revision summary with the newly created rules
+        
+        Raises:
+            RuleExtractionError: If extraction fails for any changed page
+        """
+        new_hashes = {
+            int(page): digest
+            for page, digest in extraction_result["metadata"]["page_hashes"].items()
+        }
+        diff = self.diff_pages(self.page_hashes(policy), new_hashes)
+        
+        active_rules = self.db.query(ComplianceRule).filter(
+            ComplianceRule.policy_document_id == policy.id,
+            ComplianceRule.is_active == True
+        ).all()
+        
+        # Rules without a page can't be attributed to a page, so re-extract everything
+        full_extraction = any(not str(rule.page_number or "").isdigit() for rule in active_rules)
+        if full_extraction:
+            diff = PageDiff(changed=sorted(new_hashes), removed=sorted(self.page_hashes(policy)))
+        
+        extracted_rules = []
+        if diff.changed:
+            extracted_rules = self.rule_extractor.extract_rules_for_pages(
+                extraction_result["text"],
+                diff.changed,
+                str(policy.id)
+            )
+            if self.rule_extractor.last_failed_pages:
+                raise RuleExtractionError(
+                    f"Extraction failed for pages {', '.join(self.rule_extractor.last_failed_pages)}"
+                )
+        
+        now = datetime.utcnow()
+        kept, superseded = 0, 0
+        for rule in active_rules:
+            new_page = None if full_extraction else diff.kept.get(int(rule.page_number))
+            if new_page is None:
+                rule.is_active = False
+                rule.superseded_at = now
+                superseded += 1
+            else:
+                rule.page_number = str(new_page)
+                kept += 1
+        
+        new_rules = []
+        for rule_data in extracted_rules:
+            rule = ComplianceRule(
+                policy_document_id=policy.id,
+                page_number=rule_data.get("page_number"),
+                description=rule_data.get("description", ""),
+                validation_logic=rule_data.get("condition", {}),
+                severity=Severity(rule_data.get("severity", "medium").lower()),
+                confidence_score=str(rule_data.get("confidence_score", 0.0)),
+                is_active=True
+            )
+            self.db.add(rule)
+            new_rules.append(rule)
+        
+        policy.filename = filename
+        policy.file_hash = file_hash
+        policy.file_size_bytes = file_size
+        policy.extracted_text = extraction_result["text"]
+        policy.document_metadata = {**(policy.document_metadata or {}), **extraction_result["metadata"]}
+        policy.status = PolicyStatus.PROCESSED
+        
+        self.db.commit()
+        for rule in new_rules:
+            self.db.refresh(rule)
+        
+        logger.info(
+            "Policy revised",
+            policy_id=str(policy.id),
+            pages_changed=len(diff.changed),
+            pages_removed=len(diff.removed),
+            rules_kept=kept,
+            rules_superseded=superseded,
+            rules_extracted=len(new_rules),
+            full_extraction=full_extraction
+        )
+        
+        return {
+            "pages_changed": diff.changed,
+            "pages_removed": diff.removed,
+            "rules_kept": kept,
+            "rules_superseded": superseded,
+            "rules": new_rules,
+        }
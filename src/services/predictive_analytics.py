@@ -1,141 +1,346 @@
 """Predictive analytics service for violation prediction using ML."""
 
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+import uuid
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.preprocessing import StandardScaler
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Query, Session, aliased
+from sqlalchemy import and_, delete, func, insert
 
+from src.config.settings import settings
+from src.models.company_record import CompanyRecord
+from src.models.correction import Correction, CorrectedDecision
 from src.models.violation import Violation
 from src.models.rule import ComplianceRule
 from src.models.prediction import Prediction
+from src.services.model_registry import ModelRegistry, ModelRegistryError
+from src.services.record_batch import record_to_data
 
 logger = logging.getLogger(__name__)
 
+# Registry name under which predictor versions are stored
+MODEL_NAME = "violation_predictor"
+
+# Fixed feature schema: the column order of every training and inference matrix
+FEATURE_NAMES = (
+    'amount',
+    'amount_log',
+    'has_approver_1',
+    'has_approver_2',
+    'approval_count',
+    'has_transaction_id',
+    'has_customer_id',
+    'same_initiator_approver',
+)
+
 
 class ViolationPredictor:
     """ML-based violation predictor."""
     
     def __init__(self):
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42
-        )
+        self.model = self._new_model()
         self.scaler = StandardScaler()
         self.is_trained = False
         self.feature_names = []
         self.model_version = "1.0"
+        self.training_metadata: Dict[str, Any] = {}
+    
+    @staticmethod
+    def _new_model(class_weight: Optional[Dict[int, float]] = None) -> SGDClassifier:
+        """Create the incremental classifier trained with partial_fit."""
+        return SGDClassifier(
+            loss="log_loss",
+            alpha=1e-4,
+            class_weight=class_weight,
+            random_state=42
+        )
+    
+    @classmethod
+    def from_registry(cls, registry: ModelRegistry, version: Optional[str] = None) -> "ViolationPredictor":
+        """Load a trained predictor from the model registry (latest version by default)."""
+        artifacts, metadata = registry.load(MODEL_NAME, version)
+        
+        predictor = cls()
+        predictor.model = artifacts["model"]
+        predictor.scaler = artifacts["scaler"]
+        predictor.feature_names = list(artifacts["feature_names"])
+        predictor.model_version = metadata["version"]
+        predictor.training_metadata = metadata
+        predictor.is_trained = True
+        return predictor
+    
+    def publish(self, registry: ModelRegistry) -> str:
+        """Save the trained model to the registry as its new active version."""
+        if not self.is_trained:
+            raise ModelRegistryError("Cannot publish an untrained model")
+        
+        self.model_version = registry.save(
+            MODEL_NAME,
+            {
+                "model": self.model,
+                "scaler": self.scaler,
+                "feature_names": self.feature_names
+            },
+            self.training_metadata
+        )
+        self.training_metadata = {**self.training_metadata, "version": self.model_version}
+        return self.model_version
     
     def extract_features(self, record: Dict[str, Any]) -> Dict[str, float]:
         """Extract numerical features from a record."""
-        features = {}
-        
-        # Amount-based features
-        if 'amount' in record:
-            features['amount'] = float(record['amount'])
-            features['amount_log'] = np.log1p(float(record['amount']))
-        
-        # Approval features
-        features['has_approver_1'] = 1.0 if record.get('approver_1') else 0.0
-        features['has_approver_2'] = 1.0 if record.get('approver_2') else 0.0
-        features['approval_count'] = sum([
-            1 for k in ['approver_1', 'approver_2'] 
-            if record.get(k)
-        ])
-        
-        # Transaction features
-        features['has_transaction_id'] = 1.0 if record.get('transaction_id') else 0.0
-        features['has_customer_id'] = 1.0 if record.get('customer_id') else 0.0
-        
-        # Same person features
-        if record.get('initiator') and record.get('approver_1'):
-            features['same_initiator_approver'] = 1.0 if record['initiator'] == record['approver_1'] else 0.0
-        else:
-            features['same_initiator_approver'] = 0.0
+        return {name: float(value) for name, value in self.feature_frame([record]).iloc[0].items()}
+    
+    @staticmethod
+    def feature_frame(records: Union[pd.DataFrame, List[Dict[str, Any]]]) -> pd.DataFrame:
+        """
+        Compute FEATURE_NAMES for a batch of records in one vectorized pass.
+        
+        Missing or non-numeric amounts count as 0, and a field counts as
+        present when it holds a non-blank value.
+        
+        Args:
+            records: Records as a DataFrame or a list of dicts
+        
+        Returns:
+            One row per record, one column per feature, in FEATURE_NAMES order
+        """
+        frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(records)
+        
+        def column(key: str) -> pd.Series:
+            if key in frame.columns:
+                return frame[key]
+            return pd.Series(None, index=frame.index, dtype=object)
+        
+        def present(key: str) -> pd.Series:
+            values = column(key)
+            return values.notna() & values.astype(str).str.strip().ne("")
+        
+        amounts = pd.to_numeric(column('amount'), errors='coerce').fillna(0.0).astype(float)
+        has_approver_1 = present('approver_1')
+        has_approver_2 = present('approver_2')
+        same_initiator_approver = (
+            present('initiator')
+            & has_approver_1
+            & column('initiator').astype(str).eq(column('approver_1').astype(str))
+        )
         
-        return features
+        features = pd.DataFrame({
+            'amount': amounts,
+            'amount_log': np.log1p(amounts.clip(lower=0.0)),
+            'has_approver_1': has_approver_1,
+            'has_approver_2': has_approver_2,
+            'approval_count': has_approver_1.astype(int) + has_approver_2.astype(int),
+            'has_transaction_id': present('transaction_id'),
+            'has_customer_id': present('customer_id'),
+            'same_initiator_approver': same_initiator_approver,
+        }, index=frame.index)
+        return features[list(FEATURE_NAMES)].astype(float)
     
-    def train_model(self, db: Session, policy_id: Optional[str] = None) -> Dict[str, Any]:
-        """Train the ML model on historical violations."""
-        try:
-            logger.info("Training violation prediction model...")
+    def feature_matrix(self, features: pd.DataFrame) -> np.ndarray:
+        """
+        Select the model's features, in training order, as a float32 matrix.
+        
+        Features a loaded model was trained on but the schema no longer
+        produces are filled with 0.
+        """
+        return features.reindex(
+            columns=self.feature_names or list(FEATURE_NAMES),
+            fill_value=0.0
+        ).to_numpy(dtype=np.float32)
+    
+    @staticmethod
+    def _positive_records(db: Session, policy_id: Optional[str] = None) -> Query:
+        """
+        Query identifiers of company records with a confirmed violation.
+        
+        Violations corrected as false positives do not count, so records
+        whose only violations were dismissed are negatives.
+        """
+        query = db.query(Violation.record_identifier).outerjoin(
+            Correction,
+            and_(
+                Correction.violation_id == Violation.id,
+                Correction.corrected_decision == CorrectedDecision.FALSE_POSITIVE
+            )
+        ).filter(
+            Violation.table_name == "company_records",
+            Correction.id.is_(None)
+        )
+        if policy_id:
+            query = query.join(ComplianceRule, ComplianceRule.id == Violation.rule_id).filter(
+                ComplianceRule.policy_document_id == policy_id
+            )
+        return query.distinct()
+    
+    @classmethod
+    def _label_counts(cls, db: Session, policy_id: Optional[str] = None) -> Tuple[int, int]:
+        """Count records with a confirmed violation and records in total."""
+        positive_count = cls._positive_records(db, policy_id).count()
+        record_count = db.query(func.count(CompanyRecord.id)).scalar() or 0
+        return positive_count, record_count
+    
+    @staticmethod
+    def _training_pages(
+        db: Session,
+        policy_id: Optional[str],
+        chunk_size: int
+    ) -> Iterator[Tuple[List[Dict[str, Any]], List[Tuple[Any, str, Optional[CorrectedDecision]]]]]:
+        """
+        Stream company records in primary-key pages with their violations.
+        
+        Yields:
+            Record data for the page, and (violation id, record identifier,
+            corrected decision) rows for violations on those records, one
+            per correction; the decision is None for uncorrected violations
+        """
+        last_id = None
+        
+        # UUID primary keys make primary-key order effectively a random shuffle
+        while True:
+            query = db.query(CompanyRecord).order_by(CompanyRecord.id)
+            if last_id is not None:
+                query = query.filter(CompanyRecord.id > last_id)
+            records = query.limit(chunk_size).all()
+            if not records:
+                break
             
-            # Get historical violations
-            query = db.query(Violation)
+            record_data = [record_to_data(record) for record in records]
+            violations = db.query(
+                Violation.id,
+                Violation.record_identifier,
+                Correction.corrected_decision
+            ).outerjoin(Correction, Correction.violation_id == Violation.id).filter(
+                Violation.table_name == "company_records",
+                Violation.record_identifier.in_([data["id"] for data in record_data])
+            )
             if policy_id:
-                query = query.filter(Violation.policy_id == policy_id)
+                violations = violations.join(ComplianceRule, ComplianceRule.id == Violation.rule_id).filter(
+                    ComplianceRule.policy_document_id == policy_id
+                )
             
-            violations = query.all()
+            yield record_data, violations.all()
             
-            if len(violations) < 10:
-                logger.warning(f"Not enough data to train model: {len(violations)} violations")
+            last_id = records[-1].id
+            db.expunge_all()
+    
+    @staticmethod
+    def _labels(
+        record_ids: List[str],
+        violations: List[Tuple[Any, str, Optional[CorrectedDecision]]]
+    ) -> np.ndarray:
+        """
+        Label each record 1 when it has a confirmed violation, else 0.
+        
+        Mirrors _positive_records: a violation corrected as a false positive
+        does not count, whatever other corrections it has.
+        """
+        dismissed = {
+            violation_id
+            for violation_id, _, decision in violations
+            if decision == CorrectedDecision.FALSE_POSITIVE
+        }
+        positive_ids = {
+            record_id
+            for violation_id, record_id, _ in violations
+            if violation_id not in dismissed
+        }
+        return np.fromiter((record_id in positive_ids for record_id in record_ids), dtype=int, count=len(record_ids))
+    
+    def train_model(
+        self,
+        db: Session,
+        policy_id: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Train the ML model by streaming labelled company records.
+        
+        Records are read in primary-key pages and labelled 1 when they have a
+        confirmed violation and 0 otherwise. Each page updates the scaler and
+        the classifier with partial_fit, so memory is bounded by the page
+        size rather than the table size. Accuracy is progressive: each page
+        is scored before the model learns from it.
+        """
+        chunk_size = chunk_size or settings.predictor_training_chunk_size
+        
+        try:
+            logger.info("Training violation prediction model...")
+            
+            positive_count, record_count = self._label_counts(db, policy_id)
+            negative_count = record_count - positive_count
+            
+            if positive_count < 10 or negative_count < 1:
+                logger.warning(
+                    f"Not enough data to train model: {positive_count} violating and "
+                    f"{negative_count} clean records"
+                )
                 return {
                     "success": False,
-                    "message": "Not enough historical data (minimum 10 violations required)",
-                    "violations_count": len(violations)
+                    "message": "Not enough labelled records (minimum 10 violating records and 1 clean record required)",
+                    "violations_count": positive_count
                 }
             
-            # Prepare training data
-            X_data = []
-            y_data = []
+            # Balanced class weights from the table-wide label counts; violations are rare
+            self.model = self._new_model({
+                0: record_count / (2 * negative_count),
+                1: record_count / (2 * positive_count)
+            })
+            self.scaler = StandardScaler()
+            self.feature_names = list(FEATURE_NAMES)
+            classes = np.array([0, 1])
             
-            for violation in violations:
-                if violation.record_snapshot:
-                    features = self.extract_features(violation.record_snapshot)
-                    X_data.append(list(features.values()))
-                    y_data.append(1)  # Violation occurred
-                    
-                    # Store feature names from first record
-                    if not self.feature_names:
-                        self.feature_names = list(features.keys())
-            
-            # Add some non-violation examples (synthetic for now)
-            # In production, you'd have actual non-violation records
-            for _ in range(len(violations) // 2):
-                # Create synthetic "good" records
-                good_record = {
-                    'amount': np.random.uniform(1000, 20000),
-                    'approver_1': 'EMP001',
-                    'approver_2': 'EMP002',
-                    'initiator': 'EMP003',
-                    'transaction_id': 'TXN001',
-                    'customer_id': 'CUST001'
-                }
-                features = self.extract_features(good_record)
-                X_data.append(list(features.values()))
-                y_data.append(0)  # No violation
+            samples, positives, evaluated, correct = 0, 0, 0, 0
             
-            # Convert to numpy arrays
-            X = np.array(X_data)
-            y = np.array(y_data)
+            for record_data, violations in self._training_pages(db, policy_id, chunk_size):
+                y = self._labels([data["id"] for data in record_data], violations)
+                
+                X = self.feature_matrix(self.feature_frame(record_data))
+                self.scaler.partial_fit(X)
+                X_scaled = self.scaler.transform(X)
+                
+                if samples:
+                    correct += int((self.model.predict(X_scaled) == y).sum())
+                    evaluated += len(y)
+                self.model.partial_fit(X_scaled, y, classes=classes)
+                
+                samples += len(y)
+                positives += int(y.sum())
+                logger.info(f"Trained on {samples} of {record_count} records")
             
-            # Scale features
-            X_scaled = self.scaler.fit_transform(X)
-            
-            # Train model
-            self.model.fit(X_scaled, y)
             self.is_trained = True
-            
-            # Calculate training accuracy
-            train_accuracy = self.model.score(X_scaled, y)
+            train_accuracy = correct / evaluated if evaluated else float(self.model.score(X_scaled, y))
             
             logger.info(f"Model trained successfully. Accuracy: {train_accuracy:.2%}")
             
+            self.training_metadata = {
+                "trained_at": datetime.utcnow().isoformat(),
+                "policy_id": policy_id,
+                "model_type": type(self.model).__name__,
+                "model_params": self.model.get_params(),
+                "violations_count": positives,
+                "training_samples": samples,
+                "negative_samples": samples - positives,
+                "accuracy": train_accuracy,
+                "feature_names": self.feature_names
+            }
+            
             return {
                 "success": True,
                 "message": "Model trained successfully",
-                "violations_count": len(violations),
-                "training_samples": len(X),
+                "violations_count": positives,
+                "training_samples": samples,
+                "negative_samples": samples - positives,
                 "accuracy": train_accuracy,
                 "feature_count": len(self.feature_names),
                 "features": self.feature_names
             }
-            
+        
         except Exception as e:
             logger.error(f"Error training model: {str(e)}")
             return {
@@ -145,53 +350,55 @@ class ViolationPredictor:
     
     def predict_violation(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Predict violation probability for a record."""
+        return self.predict_batch([record])[0]
+    
+    def predict_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Predict violation probability for many records in one model pass.
+        
+        Features are computed column-wise and predict_proba runs once for
+        the whole batch, which is where nearly all the per-call overhead of
+        scikit-learn goes for single rows.
+        """
+        if not records:
+            return []
+        
+        if not self.is_trained:
+            # Return rule-based prediction if model not trained
+            return [self._rule_based_prediction(record) for record in records]
+        
         try:
-            if not self.is_trained:
-                # Return rule-based prediction if model not trained
-                return self._rule_based_prediction(record)
-            
-            # Extract features
-            features = self.extract_features(record)
-            
-            # Ensure feature order matches training
-            X = np.array([[features.get(name, 0.0) for name in self.feature_names]])
-            
-            # Scale features
-            X_scaled = self.scaler.transform(X)
-            
-            # Predict
-            probability = self.model.predict_proba(X_scaled)[0][1]  # Probability of violation
-            confidence = max(self.model.predict_proba(X_scaled)[0])  # Confidence in prediction
-            
-            # Determine risk level
-            if probability >= 0.8:
-                risk_level = "critical"
-            elif probability >= 0.6:
-                risk_level = "high"
-            elif probability >= 0.4:
-                risk_level = "medium"
-            else:
-                risk_level = "low"
+            features = self.feature_frame(records)
             
-            # Identify risk factors
-            risk_factors = self._identify_risk_factors(record, features)
+            probabilities = self.model.predict_proba(self.scaler.transform(self.feature_matrix(features)))
+            violation_probability = probabilities[:, 1]  # Probability of violation
+            confidence = probabilities.max(axis=1)  # Confidence in prediction
             
-            # Generate recommendations
-            recommendations = self._generate_recommendations(risk_factors, probability)
+            risk_levels = np.select(
+                [violation_probability >= 0.8, violation_probability >= 0.6, violation_probability >= 0.4],
+                ["critical", "high", "medium"],
+                default="low"
+            )
+        
+        except Exception as e:
+            logger.error(f"Error predicting violations: {str(e)}")
+            return [self._rule_based_prediction(record) for record in records]
+        
+        predictions = []
+        for i, (record, record_features) in enumerate(zip(records, features.to_dict('records'))):
+            risk_factors = self._identify_risk_factors(record, record_features)
             
-            return {
-                "violation_probability": float(probability),
-                "confidence_score": float(confidence),
-                "risk_level": risk_level,
+            predictions.append({
+                "violation_probability": float(violation_probability[i]),
+                "confidence_score": float(confidence[i]),
+                "risk_level": str(risk_levels[i]),
                 "risk_factors": risk_factors,
-                "recommendations": recommendations,
+                "recommendations": self._generate_recommendations(risk_factors, violation_probability[i]),
                 "model_version": self.model_version,
                 "prediction_method": "ml_model"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error predicting violation: {str(e)}")
-            return self._rule_based_prediction(record)
+            })
+        
+        return predictions
     
     def _rule_based_prediction(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback rule-based prediction when ML model is not available."""
@@ -199,7 +406,7 @@ class ViolationPredictor:
         probability = 0.0
         
         # Check amount
-        amount = float(record.get('amount', 0))
+        amount = float(record.get('amount') or 0)
         if amount > 25000:
             risk_factors.append("Transaction amount exceeds $25,000 threshold")
             probability += 0.3
@@ -244,7 +451,7 @@ class ViolationPredictor:
         risk_factors = []
         
         # Amount-based risks
-        amount = float(record.get('amount', 0))
+        amount = features.get('amount', 0.0)
         if amount > 25000:
             risk_factors.append(f"High transaction amount: ${amount:,.2f}")
         
@@ -293,15 +500,222 @@ class ViolationPredictor:
         return recommendations
 
 
-# Global predictor instance
-_predictor = ViolationPredictor()
+# Per-process predictor, loaded lazily from the registry and swapped when a new version is activated
+_registry = ModelRegistry()
+_predictor: Optional[ViolationPredictor] = None
+_predictor_checked_at = 0.0
+_predictor_lock = threading.Lock()
 
 
 def get_predictor() -> ViolationPredictor:
-    """Get the global predictor instance."""
+    """
+    Get the active predictor for this process.
+    
+    The registry's active version is re-checked at most every
+    MODEL_REGISTRY_POLL_SECONDS; when it changed, the new version is loaded
+    and swapped in, so training or rolling back in one worker reaches every
+    worker without a restart. Until a model has been trained, an untrained
+    predictor is returned and predictions use the rule-based fallback.
+    """
+    global _predictor, _predictor_checked_at
+    
+    if _predictor is not None and time.monotonic() - _predictor_checked_at < settings.model_registry_poll_seconds:
+        return _predictor
+    
+    with _predictor_lock:
+        if _predictor is None or time.monotonic() - _predictor_checked_at >= settings.model_registry_poll_seconds:
+            _predictor_checked_at = time.monotonic()
+            latest = _registry.latest_version(MODEL_NAME)
+            
+            if latest and (_predictor is None or _predictor.model_version != latest):
+                try:
+                    _predictor = ViolationPredictor.from_registry(_registry, latest)
+                    logger.info(f"Loaded violation predictor version {latest}")
+                except Exception as e:
+                    logger.error(f"Error loading model version {latest}: {str(e)}")
+            
+            if _predictor is None:
+                _predictor = ViolationPredictor()
+    
     return _predictor
 
 
+def train_predictor(db: Session, policy_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Train a new predictor, publish it to the registry and swap it in.
+    
+    A fresh instance is trained so requests keep using the current model
+    until the new one is complete.
+    """
+    global _predictor, _predictor_checked_at
+    
+    predictor = ViolationPredictor()
+    result = predictor.train_model(db, policy_id)
+    if not result["success"]:
+        return result
+    
+    result["model_version"] = predictor.publish(_registry)
+    with _predictor_lock:
+        _predictor = predictor
+        _predictor_checked_at = time.monotonic()
+    
+    return result
+
+
+def list_model_versions() -> List[Dict[str, Any]]:
+    """List registry versions of the violation predictor, newest first."""
+    return _registry.list_versions(MODEL_NAME)
+
+
+def activate_model_version(version: str) -> ViolationPredictor:
+    """Make a registry version active (e.g. to roll back) and swap it in."""
+    global _predictor, _predictor_checked_at
+    
+    predictor = ViolationPredictor.from_registry(_registry, version)
+    _registry.activate(MODEL_NAME, version)
+    with _predictor_lock:
+        _predictor = predictor
+        _predictor_checked_at = time.monotonic()
+    
+    return predictor
+
+
+def resolve_record_ids(db: Session, records: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Map submitted records to the CompanyRecord ids predictions are stored under.
+    
+    Predictions are keyed by CompanyRecord id, as score_company_records and
+    violations key them. A record's own "id" is used when it names a
+    company record; otherwise the record is looked up by transaction_id.
+    
+    Returns:
+        CompanyRecord id per record, in input order; None for records that
+        match no company record
+    """
+    record_ids = set()
+    for record in records:
+        try:
+            record_ids.add(uuid.UUID(str(record.get("id"))))
+        except ValueError:
+            pass
+    transaction_ids = {record["transaction_id"] for record in records if record.get("transaction_id")}
+    
+    known_ids, by_transaction = set(), {}
+    if record_ids:
+        known_ids = {
+            str(record_id)
+            for (record_id,) in db.query(CompanyRecord.id).filter(CompanyRecord.id.in_(record_ids))
+        }
+    if transaction_ids:
+        by_transaction = {
+            transaction_id: str(record_id)
+            for record_id, transaction_id in db.query(CompanyRecord.id, CompanyRecord.transaction_id).filter(
+                CompanyRecord.transaction_id.in_(transaction_ids)
+            )
+        }
+    
+    resolved = []
+    for record in records:
+        record_id = str(record.get("id"))
+        if record_id in known_ids:
+            resolved.append(record_id)
+        else:
+            resolved.append(by_transaction.get(record.get("transaction_id")))
+    return resolved
+
+
+def save_predictions(
+    db: Session,
+    record_ids: List[Optional[str]],
+    predictions: List[Dict[str, Any]],
+    policy_id: Optional[str] = None
+) -> List[Optional[uuid.UUID]]:
+    """
+    Bulk-insert predictions in one statement, replacing earlier ones.
+    
+    Earlier predictions of the same records under the same policy are
+    deleted, so repeated scoring runs keep one row per record and policy;
+    predictions with a recorded actual outcome are kept for accuracy
+    tracking. Predictions whose record id is None are not stored.
+    
+    Returns:
+        IDs of the inserted Prediction rows in input order, None where
+        nothing was stored
+    """
+    predicted_at = datetime.utcnow()
+    prediction_ids = [uuid.uuid4() if record_id is not None else None for record_id in record_ids]
+    rows = [
+        {
+            "id": prediction_id,
+            "record_id": record_id,
+            "policy_id": policy_id,
+            "violation_probability": prediction["violation_probability"],
+            "confidence_score": prediction["confidence_score"],
+            "risk_level": prediction["risk_level"],
+            "risk_factors": prediction["risk_factors"],
+            "recommendations": prediction["recommendations"],
+            "model_version": prediction["model_version"],
+            "predicted_at": predicted_at
+        }
+        for prediction_id, record_id, prediction in zip(prediction_ids, record_ids, predictions)
+        if prediction_id is not None
+    ]
+    if rows:
+        db.execute(delete(Prediction).where(
+            Prediction.record_id.in_({row["record_id"] for row in rows}),
+            Prediction.policy_id.is_not_distinct_from(policy_id),
+            Prediction.actual_violation.is_(None),
+            Prediction.predicted_at < predicted_at
+        ))
+        db.execute(insert(Prediction), rows)
+    return prediction_ids
+
+
+def score_company_records(
+    db: Session,
+    policy_id: Optional[str] = None,
+    chunk_size: int = 5000
+) -> Dict[str, Any]:
+    """
+    Predict every company record and store the results for get_high_risk_records.
+    
+    Records are read in primary-key pages, each page is scored with one
+    predict_batch call and written with one bulk insert that replaces the
+    page's earlier predictions, so the table holds one current prediction
+    per record rather than growing with every run. A single model version
+    is used for the whole run.
+    """
+    predictor = get_predictor()
+    scored = 0
+    high_risk = 0
+    last_id = None
+    
+    while True:
+        query = db.query(CompanyRecord).order_by(CompanyRecord.id)
+        if last_id is not None:
+            query = query.filter(CompanyRecord.id > last_id)
+        records = query.limit(chunk_size).all()
+        if not records:
+            break
+        
+        record_data = [record_to_data(record) for record in records]
+        predictions = predictor.predict_batch(record_data)
+        save_predictions(db, [data["id"] for data in record_data], predictions, policy_id)
+        db.commit()
+        
+        scored += len(records)
+        high_risk += sum(1 for prediction in predictions if prediction["risk_level"] in ("high", "critical"))
+        last_id = records[-1].id
+        db.expunge_all()
+        logger.info(f"Scored {scored} company records")
+    
+    return {
+        "records_scored": scored,
+        "high_risk_records": high_risk,
+        "model_version": predictor.model_version
+    }
+
+
 async def get_high_risk_records(
     db: Session,
     policy_id: Optional[str] = None,
@@ -310,20 +724,21 @@ async def get_high_risk_records(
 ) -> List[Dict[str, Any]]:
     """Get records with high violation probability."""
     try:
-        predictor = get_predictor()
-        
-        # Get recent predictions
-        query = db.query(Prediction).filter(
-            Prediction.violation_probability >= threshold
-        ).order_by(Prediction.violation_probability.desc())
-        
+        # Latest stored prediction per record, so re-scored records are not listed twice
+        latest = db.query(Prediction).distinct(Prediction.record_id).order_by(
+            Prediction.record_id,
+            Prediction.predicted_at.desc()
+        )
         if policy_id:
-            query = query.filter(Prediction.policy_id == policy_id)
+            latest = latest.filter(Prediction.policy_id == policy_id)
+        LatestPrediction = aliased(Prediction, latest.subquery())
         
-        predictions = query.limit(limit).all()
+        predictions = db.query(LatestPrediction).filter(
+            LatestPrediction.violation_probability >= threshold
+        ).order_by(LatestPrediction.violation_probability.desc()).limit(limit).all()
         
         return [pred.to_dict() for pred in predictions]
-        
+    
     except Exception as e:
         logger.error(f"Error getting high-risk records: {str(e)}")
         return []
@@ -359,7 +774,7 @@ async def simulate_what_if(
                 "risk_level_change": f"{original_prediction['risk_level']} → {modified_prediction['risk_level']}"
             }
         }
-        
+    
     except Exception as e:
         logger.error(f"Error in what-if simulation: {str(e)}")
         raise
@@ -1,12 +1,16 @@
 """Reasoning trace generation service."""
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from openai import OpenAI
 
 from src.core.logging import get_logger
 from src.config.settings import settings
 from src.prompts.reasoning_trace import get_reasoning_trace_prompt
+from src.prompts.record_context import prompt_record
+from src.services.llm.cache import get_llm_cache
+from src.services.llm.batch import BatchRequest, parse_json_response
+from src.services.violation_templates import ViolationTemplates, MODE_TEMPLATE
 
 logger = get_logger(__name__)
 
@@ -14,16 +18,21 @@ logger = get_logger(__name__)
 class ReasoningTraceGenerator:
     """Generate step-by-step reasoning traces for violation decisions."""
     
+    SYSTEM_MESSAGE = "You are an AI compliance auditor that provides clear, step-by-step explanations of your reasoning."
+    
     def __init__(self):
         """Initialize reasoning trace generator."""
         self.client = OpenAI(api_key=settings.openai_api_key)
+        self.cache = get_llm_cache()
     
     def generate_trace(
         self,
         rule_description: str,
         severity: str,
         record_data: Dict[str, Any],
-        violation_details: Dict[str, Any]
+        violation_details: Dict[str, Any],
+        mode: Optional[str] = None,
+        raise_errors: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Generate a multi-step reasoning trace.
@@ -33,12 +42,17 @@ class ReasoningTraceGenerator:
             severity: Severity level
             record_data: The record being evaluated
             violation_details: Details about the violation
+            mode: "template" to render without the LLM when the condition allows
+            raise_errors: Raise LLM failures instead of returning a fallback trace
             
         Returns:
             List of reasoning steps
         """
+        if mode == MODE_TEMPLATE and ViolationTemplates.supports(violation_details.get("expected") or {}):
+            return ViolationTemplates.render_trace(rule_description, severity, record_data, violation_details)
+        
         try:
-            prompt = get_reasoning_trace_prompt(
+            request = self.build_trace_request(
                 rule_description,
                 severity,
                 record_data,
@@ -47,58 +61,129 @@ class ReasoningTraceGenerator:
             
             logger.info("Generating reasoning trace")
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an AI compliance auditor that provides clear, step-by-step explanations of your reasoning."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=1500
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Parse JSON response
-            try:
-                steps = json.loads(content)
-                
-                # Validate and clean steps
-                validated_steps = []
-                for step in steps:
-                    validated_step = {
-                        "step_number": step.get("step_number", len(validated_steps) + 1),
-                        "description": step.get("description", ""),
-                        "rules_evaluated": step.get("rules_evaluated", []),
-                        "policy_references": step.get("policy_references", []),
-                        "confidence_score": min(100, max(0, step.get("confidence_score", 80))),
-                        "outcome": step.get("outcome", "inconclusive")
-                    }
-                    validated_steps.append(validated_step)
-                
-                logger.info(
-                    "Reasoning trace generated",
-                    steps_count=len(validated_steps)
+            def complete() -> str:
+                response = self.client.chat.completions.create(
+                    model="gpt-4",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": request.system_message
+                        },
+                        {
+                            "role": "user",
+                            "content": request.prompt
+                        }
+                    ],
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens
                 )
-                
-                return validated_steps
-                
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse reasoning trace JSON: {e}")
-                # Return a default single-step trace
-                return self._create_fallback_trace(
-                    rule_description,
-                    violation_details
+                return response.choices[0].message.content
+            
+            if self.cache is None:
+                content = complete()
+            else:
+                key = self.cache.make_key(
+                    "gpt-4",
+                    request.system_message,
+                    request.prompt,
+                    request.temperature,
+                    max_tokens=request.max_tokens
                 )
+                content = self.cache.get_or_create(key, complete)
+            
+            return self.parse_trace(content, rule_description, violation_details)
                 
         except Exception as e:
             logger.error(f"Error generating reasoning trace: {e}")
+            if raise_errors:
+                raise
+            return self._create_fallback_trace(
+                rule_description,
+                violation_details
+            )
+    
+    def build_trace_request(
+        self,
+        rule_description: str,
+        severity: str,
+        record_data: Dict[str, Any],
+        violation_details: Dict[str, Any]
+    ) -> BatchRequest:
+        """
+        Build the reasoning trace completion request.
+        
+        Args:
+            rule_description: Description of the compliance rule
+            severity: Severity level
+            record_data: The record being evaluated
+            violation_details: Details about the violation
+            
+        Returns:
+            Completion request for the LLM batch executor
+        """
+        prompt = get_reasoning_trace_prompt(
+            rule_description,
+            severity,
+            prompt_record(record_data, violation_details.get("expected")),
+            violation_details
+        )
+        return BatchRequest(
+            prompt=prompt,
+            system_message=self.SYSTEM_MESSAGE,
+            temperature=0.3,
+            max_tokens=1500
+        )
+    
+    def parse_trace(
+        self,
+        content: Optional[str],
+        rule_description: str,
+        violation_details: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse and validate a generated reasoning trace.
+        
+        Args:
+            content: Completion content, or None if generation failed
+            rule_description: Rule description (for the fallback trace)
+            violation_details: Violation details (for the fallback trace)
+            
+        Returns:
+            List of reasoning steps, or the fallback trace if unparseable
+        """
+        if content is None:
+            return self._create_fallback_trace(rule_description, violation_details)
+        
+        # Parse JSON response
+        try:
+            steps = parse_json_response(content)
+            if not isinstance(steps, list) or not all(isinstance(step, dict) for step in steps):
+                raise ValueError(f"expected a list of step objects, got {type(steps).__name__}")
+            
+            # Validate and clean steps
+            validated_steps = []
+            for step in steps:
+                validated_step = {
+                    "step_number": step.get("step_number", len(validated_steps) + 1),
+                    "description": step.get("description", ""),
+                    "rules_evaluated": step.get("rules_evaluated", []),
+                    "policy_references": step.get("policy_references", []),
+                    "confidence_score": min(100, max(0, step.get("confidence_score", 80))),
+                    "outcome": step.get("outcome", "inconclusive")
+                }
+                validated_steps.append(validated_step)
+            
+            logger.info(
+                "Reasoning trace generated",
+                steps_count=len(validated_steps)
+            )
+            
+            return validated_steps
+            
+        except (ValueError, TypeError) as e:
+            # JSONDecodeError is a ValueError; TypeError covers malformed step fields
+            logger.warning(f"Failed to parse reasoning trace JSON: {e}")
+            # Return a default single-step trace
             return self._create_fallback_trace(
                 rule_description,
                 violation_details
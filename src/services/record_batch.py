@@ -0,0 +1,249 @@
+"""Columnar record batches for vectorized rule evaluation."""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models import CompanyRecord
+from src.services.rule_compiler import CompiledRule, OPERATORS
+
+# First-class CompanyRecord columns exposed to rules, in snapshot order
+RECORD_COLUMNS = (
+    "id",
+    "transaction_id",
+    "amount",
+    "transaction_type",
+    "from_account",
+    "to_account",
+    "timestamp",
+)
+
+_MISSING = object()
+
+
+def record_to_data(record: CompanyRecord) -> Dict[str, Any]:
+    """
+    Flatten a CompanyRecord into the dict rules are evaluated against.
+    
+    Keys from the JSONB data column override first-class columns.
+    
+    Args:
+        record: Company record
+    
+    Returns:
+        Record data used for evaluation and violation snapshots
+    """
+    return {
+        "id": str(record.id),
+        "transaction_id": record.transaction_id,
+        "amount": record.amount,
+        "transaction_type": record.transaction_type,
+        "from_account": record.from_account,
+        "to_account": record.to_account,
+        "timestamp": record.timestamp.isoformat() if record.timestamp else None,
+        **(record.data or {})
+    }
+
+
+def hot_keys_for(rules: Iterable[CompiledRule]) -> List[str]:
+    """
+    Get the top-level record keys referenced by a set of compiled rules.
+    
+    Args:
+        rules: Compiled rules
+    
+    Returns:
+        Sorted list of keys to materialize as columns
+    """
+    return sorted({rule.path[0] for rule in rules if rule.path})
+
+
+class RecordBatch:
+    """A chunk of records materialized as pandas columns."""
+    
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        records: Optional[Sequence[CompanyRecord]] = None,
+        rows: Optional[Sequence[Dict[str, Any]]] = None
+    ):
+        """
+        Initialize record batch.
+        
+        Args:
+            frame: One object column per materialized record key
+            records: Source CompanyRecord rows, if built from the ORM
+            rows: Source record dicts, if built from plain data
+        """
+        self.frame = frame
+        self.records = records
+        self.rows = rows
+    
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[CompanyRecord],
+        hot_keys: Iterable[str] = ()
+    ) -> "RecordBatch":
+        """
+        Build a batch from CompanyRecord rows.
+        
+        First-class columns are always materialized; hot keys are pulled from
+        the JSONB data column and take precedence, matching record_to_data.
+        
+        Args:
+            records: Company records in the chunk
+            hot_keys: Keys referenced by the rules being evaluated
+        
+        Returns:
+            Record batch
+        """
+        columns: Dict[str, List[Any]] = {
+            "id": [str(r.id) for r in records],
+            "transaction_id": [r.transaction_id for r in records],
+            "amount": [r.amount for r in records],
+            "transaction_type": [r.transaction_type for r in records],
+            "from_account": [r.from_account for r in records],
+            "to_account": [r.to_account for r in records],
+            "timestamp": [r.timestamp.isoformat() if r.timestamp else None for r in records],
+        }
+        
+        for key in hot_keys:
+            data_values = [(r.data or {}).get(key, _MISSING) for r in records]
+            base = columns.get(key, [None] * len(records))
+            columns[key] = [
+                value if value is not _MISSING else fallback
+                for value, fallback in zip(data_values, base)
+            ]
+        
+        return cls(cls._to_frame(columns, len(records)), records=records)
+    
+    @classmethod
+    def from_dicts(
+        cls,
+        rows: Sequence[Dict[str, Any]],
+        hot_keys: Iterable[str] = ()
+    ) -> "RecordBatch":
+        """
+        Build a batch from already-flattened record dicts.
+        
+        Args:
+            rows: Record data dicts
+            hot_keys: Keys referenced by the rules being evaluated
+        
+        Returns:
+            Record batch
+        """
+        keys = set(hot_keys) | {"id"}
+        columns = {key: [row.get(key) for row in rows] for key in keys}
+        return cls(cls._to_frame(columns, len(rows)), rows=rows)
+    
+    @staticmethod
+    def _to_frame(columns: Dict[str, List[Any]], length: int) -> pd.DataFrame:
+        """Build an object-dtype frame so values keep their Python types."""
+        return pd.DataFrame(
+            {key: pd.Series(values, dtype=object) for key, values in columns.items()},
+            index=pd.RangeIndex(length)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.frame)
+    
+    def column(self, path: Tuple[str, ...]) -> pd.Series:
+        """
+        Get the values for a (possibly dotted) field path.
+        
+        Args:
+            path: Field path split on dots
+        
+        Returns:
+            Object series aligned with the batch, None where missing
+        """
+        if path[0] in self.frame:
+            values = self.frame[path[0]]
+        else:
+            values = pd.Series([None] * len(self), dtype=object)
+        
+        if len(path) > 1:
+            rest = path[1:]
+            values = values.map(lambda value: _walk(value, rest))
+        
+        return values
+    
+    def record_data(self, index: int) -> Dict[str, Any]:
+        """
+        Get the full record data for one row of the batch.
+        
+        Args:
+            index: Row position in the batch
+        
+        Returns:
+            Record data dict
+        """
+        if self.records is not None:
+            return record_to_data(self.records[index])
+        return self.rows[index]
+    
+    def evaluate(self, compiled: CompiledRule) -> np.ndarray:
+        """
+        Evaluate a compiled rule against every row with array operations.
+        
+        Mirrors CompiledRule.evaluate: missing values only violate
+        is_not_null, and non-numeric values never satisfy comparisons.
+        
+        Args:
+            compiled: Compiled rule
+        
+        Returns:
+            Boolean mask of violating rows
+        """
+        size = len(self)
+        if not compiled.path:
+            return np.zeros(size, dtype=bool)
+        
+        operator = compiled.operator
+        if operator == "is_not_null":
+            # Missing values violate, and present values are not null
+            return np.ones(size, dtype=bool)
+        
+        if operator not in OPERATORS or compiled.predicate is not OPERATORS[operator][0]:
+            return np.zeros(size, dtype=bool)
+        
+        values = self.column(compiled.path)
+        present = values.notna().to_numpy()
+        expected = compiled.expected
+        
+        if operator in ("greater_than", "less_than"):
+            numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+            with np.errstate(invalid="ignore"):
+                mask = numbers > expected if operator == "greater_than" else numbers < expected
+        elif operator in ("equals", "not_equals"):
+            mask = (values.astype(str) == expected).to_numpy()
+            if operator == "not_equals":
+                mask = ~mask
+        elif operator in ("contains", "not_contains"):
+            mask = values.astype(str).str.lower().str.contains(expected, regex=False).to_numpy(dtype=bool)
+            if operator == "not_contains":
+                mask = ~mask
+        elif operator == "regex_match":
+            mask = values.astype(str).str.contains(expected, regex=True).to_numpy(dtype=bool)
+        else:
+            # is_null can never fire on a present value
+            mask = np.zeros(size, dtype=bool)
+        
+        return mask & present
+
+
+def _walk(value: Any, path: Tuple[str, ...]) -> Any:
+    """Walk the remaining keys of a dotted path into a nested value."""
+    for key in path:
+        if isinstance(value, dict):
+            value = value.get(key)
+        else:
+            return None
+        
+        if value is None:
+            return None
+    
+    return value
@@ -0,0 +1,395 @@
+"""Redis cache for read-heavy API responses with tag-based invalidation."""
+
+import functools
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Set
+
+from fastapi.encoders import jsonable_encoder
+from redis import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """
+    Cache JSON responses in Redis under versioned tags.
+    
+    Every tag (a table or view name such as "violations") has a version
+    counter, and each cache key embeds the current versions of its tags.
+    Invalidating a tag is a single INCR: entries written under the old
+    version are never read again and expire with their TTL. A response
+    computed while a write commits is stored under the version it read, so
+    it cannot outlive the invalidation. Cache failures are logged and
+    treated as misses, never raised.
+    """
+    
+    KEY_PREFIX = "http:cache:"
+    TAG_PREFIX = "http:cache:tag:"
+    STATS_KEY = "http:cache:stats"
+    LATENCY_PREFIX = "http:cache:latency:"
+    
+    # Latency samples kept per route for percentiles
+    LATENCY_SAMPLES = 1000
+    
+    def __init__(self, redis_client: Redis, ttl_seconds: Optional[int] = None):
+        """
+        Initialize response cache.
+        
+        Args:
+            redis_client: Redis client shared by API and worker processes
+            ttl_seconds: Default time to live for cached responses
+        """
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds or settings.response_cache_ttl_seconds
+        
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = defaultdict(int)
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.LATENCY_SAMPLES))
+    
+    def make_key(self, route: str, params: Dict[str, Any], tags: Sequence[str]) -> str:
+        """
+        Build the cache key for a request at the current tag versions.
+        
+        Args:
+            route: Route identifier
+            params: Query parameters that change the response
+            tags: Tags the response depends on
+        
+        Returns:
+            Cache key
+        """
+        versions = self.redis.mget([self.TAG_PREFIX + tag for tag in tags]) if tags else []
+        payload = json.dumps(
+            {
+                "params": params,
+                "tags": {tag: version or "0" for tag, version in zip(tags, versions)},
+            },
+            sort_keys=True,
+            default=str
+        )
+        return f"{self.KEY_PREFIX}{route}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_key
+        
+        Returns:
+            Decoded response or None on a miss
+        """
+        content = self.redis.get(key)
+        return json.loads(content) if content is not None else None
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """
+        Store a JSON-serializable response.
+        
+        Args:
+            key: Cache key from make_key
+            value: Response body
+            ttl_seconds: Time to live (defaults to the cache TTL)
+        """
+        self.redis.setex(key, ttl_seconds or self.ttl_seconds, json.dumps(value))
+    
+    def invalidate(self, *tags: str) -> None:
+        """
+        Invalidate every response that depends on any of the tags.
+        
+        Args:
+            *tags: Tags whose data changed
+        """
+        if not tags:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tag in tags:
+                pipe.incr(self.TAG_PREFIX + tag)
+            pipe.execute()
+            logger.debug("Response cache invalidated", tags=list(tags))
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Response cache invalidation failed", tags=list(tags), error=str(e))
+    
+    def record(self, route: str, hit: bool, elapsed_ms: float) -> None:
+        """
+        Record a served request for hit ratio and latency metrics.
+        
+        Args:
+            route: Route identifier
+            hit: Whether the response came from the cache
+            elapsed_ms: Time to serve the request
+        """
+        outcome = "hits" if hit else "misses"
+        latency_key = f"{route}:{outcome}"
+        with self._lock:
+            self._stats[f"{route}:{outcome}"] += 1
+            self._latencies[latency_key].append(elapsed_ms)
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hincrby(self.STATS_KEY, f"{route}:{outcome}", 1)
+            pipe.lpush(self.LATENCY_PREFIX + latency_key, round(elapsed_ms, 3))
+            pipe.ltrim(self.LATENCY_PREFIX + latency_key, 0, self.LATENCY_SAMPLES - 1)
+            pipe.execute()
+        except Exception:
+            pass
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get hit ratio and latency percentiles per route and overall.
+        
+        Counts and samples are shared across processes through Redis when
+        it is reachable, otherwise they cover this process only.
+        
+        Returns:
+            Totals, hit rate and per-route hit/miss counts with p50/p95 latency
+        """
+        scope = "shared"
+        try:
+            stats = {k: int(v) for k, v in self.redis.hgetall(self.STATS_KEY).items()}
+            routes = {name.rsplit(":", 1)[0] for name in stats if name != "errors"}
+            pipe = self.redis.pipeline(transaction=False)
+            latency_keys = [f"{route}:{outcome}" for route in sorted(routes) for outcome in ("hits", "misses")]
+            for latency_key in latency_keys:
+                pipe.lrange(self.LATENCY_PREFIX + latency_key, 0, -1)
+            latencies = {
+                latency_key: [float(sample) for sample in samples]
+                for latency_key, samples in zip(latency_keys, pipe.execute())
+            }
+        except Exception as e:
+            logger.warning("Failed to read response cache stats", error=str(e))
+            scope = "process"
+            with self._lock:
+                stats = dict(self._stats)
+                latencies = {name: list(samples) for name, samples in self._latencies.items()}
+        
+        routes = {}
+        for name in sorted(set(stats) | set(latencies)):
+            if name == "errors":
+                continue
+            route = name.rsplit(":", 1)[0]
+            if route not in routes:
+                routes[route] = self._route_metrics(
+                    stats.get(f"{route}:hits", 0),
+                    stats.get(f"{route}:misses", 0),
+                    latencies.get(f"{route}:hits", []),
+                    latencies.get(f"{route}:misses", [])
+                )
+        
+        hits = sum(route["hits"] for route in routes.values())
+        misses = sum(route["misses"] for route in routes.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "errors": stats.get("errors", 0),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "routes": routes,
+            "scope": scope,
+        }
+    
+    def reset_metrics(self) -> None:
+        """Reset hit, miss and latency metrics."""
+        with self._lock:
+            self._stats.clear()
+            self._latencies.clear()
+        try:
+            keys = [self.STATS_KEY, *self.redis.scan_iter(match=self.LATENCY_PREFIX + "*")]
+            self.redis.delete(*keys)
+        except Exception as e:
+            logger.warning("Failed to reset response cache stats", error=str(e))
+    
+    @staticmethod
+    def _route_metrics(hits: int, misses: int, hit_latencies: List[float], miss_latencies: List[float]) -> Dict[str, Any]:
+        """Summarize one route's counts and latency samples."""
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "p50_ms": _percentile(hit_latencies + miss_latencies, 50),
+            "p95_ms": _percentile(hit_latencies + miss_latencies, 95),
+            "hit_p95_ms": _percentile(hit_latencies, 95),
+            "miss_p95_ms": _percentile(miss_latencies, 95),
+        }
+    
+    def _count(self, name: str) -> None:
+        """Increment a local counter and its shared Redis copy."""
+        with self._lock:
+            self._stats[name] += 1
+        try:
+            self.redis.hincrby(self.STATS_KEY, name, 1)
+        except Exception:
+            pass
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache.
+    
+    Returns:
+        Shared cache instance, or None when caching is disabled or Redis is unavailable
+    """
+    global _cache
+    if not settings.response_cache_enabled:
+        return None
+    
+    with _cache_lock:
+        if _cache is None:
+            from src.core.database import db_manager
+            
+            try:
+                _cache = ResponseCache(db_manager.ensure_redis())
+            except Exception as e:
+                logger.warning("Redis unavailable, responses are not cached", error=str(e))
+                return None
+        return _cache
+
+
+def invalidate_responses(*tags: str) -> None:
+    """
+    Invalidate cached responses that depend on any of the tags.
+    
+    Args:
+        *tags: Table or view names whose data changed
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(*tags)
+
+
+def cached_response(*tags: str, ttl_seconds: Optional[int] = None) -> Callable:
+    """
+    Cache an async FastAPI endpoint's JSON response.
+    
+    Place it below the router decorator. The key is the route plus every
+    scalar argument (query and path parameters); dependencies such as the
+    database session are ignored. Exceptions are not cached.
+    
+    Args:
+        *tags: Table or view names the response is computed from
+        ttl_seconds: Time to live (defaults to RESPONSE_CACHE_TTL_SECONDS)
+    
+    Returns:
+        Endpoint decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        route = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            if cache is None:
+                return await func(*args, **kwargs)
+            
+            start_time = time.perf_counter()
+            params = {
+                name: value for name, value in kwargs.items()
+                if value is None or isinstance(value, (str, int, float, bool))
+            }
+            
+            key = None
+            try:
+                key = cache.make_key(route, params, tags)
+                cached = cache.get(key)
+            except Exception as e:
+                cache._count("errors")
+                logger.warning("Response cache read failed", route=route, error=str(e))
+                cached = None
+            
+            if cached is not None:
+                cache.record(route, True, (time.perf_counter() - start_time) * 1000)
+                return cached
+            
+            result = jsonable_encoder(await func(*args, **kwargs))
+            if key is not None:
+                try:
+                    cache.set(key, result, ttl_seconds)
+                except Exception as e:
+                    cache._count("errors")
+                    logger.warning("Response cache write failed", route=route, error=str(e))
+            
+            cache.record(route, False, (time.perf_counter() - start_time) * 1000)
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+
+def _percentile(samples: Iterable[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of latency samples, None when there are none."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = min(len(ordered), max(1, math.ceil(percent / 100 * len(ordered)))) - 1
+    return round(ordered[rank], 3)
+
+
+def _pending_tags(session: Session) -> Set[str]:
+    """Tags touched by a session's uncommitted writes."""
+    return session.info.setdefault("response_cache_tags", set())
+
+
+def _track_flush(session: Session, flush_context) -> None:
+    """Collect tables written through the unit of work."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            _pending_tags(session).add(table)
+
+
+def _track_statement(orm_execute_state) -> None:
+    """Collect tables written by ORM-enabled insert/update/delete statements."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        _pending_tags(orm_execute_state.session).add(mapper.local_table.name)
+
+
+def _invalidate_committed(session: Session) -> None:
+    """Invalidate responses for tables changed by the committed transaction."""
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        invalidate_responses(*sorted(tags))
+
+
+def _discard_pending(session: Session) -> None:
+    """Forget writes that were rolled back."""
+    session.info.pop("response_cache_tags", None)
+
+
+def install_invalidation_listeners() -> None:
+    """
+    Invalidate cached responses whenever a session commits writes.
+    
+    Tables written through the ORM (objects and bulk insert/update/delete
+    statements) become tags invalidated after the commit succeeds. Raw SQL
+    writes are not seen and must call invalidate_responses directly.
+    Safe to call more than once.
+    """
+    listeners = (
+        ("after_flush", _track_flush),
+        ("do_orm_execute", _track_statement),
+        ("after_commit", _invalidate_committed),
+        ("after_rollback", _discard_pending),
+    )
+    for name, listener in listeners:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
@@ -1,9 +1,11 @@
 """Risk scoring engine for violations."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 from src.core.logging import get_logger
 from src.models import Violation
@@ -28,6 +30,17 @@ class RiskScoringEngine:
         "Critical": (76, 100)
     }
     
+    # Record keys checked for a transaction amount, in priority order
+    AMOUNT_KEYS = ["amount", "transaction_amount", "value", "total"]
+    
+    # Threshold tables for the array path: points[i] applies from bins[i-1] up to bins[i]
+    AMOUNT_BINS = np.array([10000, 50000, 100000, 500000, 1000000])
+    AMOUNT_POINTS = np.array([0, 5, 10, 15, 20, 25])
+    FREQUENCY_BINS = np.array([1, 2, 3, 5])
+    FREQUENCY_POINTS = np.array([0, 5, 10, 15, 20])
+    HISTORICAL_BINS = np.array([2, 5, 10])
+    HISTORICAL_POINTS = np.array([0, 5, 10, 15])
+    
     def calculate_risk_score(
         self,
         violation: Violation,
@@ -124,7 +137,7 @@ class RiskScoringEngine:
         """
         # Try to find amount field in record
         amount = None
-        for key in ["amount", "transaction_amount", "value", "total"]:
+        for key in self.AMOUNT_KEYS:
             if key in record:
                 try:
                     amount = float(record[key])
@@ -169,17 +182,7 @@ class RiskScoringEngine:
                 Violation.id != violation.id
             ).count()
             
-            # Score based on frequency
-            if repeat_count >= 5:
-                return 20
-            elif repeat_count >= 3:
-                return 15
-            elif repeat_count >= 2:
-                return 10
-            elif repeat_count >= 1:
-                return 5
-            else:
-                return 0
+            return self._frequency_points(repeat_count)
                 
         except Exception as e:
             logger.warning(f"Error calculating frequency factor: {e}")
@@ -205,20 +208,304 @@ class RiskScoringEngine:
                 Violation.id != violation.id
             ).count()
             
-            # Score based on pattern
-            if similar_count >= 10:
-                return 15
-            elif similar_count >= 5:
-                return 10
-            elif similar_count >= 2:
-                return 5
-            else:
-                return 0
+            return self._historical_points(similar_count)
                 
         except Exception as e:
             logger.warning(f"Error calculating historical factor: {e}")
             return 0
     
+    @staticmethod
+    def _frequency_points(repeat_count: int) -> int:
+        """Map repeat violations for a record in the last 30 days to 0-20 points."""
+        if repeat_count >= 5:
+            return 20
+        elif repeat_count >= 3:
+            return 15
+        elif repeat_count >= 2:
+            return 10
+        elif repeat_count >= 1:
+            return 5
+        else:
+            return 0
+    
+    @staticmethod
+    def _historical_points(similar_count: int) -> int:
+        """Map violations of the same rule in the last 90 days to 0-15 points."""
+        if similar_count >= 10:
+            return 15
+        elif similar_count >= 5:
+            return 10
+        elif similar_count >= 2:
+            return 5
+        else:
+            return 0
+    
+    def calculate_risk_scores_batch(
+        self,
+        violations: List[Dict[str, Any]],
+        db: Session
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate risk scores for a batch of new violations.
+        
+        Produces the same scores as calculate_risk_score, but the frequency
+        and historical factors come from one grouped count per factor for the
+        whole batch instead of two count queries per violation. Violations
+        are scored against what is already stored, so they should be scored
+        before they are inserted.
+        
+        Args:
+            violations: Violation rows with rule_id, record_identifier,
+                severity and record_snapshot
+            db: Database session for historical queries
+            
+        Returns:
+            Risk data (score, level, factors) in the order of violations
+        """
+        if not violations:
+            return []
+        
+        repeat_counts, similar_counts = self._load_violation_counts(violations, db)
+        
+        amounts = self.amounts_from_records([v.get("record_snapshot") or {} for v in violations])
+        scores, levels, factors = self.score_arrays(
+            amounts,
+            np.array([str(v.get("severity", "")) for v in violations]),
+            np.array([repeat_counts.get(v["record_identifier"], 0) for v in violations]),
+            np.array([similar_counts.get(str(v["rule_id"]), 0) for v in violations])
+        )
+        
+        results = [
+            {
+                "score": int(scores[i]),
+                "level": str(levels[i]),
+                "factors": {name: int(values[i]) for name, values in factors.items()}
+            }
+            for i in range(len(violations))
+        ]
+        
+        logger.info("Risk scores calculated", violations=len(results))
+        return results
+    
+    def score_arrays(
+        self,
+        amounts: np.ndarray,
+        severities: np.ndarray,
+        repeat_counts: Optional[np.ndarray] = None,
+        similar_counts: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Score a batch from its columns without a per-violation Python loop.
+        
+        Gives the same scores as calculate_risk_score for the same inputs.
+        
+        Args:
+            amounts: Transaction amounts (NaN where the record has none)
+            severities: Severity names
+            repeat_counts: Other violations for the same record in 30 days
+            similar_counts: Other violations of the same rule in 90 days
+            
+        Returns:
+            Scores, risk levels and the per-factor point arrays
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        severities = np.asarray(severities, dtype=str)
+        size = len(amounts)
+        repeat_counts = np.zeros(size, dtype=int) if repeat_counts is None else np.asarray(repeat_counts)
+        similar_counts = np.zeros(size, dtype=int) if similar_counts is None else np.asarray(similar_counts)
+        
+        # Weight lookup runs once per distinct severity
+        unique_severities, inverse = np.unique(severities, return_inverse=True)
+        severity_scores = np.array(
+            [self.SEVERITY_WEIGHTS.get(s.lower(), 10) for s in unique_severities],
+            dtype=int
+        )[inverse].reshape(size)
+        
+        amount_scores = np.where(
+            np.isnan(amounts),
+            0,
+            self.AMOUNT_POINTS[np.searchsorted(self.AMOUNT_BINS, np.nan_to_num(amounts), side="right")]
+        )
+        frequency_scores = self.FREQUENCY_POINTS[
+            np.searchsorted(self.FREQUENCY_BINS, repeat_counts, side="right")
+        ]
+        historical_scores = self.HISTORICAL_POINTS[
+            np.searchsorted(self.HISTORICAL_BINS, similar_counts, side="right")
+        ]
+        
+        scores = np.minimum(100, severity_scores + amount_scores + frequency_scores + historical_scores)
+        
+        return scores, self.risk_levels(scores), {
+            "severity_weight": severity_scores,
+            "amount_factor": amount_scores,
+            "frequency_factor": frequency_scores,
+            "historical_factor": historical_scores
+        }
+    
+    def risk_levels(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Map an array of scores to risk levels (array form of get_risk_level).
+        
+        Args:
+            scores: Risk scores (0-100)
+            
+        Returns:
+            Array of risk level strings
+        """
+        names = list(self.RISK_LEVELS)
+        lower_bounds = np.array([bounds[0] for bounds in self.RISK_LEVELS.values()][1:])
+        levels = np.array(names)[np.searchsorted(lower_bounds, scores, side="right")]
+        # Out-of-range scores default to Low, as in get_risk_level
+        return np.where((scores < 0) | (scores > 100), "Low", levels)
+    
+    def amounts_from_records(self, records: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """
+        Extract the amount column for a batch of records.
+        
+        Takes the first of AMOUNT_KEYS that holds a number, like
+        _calculate_amount_factor.
+        
+        Args:
+            records: Record data dicts
+            
+        Returns:
+            Amounts as floats, NaN where no key holds a number
+        """
+        frame = pd.DataFrame.from_records(list(records), columns=self.AMOUNT_KEYS)
+        parsed = frame.apply(lambda column: pd.to_numeric(column, errors="coerce"))
+        return parsed.bfill(axis=1).iloc[:, 0].to_numpy(dtype=float)
+    
+    def rescore_all(self, db: Session, chunk_size: int = 5000) -> int:
+        """
+        Recompute the stored risk score of every violation.
+        
+        Needed whenever weights or thresholds change. Frequency and
+        historical counts are loaded once with grouped queries, each chunk
+        is scored with score_arrays and written back with one bulk update.
+        
+        Args:
+            db: Database session
+            chunk_size: Violations loaded and updated per round trip
+            
+        Returns:
+            Number of violations rescored
+        """
+        now = datetime.utcnow()
+        frequency_since = now - timedelta(days=30)
+        historical_since = now - timedelta(days=90)
+        
+        repeat_counts = dict(db.query(
+            Violation.record_identifier, func.count(Violation.id)
+        ).filter(
+            Violation.detected_at >= frequency_since
+        ).group_by(Violation.record_identifier).all())
+        similar_counts = {
+            str(rule_id): count
+            for rule_id, count in db.query(
+                Violation.rule_id, func.count(Violation.id)
+            ).filter(
+                Violation.detected_at >= historical_since
+            ).group_by(Violation.rule_id).all()
+        }
+        
+        rescored = 0
+        last_id = None
+        while True:
+            query = db.query(
+                Violation.id,
+                Violation.rule_id,
+                Violation.record_identifier,
+                Violation.severity,
+                Violation.record_snapshot,
+                Violation.detected_at
+            ).order_by(Violation.id)
+            if last_id is not None:
+                query = query.filter(Violation.id > last_id)
+            rows = query.limit(chunk_size).all()
+            if not rows:
+                break
+            
+            # Counts exclude the violation itself, as in the scalar factors
+            scores, levels, factors = self.score_arrays(
+                self.amounts_from_records([row.record_snapshot or {} for row in rows]),
+                np.array([str(row.severity) for row in rows]),
+                np.array([
+                    repeat_counts.get(row.record_identifier, 0) - (row.detected_at >= frequency_since)
+                    for row in rows
+                ]),
+                np.array([
+                    similar_counts.get(str(row.rule_id), 0) - (row.detected_at >= historical_since)
+                    for row in rows
+                ])
+            )
+            
+            db.execute(update(Violation), [
+                {
+                    "id": row.id,
+                    "risk_score": int(scores[i]),
+                    "risk_level": str(levels[i]),
+                    "risk_factors": {name: int(values[i]) for name, values in factors.items()}
+                }
+                for i, row in enumerate(rows)
+            ])
+            db.commit()
+            
+            rescored += len(rows)
+            last_id = rows[-1].id
+            logger.info("Rescored violation chunk", rescored=rescored)
+        
+        logger.info("Violation rescoring completed", violations=rescored)
+        return rescored
+    
+    def _load_violation_counts(
+        self,
+        violations: List[Dict[str, Any]],
+        db: Session
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Count stored violations per record (30 days) and per rule (90 days).
+        
+        Failures are logged and give zero counts, like the scalar factors.
+        
+        Args:
+            violations: Violation rows in the batch
+            db: Database session
+            
+        Returns:
+            Counts keyed by record identifier and by rule ID
+        """
+        now = datetime.utcnow()
+        record_ids = {violation["record_identifier"] for violation in violations}
+        rule_ids = {violation["rule_id"] for violation in violations}
+        
+        repeat_counts: Dict[str, int] = {}
+        try:
+            rows = db.query(
+                Violation.record_identifier,
+                func.count(Violation.id)
+            ).filter(
+                Violation.record_identifier.in_(record_ids),
+                Violation.detected_at >= now - timedelta(days=30)
+            ).group_by(Violation.record_identifier).all()
+            repeat_counts = {record_id: count for record_id, count in rows}
+        except Exception as e:
+            logger.warning(f"Error calculating frequency factor: {e}")
+        
+        similar_counts: Dict[str, int] = {}
+        try:
+            rows = db.query(
+                Violation.rule_id,
+                func.count(Violation.id)
+            ).filter(
+                Violation.rule_id.in_(rule_ids),
+                Violation.detected_at >= now - timedelta(days=90)
+            ).group_by(Violation.rule_id).all()
+            similar_counts = {str(rule_id): count for rule_id, count in rows}
+        except Exception as e:
+            logger.warning(f"Error calculating historical factor: {e}")
+        
+        return repeat_counts, similar_counts
+    
     def get_risk_level(self, score: int) -> str:
         """
         Map score to risk level: Low/Medium/High/Critical.
@@ -0,0 +1,209 @@
+"""Service maintaining rolling accuracy statistics per rule."""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, insert, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.models.correction import Correction, CorrectedDecision
+from src.models.rule_accuracy import RuleAccuracyDaily, RuleAccuracyTrend
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows (days) reported for every rule
+ACCURACY_WINDOWS = (7, 30, 90)
+
+
+class RuleAccuracyTracker:
+    """
+    Maintain per-rule accuracy as corrections are recorded.
+    
+    Each correction increments its rule's daily bucket and folds into the
+    rule's exponentially weighted moving average (EWMA) of accuracy, so
+    rolling windows are sums over at most max(ACCURACY_WINDOWS) bucket rows
+    and trends never re-read correction history.
+    """
+    
+    @staticmethod
+    def record(db: Session, correction: Correction, alpha: Optional[float] = None) -> None:
+        """
+        Fold a correction into its rule's daily bucket and EWMA.
+        
+        Both rows are upserted atomically in the caller's transaction, so
+        concurrent reviews of the same rule serialize on the row lock
+        instead of losing updates.
+        
+        Args:
+            db: Database session
+            correction: Correction being recorded
+            alpha: EWMA weight of the new correction (defaults to RULE_ACCURACY_EWMA_ALPHA)
+        """
+        alpha = settings.rule_accuracy_ewma_alpha if alpha is None else alpha
+        occurred_at = correction.created_at or datetime.utcnow()
+        decision = correction.corrected_decision
+        accurate = 1.0 if decision == CorrectedDecision.TRUE_POSITIVE else 0.0
+        
+        bucket = pg_insert(RuleAccuracyDaily).values(
+            rule_id=correction.rule_id,
+            day=occurred_at.date(),
+            total=1,
+            true_positives=int(decision == CorrectedDecision.TRUE_POSITIVE),
+            false_positives=int(decision == CorrectedDecision.FALSE_POSITIVE),
+            needs_review=int(decision == CorrectedDecision.NEEDS_REVIEW)
+        )
+        db.execute(bucket.on_conflict_do_update(
+            index_elements=[RuleAccuracyDaily.rule_id, RuleAccuracyDaily.day],
+            set_={
+                name: getattr(RuleAccuracyDaily, name) + getattr(bucket.excluded, name)
+                for name in ("total", "true_positives", "false_positives", "needs_review")
+            }
+        ))
+        
+        trend = pg_insert(RuleAccuracyTrend).values(
+            rule_id=correction.rule_id,
+            rule_name=correction.rule_name,
+            total_reviews=1,
+            ewma_accuracy=accurate,
+            last_correction_at=occurred_at,
+            updated_at=datetime.utcnow()
+        )
+        db.execute(trend.on_conflict_do_update(
+            index_elements=[RuleAccuracyTrend.rule_id],
+            set_={
+                "rule_name": trend.excluded.rule_name,
+                "total_reviews": RuleAccuracyTrend.total_reviews + 1,
+                "ewma_accuracy": RuleAccuracyTrend.ewma_accuracy
+                + alpha * (trend.excluded.ewma_accuracy - RuleAccuracyTrend.ewma_accuracy),
+                "last_correction_at": func.greatest(
+                    RuleAccuracyTrend.last_correction_at,
+                    trend.excluded.last_correction_at
+                ),
+                "updated_at": trend.excluded.updated_at
+            }
+        ))
+    
+    @staticmethod
+    def get_rule_trends(db: Session, rule_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Read rolling-window accuracy and EWMA for each rule.
+        
+        Args:
+            db: Database session
+            rule_ids: Rules to read (defaults to every tracked rule)
+        
+        Returns:
+            Per rule id: accuracy_{N}d and reviews_{N}d for each window
+            (accuracy is None when a window has no reviews), ewma_accuracy,
+            total_reviews and last_correction_at
+        """
+        today = date.today()
+        window_columns = []
+        for days in ACCURACY_WINDOWS:
+            in_window = RuleAccuracyDaily.day > today - timedelta(days=days)
+            window_columns.extend([
+                func.coalesce(func.sum(RuleAccuracyDaily.total).filter(in_window), 0).label(f"reviews_{days}d"),
+                func.coalesce(func.sum(RuleAccuracyDaily.true_positives).filter(in_window), 0).label(f"tp_{days}d"),
+            ])
+        
+        windows_query = db.query(RuleAccuracyDaily.rule_id, *window_columns).filter(
+            RuleAccuracyDaily.day > today - timedelta(days=max(ACCURACY_WINDOWS))
+        )
+        trends_query = db.query(RuleAccuracyTrend)
+        if rule_ids is not None:
+            windows_query = windows_query.filter(RuleAccuracyDaily.rule_id.in_(rule_ids))
+            trends_query = trends_query.filter(RuleAccuracyTrend.rule_id.in_(rule_ids))
+        
+        windows = {
+            str(row.rule_id): row
+            for row in windows_query.group_by(RuleAccuracyDaily.rule_id).all()
+        }
+        
+        results = {}
+        for state in trends_query.all():
+            rule_id = str(state.rule_id)
+            row = windows.get(rule_id)
+            stats = {
+                "ewma_accuracy": round(state.ewma_accuracy * 100, 2),
+                "total_reviews": state.total_reviews,
+                "last_correction_at": state.last_correction_at.isoformat(),
+            }
+            for days in ACCURACY_WINDOWS:
+                reviews = int(getattr(row, f"reviews_{days}d")) if row else 0
+                true_positives = int(getattr(row, f"tp_{days}d")) if row else 0
+                stats[f"reviews_{days}d"] = reviews
+                stats[f"accuracy_{days}d"] = round(true_positives / reviews * 100, 2) if reviews else None
+            results[rule_id] = stats
+        
+        return results
+    
+    @staticmethod
+    def rebuild(db: Session, alpha: Optional[float] = None, chunk_size: int = 10000) -> int:
+        """
+        Recompute every bucket and EWMA from correction history.
+        
+        Used to backfill after the tables are created; corrections are
+        streamed in date order per rule rather than loaded at once.
+        
+        Args:
+            db: Database session
+            alpha: EWMA weight of each correction (defaults to RULE_ACCURACY_EWMA_ALPHA)
+            chunk_size: Corrections fetched per round trip
+        
+        Returns:
+            Number of rules with trend state
+        """
+        alpha = settings.rule_accuracy_ewma_alpha if alpha is None else alpha
+        
+        db.execute(delete(RuleAccuracyDaily))
+        db.execute(delete(RuleAccuracyTrend))
+        
+        decision = Correction.corrected_decision
+        day = func.date(Correction.created_at)
+        db.execute(insert(RuleAccuracyDaily).from_select(
+            ["rule_id", "day", "total", "true_positives", "false_positives", "needs_review"],
+            db.query(
+                Correction.rule_id,
+                day,
+                func.count(),
+                func.count().filter(decision == CorrectedDecision.TRUE_POSITIVE),
+                func.count().filter(decision == CorrectedDecision.FALSE_POSITIVE),
+                func.count().filter(decision == CorrectedDecision.NEEDS_REVIEW)
+            ).group_by(Correction.rule_id, day).statement
+        ))
+        
+        states = {}
+        history = db.query(
+            Correction.rule_id,
+            Correction.rule_name,
+            Correction.corrected_decision,
+            Correction.created_at
+        ).order_by(Correction.rule_id, Correction.created_at).yield_per(chunk_size)
+        
+        for rule_id, rule_name, corrected_decision, created_at in history:
+            accurate = 1.0 if corrected_decision == CorrectedDecision.TRUE_POSITIVE else 0.0
+            state = states.get(rule_id)
+            if state is None:
+                states[rule_id] = {
+                    "rule_id": rule_id,
+                    "rule_name": rule_name,
+                    "total_reviews": 1,
+                    "ewma_accuracy": accurate,
+                    "last_correction_at": created_at,
+                    "updated_at": datetime.utcnow(),
+                }
+                continue
+            state["rule_name"] = rule_name
+            state["total_reviews"] += 1
+            state["ewma_accuracy"] += alpha * (accurate - state["ewma_accuracy"])
+            state["last_correction_at"] = created_at
+        
+        if states:
+            db.execute(insert(RuleAccuracyTrend), list(states.values()))
+        db.commit()
+        
+        logger.info(f"Rebuilt accuracy trends for {len(states)} rules")
+        return len(states)
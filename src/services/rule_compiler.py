@@ -0,0 +1,241 @@
+"""Compile rule validation logic into reusable evaluators."""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Coerce a value to float, returning None when it is not numeric."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _greater_than(actual: Any, expected: float) -> bool:
+    actual = _to_float(actual)
+    return actual is not None and actual > expected
+
+
+def _less_than(actual: Any, expected: float) -> bool:
+    actual = _to_float(actual)
+    return actual is not None and actual < expected
+
+
+def _equals(actual: Any, expected: str) -> bool:
+    return str(actual) == expected
+
+
+def _not_equals(actual: Any, expected: str) -> bool:
+    return str(actual) != expected
+
+
+def _contains(actual: Any, expected: str) -> bool:
+    return expected in str(actual).lower()
+
+
+def _not_contains(actual: Any, expected: str) -> bool:
+    return expected not in str(actual).lower()
+
+
+def _regex_match(actual: Any, expected: "re.Pattern") -> bool:
+    return bool(expected.search(str(actual)))
+
+
+def _is_null(actual: Any, expected: Any) -> bool:
+    return actual is None
+
+
+def _is_not_null(actual: Any, expected: Any) -> bool:
+    return actual is not None
+
+
+def _never(actual: Any, expected: Any) -> bool:
+    return False
+
+
+# Operator -> (predicate, expected-value coercion). Predicates are module-level
+# functions so compiled rules stay picklable for multiprocess execution.
+OPERATORS: Dict[str, Tuple[Callable[[Any, Any], bool], Callable[[Any], Any]]] = {
+    "greater_than": (_greater_than, float),
+    "less_than": (_less_than, float),
+    "equals": (_equals, str),
+    "not_equals": (_not_equals, str),
+    "contains": (_contains, lambda value: str(value).lower()),
+    "not_contains": (_not_contains, lambda value: str(value).lower()),
+    "regex_match": (_regex_match, re.compile),
+    "is_null": (_is_null, lambda value: None),
+    "is_not_null": (_is_not_null, lambda value: None),
+}
+
+
+@dataclass
+class CompiledRule:
+    """A rule whose condition has been resolved into a ready-to-run predicate."""
+    
+    rule_id: str
+    version: Optional[str]
+    condition: Dict[str, Any]
+    field: Optional[str] = None
+    path: Tuple[str, ...] = ()
+    operator: Optional[str] = None
+    expected: Any = None
+    predicate: Callable[[Any, Any], bool] = _never
+    severity: Optional[str] = None
+    
+    @property
+    def is_evaluable(self) -> bool:
+        """Whether the rule has a condition that can ever match."""
+        return bool(self.condition)
+    
+    def resolve(self, record: Dict[str, Any]) -> Any:
+        """
+        Resolve the rule's field from a record using the precomputed path.
+        
+        Args:
+            record: Record data
+        
+        Returns:
+            Field value or None if not found
+        """
+        value = record
+        for key in self.path:
+            if isinstance(value, dict):
+                value = value.get(key)
+            else:
+                return None
+            
+            if value is None:
+                return None
+        
+        return value
+    
+    def evaluate(self, record: Dict[str, Any]) -> bool:
+        """
+        Evaluate the compiled condition against a record.
+        
+        Args:
+            record: Record data
+        
+        Returns:
+            True if condition is violated (fails)
+        """
+        if not self.path:
+            return False
+        
+        actual_value = self.resolve(record)
+        
+        if actual_value is None:
+            # Missing field might be a violation depending on the rule
+            return self.operator == "is_not_null"
+        
+        return self.predicate(actual_value, self.expected)
+    
+    __call__ = evaluate
+
+
+class RuleCompiler:
+    """Compile and cache rule evaluators keyed by rule id and version."""
+    
+    def __init__(self):
+        """Initialize rule compiler."""
+        self._cache: Dict[str, CompiledRule] = {}
+    
+    def compile(self, rule: Dict[str, Any]) -> CompiledRule:
+        """
+        Get the compiled form of a rule, compiling it on first use.
+        
+        Args:
+            rule: Compliance rule with id, validation logic and optional updated_at
+        
+        Returns:
+            Compiled rule
+        """
+        rule_id = str(rule.get("id"))
+        version = self._version(rule.get("updated_at"))
+        
+        cached = self._cache.get(rule_id)
+        if cached is not None and cached.version == version:
+            return cached
+        
+        compiled = self._build(rule, rule_id, version)
+        self._cache[rule_id] = compiled
+        return compiled
+    
+    def compile_condition(self, condition: Dict[str, Any]) -> CompiledRule:
+        """
+        Compile a bare condition without caching it.
+        
+        Args:
+            condition: Condition with field, operator and value
+        
+        Returns:
+            Compiled rule wrapping the condition
+        """
+        return self._build({"validation_logic": {"condition": condition}}, "adhoc", None)
+    
+    def invalidate(self, rule_id: Optional[str] = None) -> None:
+        """
+        Drop compiled rules from the cache.
+        
+        Args:
+            rule_id: Rule to drop, or None to clear the whole cache
+        """
+        if rule_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(str(rule_id), None)
+    
+    def _build(self, rule: Dict[str, Any], rule_id: str, version: Optional[str]) -> CompiledRule:
+        """Resolve field path, operator and expected value for a rule."""
+        validation_logic = rule.get("validation_logic") or {}
+        condition = validation_logic.get("condition") or {}
+        compiled = CompiledRule(
+            rule_id=rule_id,
+            version=version,
+            condition=condition,
+            severity=rule.get("severity"),
+        )
+        
+        field_path = condition.get("field")
+        operator = condition.get("operator")
+        if not field_path or not operator:
+            return compiled
+        
+        compiled.field = field_path
+        compiled.path = tuple(field_path.split("."))
+        compiled.operator = operator
+        
+        if operator not in OPERATORS:
+            logger.warning("Unsupported rule operator", rule_id=rule_id, operator=operator)
+            return compiled
+        
+        predicate, coerce = OPERATORS[operator]
+        try:
+            compiled.expected = coerce(condition.get("value"))
+            compiled.predicate = predicate
+        except (ValueError, TypeError, re.error) as e:
+            # Same outcome as the interpreted path: the rule never fires
+            logger.warning(
+                "Rule condition value could not be compiled",
+                rule_id=rule_id,
+                operator=operator,
+                error=str(e)
+            )
+        
+        return compiled
+    
+    @staticmethod
+    def _version(updated_at: Any) -> Optional[str]:
+        """Normalize a rule's updated_at into a cache version string."""
+        if updated_at is None:
+            return None
+        if isinstance(updated_at, datetime):
+            return updated_at.isoformat()
+        return str(updated_at)
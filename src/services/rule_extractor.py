@@ -1,12 +1,20 @@
 """AI-powered rule extraction service using OpenAI."""
 
 import json
-from typing import List, Dict, Any
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
 from openai import OpenAI
 
 from src.config import settings
 from src.core.logging import get_logger
+from src.services.llm.cache import get_llm_cache
+from src.services.llm.batch import BatchRequest, parse_json_response
+from src.services.violation_templates import ViolationTemplates, MODE_TEMPLATE
+from src.services.policy_chunker import PolicyChunk, PolicyChunker
 from src.prompts import RuleExtractionPrompt, JustificationPrompt, RemediationPrompt
+from src.prompts.record_context import prompt_record
 
 logger = get_logger(__name__)
 
@@ -24,80 +32,215 @@ class RuleExtractor:
         if not settings.openai_api_key:
             logger.warning("OpenAI API key not configured")
         self.client = OpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        self.cache = get_llm_cache()
+        self.last_failed_pages: List[str] = []
     
-    def extract_rules(self, policy_text: str, policy_id: str) -> List[Dict[str, Any]]:
+    def _chat_completion(
+        self,
+        system_message: str,
+        prompt: str,
+        temperature: float,
+        model: str = "gpt-4o",
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> str:
         """
-        Extract compliance rules from policy text.
+        Run a chat completion, serving repeated requests from the response cache.
         
         Args:
-            policy_text: Extracted policy text
-            policy_id: Policy document ID
+            system_message: System prompt
+            prompt: User prompt
+            temperature: Sampling temperature
+            model: Model to use
+            max_tokens: Optional maximum tokens to generate
+            response_format: Optional response format (e.g. JSON mode)
             
         Returns:
-            List of extracted rules
-            
-        Raises:
-            RuleExtractionError: If extraction fails
+            Response content
         """
-        if not self.client:
-            raise RuleExtractionError("OpenAI API key not configured")
+        params = {}
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+        if response_format is not None:
+            params["response_format"] = response_format
         
-        try:
-            logger.info("Extracting rules using OpenAI", policy_id=policy_id)
-            
-            # Use production prompt template
-            prompt = RuleExtractionPrompt.build_extraction_prompt(policy_text)
-            
+        def request() -> str:
             response = self.client.chat.completions.create(
-                model="gpt-4o",
+                model=model,
                 messages=[
                     {
                         "role": "system",
-                        "content": RuleExtractionPrompt.SYSTEM_PROMPT
+                        "content": system_message
                     },
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+                temperature=temperature,
+                **params
             )
+            return response.choices[0].message.content
+        
+        if self.cache is None:
+            return request()
+        
+        key = self.cache.make_key(model, system_message, prompt, temperature, **params)
+        return self.cache.get_or_create(key, request)
+    
+    def extract_rules(self, policy_text: str, policy_id: str) -> List[Dict[str, Any]]:
+        """
+        Extract compliance rules from policy text.
+        
+        The text is split on PDF page markers into chunks that are extracted
+        concurrently, so extraction time follows the largest chunk rather
+        than the document length. Rules are merged, near-duplicates across
+        chunks are dropped and each rule gets the page it was found on.
+        Chunks that fail are skipped and listed in last_failed_pages.
+        
+        Args:
+            policy_text: Extracted policy text
+            policy_id: Policy document ID
             
-            result = json.loads(response.choices[0].message.content)
-            rules = result.get("rules", [])
-            
-            # Validate extracted rules
-            is_valid, errors = RuleExtractionPrompt.validate_extracted_rules(rules)
-            if not is_valid:
-                logger.warning(
-                    "Extracted rules have validation errors",
-                    policy_id=policy_id,
-                    errors=errors
-                )
+        Returns:
+            List of extracted rules
             
-            logger.info(
-                "Rules extracted successfully",
+        Raises:
+            RuleExtractionError: If extraction fails for every chunk
+        """
+        if not self.client:
+            raise RuleExtractionError("OpenAI API key not configured")
+        
+        chunks = PolicyChunker.chunk(policy_text, settings.extraction_chunk_chars)
+        if not chunks:
+            raise RuleExtractionError("Policy has no text to extract rules from")
+        
+        logger.info("Extracting rules using OpenAI", policy_id=policy_id, chunks=len(chunks))
+        
+        chunk_rules: List[Optional[List[Dict[str, Any]]]] = [None] * len(chunks)
+        errors = {}
+        
+        with ThreadPoolExecutor(max_workers=min(settings.extraction_concurrency, len(chunks))) as executor:
+            futures = {executor.submit(self._extract_chunk, chunk, policy_id): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    chunk_rules[chunk.index] = future.result()
+                except RuleExtractionError as e:
+                    errors[chunk.index] = str(e)
+                    logger.error(
+                        "Rule extraction failed for chunk",
+                        policy_id=policy_id,
+                        pages=chunk.page_range,
+                        error=str(e)
+                    )
+        
+        self.last_failed_pages = [chunks[index].page_range for index in sorted(errors)]
+        
+        if len(errors) == len(chunks):
+            raise RuleExtractionError(f"Failed to extract rules: {next(iter(errors.values()))}")
+        
+        extracted = [rule for rules in chunk_rules if rules for rule in rules]
+        rules = PolicyChunker.deduplicate(extracted)
+        
+        # Validate extracted rules
+        is_valid, validation_errors = RuleExtractionPrompt.validate_extracted_rules(rules)
+        if not is_valid:
+            logger.warning(
+                "Extracted rules have validation errors",
                 policy_id=policy_id,
-                rules_count=len(rules),
-                validation_errors=len(errors) if not is_valid else 0
+                errors=validation_errors
             )
+        
+        logger.info(
+            "Rules extracted successfully",
+            policy_id=policy_id,
+            rules_count=len(rules),
+            duplicates_removed=len(extracted) - len(rules),
+            failed_chunks=len(errors),
+            validation_errors=len(validation_errors) if not is_valid else 0
+        )
+        
+        return rules
+    
+    def extract_rules_for_pages(
+        self,
+        policy_text: str,
+        page_numbers: List[int],
+        policy_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract compliance rules from selected pages of a policy.
+        
+        Args:
+            policy_text: Extracted policy text with page markers
+            page_numbers: Pages to extract rules from
+            policy_id: Policy document ID
             
-            return rules
+        Returns:
+            List of extracted rules with page_number set
             
-        except json.JSONDecodeError as e:
-            logger.error("Failed to parse OpenAI response", error=str(e))
-            raise RuleExtractionError(f"Invalid JSON response from OpenAI: {str(e)}")
-        except Exception as e:
-            logger.error("Rule extraction failed", error=str(e))
-            raise RuleExtractionError(f"Failed to extract rules: {str(e)}")
+        Raises:
+            RuleExtractionError: If extraction fails
+        """
+        wanted = set(page_numbers)
+        pages_text = "\n\n".join(
+            f"[Page {page_number}]\n{text}"
+            for page_number, text in PolicyChunker.split_pages(policy_text)
+            if page_number in wanted
+        )
+        return self.extract_rules(pages_text, policy_id)
     
+    def _extract_chunk(self, chunk: PolicyChunk, policy_id: str) -> List[Dict[str, Any]]:
+        """
+        Extract rules from one chunk, retrying transient failures.
+        
+        Args:
+            chunk: Page-aligned policy chunk
+            policy_id: Policy document ID
+            
+        Returns:
+            Rules with page_number attached
+            
+        Raises:
+            RuleExtractionError: If every attempt fails
+        """
+        # Use production prompt template
+        prompt = RuleExtractionPrompt.build_extraction_prompt(chunk.text)
+        
+        for attempt in range(settings.llm_max_retries + 1):
+            try:
+                content = self._chat_completion(
+                    RuleExtractionPrompt.SYSTEM_PROMPT,
+                    prompt,
+                    temperature=0.3,
+                    response_format={"type": "json_object"}
+                )
+                
+                result = json.loads(content)
+                return [
+                    PolicyChunker.attach_page_number(rule, chunk)
+                    for rule in result.get("rules", [])
+                ]
+                
+            except json.JSONDecodeError as e:
+                logger.error("Failed to parse OpenAI response", policy_id=policy_id, pages=chunk.page_range, error=str(e))
+                error = RuleExtractionError(f"Invalid JSON response from OpenAI: {str(e)}")
+            except Exception as e:
+                error = RuleExtractionError(f"Failed to extract rules: {str(e)}")
+            
+            if attempt < settings.llm_max_retries:
+                time.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+        
+        raise error
     
     def generate_justification(
         self,
         rule_description: str,
         record_data: Dict[str, Any],
-        violation_details: Dict[str, Any]
+        violation_details: Dict[str, Any],
+        mode: Optional[str] = None,
+        raise_errors: bool = False
     ) -> str:
         """
         Generate human-readable justification for a violation.
@@ -106,53 +249,33 @@ class RuleExtractor:
             rule_description: Description of the violated rule
             record_data: The record that violated the rule
             violation_details: Details about what was violated
+            mode: "template" to render without the LLM when the condition allows
+            raise_errors: Raise LLM failures instead of returning placeholder text
             
         Returns:
             Natural language justification
         """
+        if mode == MODE_TEMPLATE and ViolationTemplates.supports(violation_details.get("expected") or {}):
+            return ViolationTemplates.render_justification(rule_description, record_data, violation_details)
+        
         if not self.client:
+            if raise_errors:
+                raise RuntimeError("OpenAI client not configured")
             return f"Violation detected: {rule_description}"
         
         try:
-            # Use production prompt template
-            rule_condition = violation_details.get("condition", {})
-            prompt = JustificationPrompt.build_justification_prompt(
-                rule_description,
-                rule_condition,
-                record_data,
-                violation_details
-            )
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": JustificationPrompt.SYSTEM_PROMPT
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.5,
-                max_tokens=200
-            )
-            
-            justification = response.choices[0].message.content.strip()
-            
-            # Validate justification quality
-            is_valid, warnings = JustificationPrompt.validate_justification(justification)
-            if not is_valid or warnings:
-                logger.warning(
-                    "Generated justification has quality issues",
-                    warnings=warnings
-                )
-            
-            return justification
+            request = self.build_justification_request(rule_description, record_data, violation_details)
+            return self.parse_justification(self._chat_completion(
+                request.system_message,
+                request.prompt,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens
+            ))
             
         except Exception as e:
             logger.error("Failed to generate justification", error=str(e))
+            if raise_errors:
+                raise
             return f"Violation detected: {rule_description}"
     
     def generate_remediation_steps(
@@ -160,7 +283,10 @@ class RuleExtractor:
         rule_description: str,
         violation_justification: str,
         record_data: Dict[str, Any],
-        severity: str = "medium"
+        severity: str = "medium",
+        mode: Optional[str] = None,
+        violation_details: Optional[Dict[str, Any]] = None,
+        raise_errors: bool = False
     ) -> List[Dict[str, str]]:
         """
         Generate remediation steps for a violation.
@@ -170,51 +296,164 @@ class RuleExtractor:
             violation_justification: Why the violation occurred
             record_data: The violating record
             severity: Severity level of the violation
+            mode: "template" to render without the LLM when the condition allows
+            violation_details: Details about what was violated (needed for templates)
+            raise_errors: Raise LLM failures instead of returning fallback steps
             
         Returns:
             List of remediation steps
         """
+        if (
+            mode == MODE_TEMPLATE
+            and violation_details
+            and ViolationTemplates.supports(violation_details.get("expected") or {})
+        ):
+            return ViolationTemplates.render_remediation(
+                rule_description, record_data, violation_details, severity
+            )
+        
         if not self.client:
-            return [{"step": "Review and correct the violation", "priority": "high"}]
+            if raise_errors:
+                raise RuntimeError("OpenAI client not configured")
+            return self.fallback_remediation_steps()
         
         try:
-            # Use production prompt template
-            prompt = RemediationPrompt.build_remediation_prompt(
+            request = self.build_remediation_request(
                 rule_description,
                 violation_justification,
                 record_data,
-                severity
+                severity,
+                violation_details=violation_details
             )
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": RemediationPrompt.SYSTEM_PROMPT
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.5,
+            return self.parse_remediation_steps(self._chat_completion(
+                request.system_message,
+                request.prompt,
+                temperature=request.temperature,
                 response_format={"type": "json_object"}
-            )
+            ))
             
-            result = json.loads(response.choices[0].message.content)
-            steps = result.get("steps", [])
+        except Exception as e:
+            logger.error("Failed to generate remediation steps", error=str(e))
+            if raise_errors:
+                raise
+            return self.fallback_remediation_steps()
+    
+    def build_justification_request(
+        self,
+        rule_description: str,
+        record_data: Dict[str, Any],
+        violation_details: Dict[str, Any]
+    ) -> BatchRequest:
+        """
+        Build the justification completion request.
+        
+        Args:
+            rule_description: Description of the violated rule
+            record_data: The record that violated the rule
+            violation_details: Details about what was violated
             
-            # Validate remediation steps
-            is_valid, errors = RemediationPrompt.validate_remediation_steps(steps)
-            if not is_valid:
-                logger.warning(
-                    "Generated remediation steps have validation errors",
-                    errors=errors
-                )
+        Returns:
+            Completion request for the LLM batch executor
+        """
+        # Use production prompt template
+        rule_condition = violation_details.get("condition", {})
+        prompt = JustificationPrompt.build_justification_prompt(
+            rule_description,
+            rule_condition,
+            prompt_record(record_data, violation_details.get("expected")),
+            violation_details
+        )
+        return BatchRequest(
+            prompt=prompt,
+            system_message=JustificationPrompt.SYSTEM_PROMPT,
+            temperature=0.5,
+            max_tokens=200
+        )
+    
+    def parse_justification(self, content: str) -> str:
+        """
+        Clean and quality-check a generated justification.
+        
+        Args:
+            content: Completion content
             
-            return steps
+        Returns:
+            Justification text
+        """
+        justification = content.strip()
+        
+        # Validate justification quality
+        is_valid, warnings = JustificationPrompt.validate_justification(justification)
+        if not is_valid or warnings:
+            logger.warning(
+                "Generated justification has quality issues",
+                warnings=warnings
+            )
+        
+        return justification
+    
+    def build_remediation_request(
+        self,
+        rule_description: str,
+        violation_justification: str,
+        record_data: Dict[str, Any],
+        severity: str = "medium",
+        violation_details: Optional[Dict[str, Any]] = None
+    ) -> BatchRequest:
+        """
+        Build the remediation completion request.
+        
+        Args:
+            rule_description: Description of the violated rule
+            violation_justification: Why the violation occurred
+            record_data: The violating record
+            severity: Severity level of the violation
+            violation_details: Details about what was violated (limits the record fields shown)
             
-        except Exception as e:
-            logger.error("Failed to generate remediation steps", error=str(e))
-            return [{"step": "Review and correct the violation", "priority": "high"}]
+        Returns:
+            Completion request for the LLM batch executor
+        """
+        # Use production prompt template
+        prompt = RemediationPrompt.build_remediation_prompt(
+            rule_description,
+            violation_justification,
+            prompt_record(record_data, (violation_details or {}).get("expected")),
+            severity
+        )
+        return BatchRequest(
+            prompt=prompt,
+            system_message=RemediationPrompt.SYSTEM_PROMPT,
+            temperature=0.5,
+            max_tokens=1000
+        )
+    
+    def parse_remediation_steps(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Parse and validate generated remediation steps.
+        
+        Args:
+            content: Completion content (JSON, optionally fenced)
+            
+        Returns:
+            List of remediation steps
+            
+        Raises:
+            json.JSONDecodeError: If the content is not valid JSON
+        """
+        result = parse_json_response(content)
+        steps = result.get("steps", [])
+        
+        # Validate remediation steps
+        is_valid, errors = RemediationPrompt.validate_remediation_steps(steps)
+        if not is_valid:
+            logger.warning(
+                "Generated remediation steps have validation errors",
+                errors=errors
+            )
+        
+        return steps
+    
+    @staticmethod
+    def fallback_remediation_steps() -> List[Dict[str, str]]:
+        """Generic remediation used when generation fails."""
+        return [{"step": "Review and correct the violation", "priority": "high"}]
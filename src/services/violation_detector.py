@@ -1,57 +1,86 @@
 """Violation detection service."""
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-import re
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from src.core.logging import get_logger
+from src.services.rule_compiler import RuleCompiler, CompiledRule
+from src.services.record_batch import RecordBatch, hot_keys_for
 
 logger = get_logger(__name__)
 
+# Compiled rules installed once per pool worker by _init_worker
+_worker_rules: List[CompiledRule] = []
+_worker_hot_keys: List[str] = []
+
+
+def _init_worker(rules: List[CompiledRule], hot_keys: List[str]) -> None:
+    """Receive the pickled compiled rules once when a pool worker starts."""
+    global _worker_rules, _worker_hot_keys
+    _worker_rules = rules
+    _worker_hot_keys = hot_keys
+
+
+def _evaluate_rows(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Evaluate one chunk of record dicts against the worker's rules."""
+    batch = RecordBatch.from_dicts(rows, _worker_hot_keys)
+    return ViolationDetector().evaluate_batch(batch, _worker_rules)
+
 
 class ViolationDetector:
     """Detect violations by evaluating records against rules."""
     
-    def __init__(self):
-        """Initialize violation detector."""
-        pass
+    def __init__(self, compiler: Optional[RuleCompiler] = None):
+        """
+        Initialize violation detector.
+        
+        Args:
+            compiler: Rule compiler to share compiled rules across detectors
+        """
+        self.compiler = compiler or RuleCompiler()
+    
+    def compile_rule(self, rule: Dict[str, Any]) -> CompiledRule:
+        """
+        Get the compiled evaluator for a rule.
+        
+        Args:
+            rule: Compliance rule with validation logic
+            
+        Returns:
+            Compiled rule, cached by rule id and updated_at
+        """
+        return self.compiler.compile(rule)
     
     def evaluate_record(
         self,
         record: Dict[str, Any],
-        rule: Dict[str, Any]
+        rule: Union[Dict[str, Any], CompiledRule]
     ) -> Optional[Dict[str, Any]]:
         """
         Evaluate a single record against a rule.
         
         Args:
             record: Record data to evaluate
-            rule: Compliance rule with validation logic
+            rule: Compliance rule with validation logic, or its compiled form
             
         Returns:
             Violation details if rule is violated, None otherwise
         """
         try:
-            validation_logic = rule.get("validation_logic", {})
+            compiled = rule if isinstance(rule, CompiledRule) else self.compile_rule(rule)
             
-            # Extract condition from validation logic
-            condition = validation_logic.get("condition", {})
-            if not condition:
-                logger.warning("Rule has no condition", rule_id=rule.get("id"))
+            if not compiled.is_evaluable:
+                logger.warning("Rule has no condition", rule_id=compiled.rule_id)
                 return None
             
             # Evaluate the condition
-            is_violation = self._evaluate_condition(record, condition)
-            
-            if is_violation:
-                return {
-                    "rule_id": rule["id"],
-                    "record_identifier": str(record.get("id", "unknown")),
-                    "violation_details": {
-                        "expected": condition,
-                        "actual": self._extract_actual_values(record, condition)
-                    }
-                }
+            if compiled.evaluate(record):
+                return self.build_violation(record, compiled)
             
             return None
             
@@ -59,128 +88,169 @@ class ViolationDetector:
             logger.error(
                 "Error evaluating record",
                 error=str(e),
-                rule_id=rule.get("id")
+                rule_id=rule.rule_id if isinstance(rule, CompiledRule) else rule.get("id")
             )
             return None
     
-    def _evaluate_condition(
+    def evaluate_batch(
         self,
-        record: Dict[str, Any],
-        condition: Dict[str, Any]
-    ) -> bool:
+        batch: RecordBatch,
+        rules: Sequence[Union[Dict[str, Any], CompiledRule]]
+    ) -> Dict[str, np.ndarray]:
         """
-        Evaluate a condition against a record.
+        Evaluate a columnar batch of records against rules.
+        
+        Each rule is evaluated as one array operation over the batch
+        instead of one Python call per record.
         
         Args:
-            record: Record data
-            condition: Condition to evaluate
+            batch: Records materialized as columns
+            rules: Compliance rules, or their compiled forms
             
         Returns:
-            True if condition is violated (fails)
+            Mapping of rule ID to the positions of violating records,
+            for rules with at least one violation
         """
-        field = condition.get("field")
-        operator = condition.get("operator")
-        expected_value = condition.get("value")
+        hits: Dict[str, np.ndarray] = {}
         
-        if not field or not operator:
-            return False
-        
-        # Get actual value from record (support nested fields)
-        actual_value = self._get_nested_value(record, field)
-        
-        if actual_value is None:
-            # Missing field might be a violation depending on the rule
-            return operator == "is_not_null"
-        
-        # Evaluate based on operator
-        if operator == "greater_than":
-            try:
-                return float(actual_value) > float(expected_value)
-            except (ValueError, TypeError):
-                return False
-        
-        elif operator == "less_than":
+        for rule in rules:
+            compiled = rule if isinstance(rule, CompiledRule) else self.compile_rule(rule)
+            
+            if not compiled.is_evaluable:
+                logger.warning("Rule has no condition", rule_id=compiled.rule_id)
+                continue
+            
             try:
-                return float(actual_value) < float(expected_value)
-            except (ValueError, TypeError):
-                return False
-        
-        elif operator == "equals":
-            return str(actual_value) == str(expected_value)
+                indices = np.flatnonzero(batch.evaluate(compiled))
+            except Exception as e:
+                logger.error(
+                    "Error evaluating batch",
+                    error=str(e),
+                    rule_id=compiled.rule_id
+                )
+                continue
+            
+            if len(indices):
+                hits[compiled.rule_id] = indices
         
-        elif operator == "not_equals":
-            return str(actual_value) != str(expected_value)
+        return hits
+    
+    def evaluate_parallel(
+        self,
+        row_chunks: Iterable[List[Dict[str, Any]]],
+        rules: Sequence[CompiledRule],
+        processes: Optional[int] = None
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]]:
+        """
+        Evaluate chunks of records across a pool of worker processes.
         
-        elif operator == "contains":
-            return str(expected_value).lower() in str(actual_value).lower()
+        Compiled rules are pickled to each worker once, at start-up, and
+        only record chunks and hit positions cross process boundaries. At
+        most two chunks per process are in flight, and results come back in
+        input order so callers can checkpoint as they write.
         
-        elif operator == "not_contains":
-            return str(expected_value).lower() not in str(actual_value).lower()
+        Args:
+            row_chunks: Chunks of record data dicts
+            rules: Compiled rules
+            processes: Worker processes (defaults to the number of cores)
         
-        elif operator == "regex_match":
-            try:
-                pattern = re.compile(expected_value)
-                return bool(pattern.search(str(actual_value)))
-            except re.error:
-                return False
+        Yields:
+            Each chunk with its hits, as returned by evaluate_batch
+        """
+        processes = processes or os.cpu_count() or 1
+        rules = [rule for rule in rules if rule.is_evaluable]
         
-        elif operator == "is_null":
-            return actual_value is None
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(rules, hot_keys_for(rules))
+        ) as pool:
+            pending = deque()
+            
+            for rows in row_chunks:
+                pending.append((rows, pool.submit(_evaluate_rows, rows)))
+                if len(pending) >= processes * 2:
+                    rows, future = pending.popleft()
+                    yield rows, future.result()
+            
+            while pending:
+                rows, future = pending.popleft()
+                yield rows, future.result()
+    
+    @staticmethod
+    def can_use_processes() -> bool:
+        """
+        Whether this process may start a process pool.
         
-        elif operator == "is_not_null":
-            return actual_value is not None
+        Daemonic processes (Celery prefork workers) cannot have children.
         
-        return False
+        Returns:
+            True if evaluate_parallel can be used
+        """
+        return not multiprocessing.current_process().daemon
     
-    def _get_nested_value(self, data: Dict[str, Any], field_path: str) -> Any:
+    def build_violation(
+        self,
+        record: Dict[str, Any],
+        compiled: CompiledRule
+    ) -> Dict[str, Any]:
         """
-        Get value from nested dictionary using dot notation.
+        Build violation details for a record that failed a compiled rule.
         
         Args:
-            data: Dictionary to search
-            field_path: Field path (e.g., "data.amount" or "amount")
+            record: Record data
+            compiled: Compiled rule that was violated
             
         Returns:
-            Field value or None if not found
+            Violation details
         """
-        keys = field_path.split(".")
-        value = data
+        return {
+            "rule_id": compiled.rule_id,
+            "record_identifier": str(record.get("id", "unknown")),
+            "violation_details": {
+                "expected": compiled.condition,
+                "actual": self._extract_actual_values(record, compiled)
+            }
+        }
+    
+    def _evaluate_condition(
+        self,
+        record: Dict[str, Any],
+        condition: Dict[str, Any]
+    ) -> bool:
+        """
+        Evaluate a condition against a record.
         
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            else:
-                return None
+        Args:
+            record: Record data
+            condition: Condition to evaluate
             
-            if value is None:
-                return None
-        
-        return value
+        Returns:
+            True if condition is violated (fails)
+        """
+        return self.compiler.compile_condition(condition).evaluate(record)
     
     def _extract_actual_values(
         self,
         record: Dict[str, Any],
-        condition: Dict[str, Any]
+        compiled: CompiledRule
     ) -> Dict[str, Any]:
         """
         Extract actual values from record for violation details.
         
         Args:
             record: Record data
-            condition: Condition that was evaluated
+            compiled: Compiled rule that was evaluated
             
         Returns:
             Dictionary of actual values
         """
-        field = condition.get("field")
-        if not field:
+        if not compiled.field:
             return {}
         
-        actual_value = self._get_nested_value(record, field)
-        
         return {
-            "field": field,
-            "value": actual_value
+            "field": compiled.field,
+            "value": compiled.resolve(record)
         }
     
     def calculate_risk_score(self, violations: List[Dict[str, Any]]) -> int:
@@ -0,0 +1,425 @@
+"""Asynchronous LLM enrichment of detected violations."""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, and_
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.core.logging import get_logger
+from src.models import ComplianceRule, Violation, ReasoningTrace
+from src.models.violation import EnrichmentStatus
+from src.services.violation_detector import ViolationDetector
+from src.services.rule_extractor import RuleExtractor
+from src.services.reasoning_trace import ReasoningTraceGenerator
+from src.services.violation_templates import ViolationTemplates, MODE_TEMPLATE
+from src.services.llm.batch import LLMBatchExecutor
+from src.services.llm.factory import create_llm_batch_executor
+
+logger = get_logger(__name__)
+
+
+class ViolationEnricher:
+    """Fill in justification, remediation and reasoning for detected violations."""
+    
+    # Claims older than this are assumed to belong to a dead worker
+    STALE_CLAIM_AFTER = timedelta(minutes=30)
+    
+    def __init__(
+        self,
+        db: Session,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        executor: Optional[LLMBatchExecutor] = None
+    ):
+        """
+        Initialize violation enricher.
+        
+        Args:
+            db: Database session
+            concurrency: Maximum number of LLM requests in flight
+            max_attempts: Attempts before a violation is marked failed
+            executor: LLM batch executor (created from settings if omitted)
+        """
+        self.db = db
+        self.concurrency = concurrency or settings.enrichment_concurrency
+        self.max_attempts = max_attempts or settings.enrichment_max_attempts
+        self.detector = ViolationDetector()
+        self.rule_extractor = RuleExtractor()
+        self.reasoning_generator = ReasoningTraceGenerator()
+        self.executor = executor or self._create_executor()
+    
+    def _create_executor(self) -> Optional[LLMBatchExecutor]:
+        """Create the batch executor, or None to enrich sequentially."""
+        try:
+            return create_llm_batch_executor(concurrency=self.concurrency)
+        except Exception as e:
+            logger.warning("LLM batch executor unavailable, enriching sequentially", error=str(e))
+            return None
+    
+    def claim_batch(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Claim pending violations for enrichment.
+        
+        Rows are locked with SKIP LOCKED so concurrent workers claim disjoint
+        batches, and marked in progress before the lock is released.
+        
+        Args:
+            limit: Maximum number of violations to claim
+        
+        Returns:
+            Enrichment inputs for the claimed violations
+        """
+        stale_before = datetime.utcnow() - self.STALE_CLAIM_AFTER
+        
+        rows = self.db.query(Violation, ComplianceRule).join(
+            ComplianceRule, Violation.rule_id == ComplianceRule.id
+        ).filter(
+            or_(
+                Violation.enrichment_status == EnrichmentStatus.PENDING.value,
+                and_(
+                    Violation.enrichment_status == EnrichmentStatus.IN_PROGRESS.value,
+                    Violation.enrichment_started_at < stale_before
+                )
+            )
+        ).order_by(
+            Violation.detected_at
+        ).limit(limit).with_for_update(of=Violation, skip_locked=True).all()
+        
+        now = datetime.utcnow()
+        claimed = []
+        
+        for violation, rule in rows:
+            # A stale claim whose worker died on its last allowed attempt is not retried again
+            if (
+                violation.enrichment_status == EnrichmentStatus.IN_PROGRESS.value
+                and (violation.enrichment_attempts or 0) >= self.max_attempts
+            ):
+                self._fail_attempt(
+                    violation,
+                    TimeoutError(
+                        f"Enrichment did not finish within "
+                        f"{int(self.STALE_CLAIM_AFTER.total_seconds() // 60)} minutes"
+                    )
+                )
+                continue
+            
+            violation.enrichment_status = EnrichmentStatus.IN_PROGRESS.value
+            violation.enrichment_started_at = now
+            violation.enrichment_attempts = (violation.enrichment_attempts or 0) + 1
+            
+            compiled = self.detector.compile_rule({
+                "id": str(rule.id),
+                "validation_logic": rule.validation_logic,
+                "severity": rule.severity.value,
+                "updated_at": rule.updated_at
+            })
+            
+            claimed.append({
+                "violation_id": violation.id,
+                "rule_description": rule.description,
+                "severity": violation.severity,
+                "record_data": violation.record_snapshot,
+                "violation_details": self.detector.build_violation(
+                    violation.record_snapshot, compiled
+                )["violation_details"],
+                "mode": ViolationTemplates.select_mode(rule.validation_logic, rule.severity.value)
+            })
+        
+        self.db.commit()
+        return claimed
+    
+    def enrich(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate the content for one claimed violation, one call at a time.
+        
+        Used for templated items and when no batch executor is available.
+        LLM failures propagate so enrich_all records them for retry instead
+        of storing placeholder content as completed.
+        
+        Args:
+            item: Enrichment input from claim_batch
+        
+        Returns:
+            Justification, remediation steps and reasoning steps
+        """
+        justification = self.rule_extractor.generate_justification(
+            item["rule_description"],
+            item["record_data"],
+            item["violation_details"],
+            mode=item["mode"],
+            raise_errors=True
+        )
+        
+        remediation = self.rule_extractor.generate_remediation_steps(
+            item["rule_description"],
+            justification,
+            item["record_data"],
+            item["severity"],
+            mode=item["mode"],
+            violation_details=item["violation_details"],
+            raise_errors=True
+        )
+        
+        reasoning_steps = self.reasoning_generator.generate_trace(
+            item["rule_description"],
+            item["severity"],
+            item["record_data"],
+            item["violation_details"],
+            mode=item["mode"],
+            raise_errors=True
+        )
+        
+        return {
+            "justification": justification,
+            "remediation_steps": remediation,
+            "reasoning_steps": reasoning_steps
+        }
+    
+    def enrich_all(
+        self,
+        items: List[Dict[str, Any]]
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Enrich claimed violations, batching LLM calls through the executor.
+        
+        Templated items are rendered in-process. LLM items run through the
+        batch executor in two rounds: justifications and reasoning traces
+        together, then remediation (which depends on the justification).
+        
+        Args:
+            items: Enrichment inputs from claim_batch
+        
+        Returns:
+            (result, error) per item, in input order
+        """
+        outcomes: List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = [None] * len(items)
+        batched = []
+        
+        for index, item in enumerate(items):
+            if self.executor is not None and item["mode"] != MODE_TEMPLATE:
+                batched.append(index)
+                continue
+            try:
+                outcomes[index] = (self.enrich(item), None)
+            except Exception as e:
+                outcomes[index] = (None, e)
+        
+        if batched:
+            for index, outcome in zip(batched, self._enrich_batched([items[i] for i in batched])):
+                outcomes[index] = outcome
+        
+        return outcomes
+    
+    def _enrich_batched(
+        self,
+        items: List[Dict[str, Any]]
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Enrich LLM-mode items with concurrent, rate-limited batch calls."""
+        first_round = []
+        for item in items:
+            first_round.append(self.rule_extractor.build_justification_request(
+                item["rule_description"],
+                item["record_data"],
+                item["violation_details"]
+            ))
+            first_round.append(self.reasoning_generator.build_trace_request(
+                item["rule_description"],
+                item["severity"],
+                item["record_data"],
+                item["violation_details"]
+            ))
+        first_results = self.executor.run_sync(first_round)
+        
+        justifications: List[Optional[str]] = []
+        for index in range(len(items)):
+            result = first_results[2 * index]
+            justifications.append(self.rule_extractor.parse_justification(result.content) if result.ok else None)
+        
+        # Remediation prompts include the justification, so they run second
+        remediation_items = [index for index, justification in enumerate(justifications) if justification]
+        remediation_results = self.executor.run_sync([
+            self.rule_extractor.build_remediation_request(
+                items[index]["rule_description"],
+                justifications[index],
+                items[index]["record_data"],
+                items[index]["severity"],
+                violation_details=items[index]["violation_details"]
+            )
+            for index in remediation_items
+        ])
+        remediation_by_item = dict(zip(remediation_items, remediation_results))
+        
+        outcomes = []
+        for index, item in enumerate(items):
+            if justifications[index] is None:
+                # Leave the violation pending so it is retried later
+                outcomes.append((None, RuntimeError(first_results[2 * index].error)))
+                continue
+            
+            # One malformed reply must not fail the rest of the claimed batch
+            try:
+                outcomes.append((self._assemble_batched(
+                    item,
+                    justifications[index],
+                    remediation_by_item[index],
+                    first_results[2 * index + 1]
+                ), None))
+            except Exception as e:
+                outcomes.append((None, e))
+        
+        return outcomes
+    
+    def _assemble_batched(
+        self,
+        item: Dict[str, Any],
+        justification: str,
+        remediation: Any,
+        trace: Any
+    ) -> Dict[str, Any]:
+        """Combine one item's batched justification, remediation and trace results."""
+        try:
+            steps = self.rule_extractor.parse_remediation_steps(remediation.content) if remediation.ok else None
+        except ValueError as e:
+            logger.warning("Failed to parse remediation steps", error=str(e))
+            steps = None
+        
+        return {
+            "justification": justification,
+            "remediation_steps": steps or self.rule_extractor.fallback_remediation_steps(),
+            "reasoning_steps": self.reasoning_generator.parse_trace(
+                trace.content,
+                item["rule_description"],
+                item["violation_details"]
+            )
+        }
+    
+    def enrich_batch(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Claim and enrich one batch of pending violations.
+        
+        Args:
+            limit: Maximum number of violations to enrich
+        
+        Returns:
+            Batch summary
+        """
+        claimed = self.claim_batch(limit or settings.enrichment_batch_size)
+        if not claimed:
+            return {"claimed": 0, "enriched": 0, "failed": 0}
+        
+        outcomes = self.enrich_all(claimed)
+        
+        enriched = failed = 0
+        for item, (result, error) in zip(claimed, outcomes):
+            if error is None:
+                self._store(item["violation_id"], result)
+                enriched += 1
+            else:
+                self._record_failure(item["violation_id"], error)
+                failed += 1
+        
+        self.db.commit()
+        
+        logger.info(
+            "Violation enrichment batch completed",
+            claimed=len(claimed),
+            enriched=enriched,
+            failed=failed
+        )
+        
+        return {"claimed": len(claimed), "enriched": enriched, "failed": failed}
+    
+    def _store(self, violation_id: Any, result: Dict[str, Any]) -> None:
+        """Write generated content back to a violation and its reasoning trace."""
+        violation = self.db.query(Violation).filter(Violation.id == violation_id).first()
+        if violation is None:
+            return
+        
+        violation.justification = result["justification"]
+        violation.remediation_steps = result["remediation_steps"]
+        violation.enrichment_status = EnrichmentStatus.COMPLETED.value
+        violation.enriched_at = datetime.utcnow()
+        violation.enrichment_error = None
+        
+        if result["reasoning_steps"]:
+            trace = self.db.query(ReasoningTrace).filter(
+                ReasoningTrace.violation_id == violation_id
+            ).first()
+            if trace is None:
+                self.db.add(ReasoningTrace(violation_id=violation_id, steps=result["reasoning_steps"]))
+            else:
+                trace.steps = result["reasoning_steps"]
+    
+    def _record_failure(self, violation_id: Any, error: Exception) -> None:
+        """Return a violation to the queue, or mark it failed after max attempts."""
+        violation = self.db.query(Violation).filter(Violation.id == violation_id).first()
+        if violation is not None:
+            self._fail_attempt(violation, error)
+    
+    def _fail_attempt(self, violation: Violation, error: Exception) -> None:
+        """Record a failed attempt on a loaded violation."""
+        violation.enrichment_error = str(error)
+        if violation.enrichment_attempts >= self.max_attempts:
+            violation.enrichment_status = EnrichmentStatus.FAILED.value
+        else:
+            violation.enrichment_status = EnrichmentStatus.PENDING.value
+        
+        logger.warning(
+            "Violation enrichment failed",
+            violation_id=str(violation.id),
+            attempts=violation.enrichment_attempts,
+            error=str(error)
+        )
+    
+    def pending_count(self) -> int:
+        """Count violations waiting for enrichment."""
+        return self.db.query(func.count(Violation.id)).filter(
+            Violation.enrichment_status == EnrichmentStatus.PENDING.value
+        ).scalar() or 0
+    
+    def metrics(self, window_hours: int = 24) -> Dict[str, Any]:
+        """
+        Get enrichment backlog and latency metrics.
+        
+        Args:
+            window_hours: Window for latency statistics
+        
+        Returns:
+            Backlog counts by status, oldest pending age and detection-to-
+            enrichment latency over the window
+        """
+        backlog = dict(
+            self.db.query(Violation.enrichment_status, func.count(Violation.id)).filter(
+                Violation.enrichment_status != EnrichmentStatus.COMPLETED.value
+            ).group_by(Violation.enrichment_status).all()
+        )
+        
+        oldest_pending = self.db.query(func.min(Violation.detected_at)).filter(
+            Violation.enrichment_status == EnrichmentStatus.PENDING.value
+        ).scalar()
+        
+        latency = func.extract("epoch", Violation.enriched_at - Violation.detected_at)
+        since = datetime.utcnow() - timedelta(hours=window_hours)
+        count, average, p95 = self.db.query(
+            func.count(Violation.id),
+            func.avg(latency),
+            func.percentile_cont(0.95).within_group(latency)
+        ).filter(
+            Violation.enriched_at >= since
+        ).one()
+        
+        return {
+            "pending": backlog.get(EnrichmentStatus.PENDING.value, 0),
+            "in_progress": backlog.get(EnrichmentStatus.IN_PROGRESS.value, 0),
+            "failed": backlog.get(EnrichmentStatus.FAILED.value, 0),
+            "oldest_pending_age_seconds": (
+                round((datetime.utcnow() - oldest_pending).total_seconds(), 1)
+                if oldest_pending else None
+            ),
+            "window_hours": window_hours,
+            "enriched_in_window": count,
+            "avg_latency_seconds": round(float(average), 1) if average is not None else None,
+            "p95_latency_seconds": round(float(p95), 1) if p95 is not None else None
+        }
@@ -0,0 +1,542 @@
+"""Streaming violation scan pipeline."""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.core.logging import get_logger
+from src.models import ComplianceRule, CompanyRecord, Violation, ReasoningTrace, ScanCheckpoint
+from src.models.violation import EnrichmentStatus, ViolationStatus
+from src.services.violation_detector import ViolationDetector
+from src.services.rule_compiler import CompiledRule
+from src.services.record_batch import RecordBatch, hot_keys_for, record_to_data
+from src.services.risk_scoring import RiskScoringEngine
+from src.services.violation_templates import ViolationTemplates, MODE_TEMPLATE
+
+logger = get_logger(__name__)
+
+
+class ViolationScanner:
+    """Scan company records against active rules in bounded-memory chunks."""
+    
+    DEFAULT_CHUNK_SIZE = 1000
+    
+    def __init__(
+        self,
+        db: Session,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        detector: Optional[ViolationDetector] = None,
+        processes: Optional[int] = None
+    ):
+        """
+        Initialize violation scanner.
+        
+        Args:
+            db: Database session used for writes and checkpoints
+            chunk_size: Number of records evaluated and flushed per chunk
+            detector: Violation detector (shares its compiled rule cache)
+            processes: Processes evaluating chunks (1 evaluates in-process,
+                0 uses every core; defaults to SCAN_PROCESSES)
+        """
+        self.db = db
+        self.chunk_size = chunk_size
+        self.detector = detector or ViolationDetector()
+        self.risk_engine = RiskScoringEngine()
+        self.processes = settings.scan_processes if processes is None else processes
+    
+    def load_rules(
+        self,
+        policy_id: Optional[str] = None,
+        rule_ids: Optional[List[str]] = None
+    ) -> List[ComplianceRule]:
+        """
+        Load active rules, optionally restricted to one policy or to given rules.
+        
+        Args:
+            policy_id: Optional policy document ID
+            rule_ids: Optional rule IDs
+        
+        Returns:
+            Active compliance rules
+        """
+        query = self.db.query(ComplianceRule).filter(
+            ComplianceRule.is_active == True
+        )
+        if policy_id:
+            query = query.filter(ComplianceRule.policy_document_id == policy_id)
+        if rule_ids is not None:
+            query = query.filter(ComplianceRule.id.in_(rule_ids))
+        return query.all()
+    
+    def compile_rules(
+        self,
+        rules: List[ComplianceRule]
+    ) -> List[Tuple[ComplianceRule, CompiledRule]]:
+        """
+        Compile rules once for the whole scan.
+        
+        Args:
+            rules: Compliance rules
+        
+        Returns:
+            Pairs of rule and its compiled form
+        """
+        return [
+            (
+                rule,
+                self.detector.compile_rule({
+                    "id": str(rule.id),
+                    "validation_logic": rule.validation_logic,
+                    "severity": rule.severity.value,
+                    "updated_at": rule.updated_at
+                })
+            )
+            for rule in rules
+        ]
+    
+    def shard_ranges(self, max_shards: int, shard_size: int) -> List[Tuple[Any, Any, int]]:
+        """
+        Split company records into contiguous primary-key ranges of similar size.
+        
+        Args:
+            max_shards: Upper bound on the number of shards
+            shard_size: Target number of records per shard
+        
+        Returns:
+            (first ID, last ID, record count) per shard, in ID order
+        """
+        total = self.db.query(func.count(CompanyRecord.id)).scalar() or 0
+        if total == 0:
+            return []
+        
+        shards = max(1, min(max_shards, -(-total // shard_size)))
+        numbered = select(
+            CompanyRecord.id,
+            func.ntile(shards).over(order_by=CompanyRecord.id).label("shard")
+        ).subquery()
+        
+        rows = self.db.execute(
+            select(
+                func.min(numbered.c.id),
+                func.max(numbered.c.id),
+                func.count()
+            ).group_by(numbered.c.shard).order_by(numbered.c.shard)
+        ).all()
+        
+        return [(first_id, last_id, count) for first_id, last_id, count in rows]
+    
+    def scan(
+        self,
+        policy_id: Optional[str] = None,
+        scan_key: Optional[str] = None,
+        resume: bool = True,
+        id_range: Optional[Tuple[Any, Any]] = None,
+        rule_ids: Optional[List[str]] = None,
+        updated_after: Optional[datetime] = None,
+        updated_through: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Scan all records against active rules, committing after every chunk.
+        
+        Violations found in a chunk are committed together with the scan
+        checkpoint, so an interrupted scan resumes after the last committed
+        chunk without re-evaluating it.
+        
+        Args:
+            policy_id: Optional policy ID to restrict the rules scanned
+            scan_key: Checkpoint key (defaults to one key per policy/full scan)
+            resume: Continue an unfinished scan with the same key if present
+            id_range: Inclusive (first ID, last ID) bounds for a shard scan
+            rule_ids: Optional rule IDs to restrict the rules scanned
+            updated_after: Only scan records updated after this time (delta scans)
+            updated_through: Only scan records updated at or before this time
+        
+        Returns:
+            Scan summary
+        """
+        rules = self.load_rules(policy_id, rule_ids)
+        
+        if not rules:
+            return {
+                "message": "No active rules to scan",
+                "rules_evaluated": 0,
+                "records_scanned": 0,
+                "violations_created": 0
+            }
+        
+        compiled_rules = self.compile_rules(rules)
+        hot_keys = hot_keys_for(compiled for _, compiled in compiled_rules)
+        
+        scan_key = scan_key or (f"policy:{policy_id}" if policy_id else "full_scan")
+        checkpoint = self._start_checkpoint(scan_key, resume)
+        resumed_from = checkpoint.last_record_id
+        
+        logger.info(
+            "Violation scan started",
+            scan_key=scan_key,
+            rules=len(rules),
+            chunk_size=self.chunk_size,
+            resumed_from=str(resumed_from) if resumed_from else None
+        )
+        
+        try:
+            first_id, last_id = id_range or (None, None)
+            chunks = self.iter_chunks(
+                after_id=checkpoint.last_record_id,
+                first_id=first_id,
+                last_id=last_id,
+                updated_after=updated_after,
+                updated_through=updated_through
+            )
+            
+            for last_record_id, scanned, created in self._process_chunks(chunks, compiled_rules, hot_keys):
+                checkpoint.last_record_id = last_record_id
+                checkpoint.records_scanned += scanned
+                checkpoint.violations_detected += created
+                checkpoint.chunks_completed += 1
+                
+                # Violations and checkpoint land in the same transaction
+                self.db.commit()
+            
+            checkpoint.status = "completed"
+            checkpoint.completed_at = datetime.utcnow()
+            self.db.commit()
+        
+        except Exception as e:
+            self.db.rollback()
+            checkpoint.status = "failed"
+            checkpoint.error_message = str(e)
+            self.db.commit()
+            logger.error("Violation scan failed", scan_key=scan_key, error=str(e))
+            raise
+        
+        logger.info(
+            "Violation scan completed",
+            scan_key=scan_key,
+            rules_scanned=len(rules),
+            records_scanned=checkpoint.records_scanned,
+            violations_created=checkpoint.violations_detected
+        )
+        
+        return {
+            "scan_key": scan_key,
+            "rules_evaluated": len(rules),
+            "records_scanned": checkpoint.records_scanned,
+            "violations_created": checkpoint.violations_detected,
+            "chunks": checkpoint.chunks_completed,
+            "resumed_from": str(resumed_from) if resumed_from else None
+        }
+    
+    def iter_chunks(
+        self,
+        after_id: Optional[Any] = None,
+        first_id: Optional[Any] = None,
+        last_id: Optional[Any] = None,
+        updated_after: Optional[datetime] = None,
+        updated_through: Optional[datetime] = None
+    ) -> Iterator[List[CompanyRecord]]:
+        """
+        Stream company records in primary-key order, one chunk at a time.
+        
+        Records are read through a server-side cursor on a dedicated
+        session; committing the write session would otherwise close it.
+        
+        Args:
+            after_id: Only yield records with an ID greater than this
+            first_id: Only yield records with an ID of at least this
+            last_id: Only yield records with an ID of at most this
+            updated_after: Only yield records updated after this time
+            updated_through: Only yield records updated at or before this time
+        
+        Yields:
+            Lists of at most chunk_size records
+        """
+        read_session = Session(bind=self.db.get_bind())
+        try:
+            statement = select(CompanyRecord).order_by(CompanyRecord.id)
+            if after_id is not None:
+                statement = statement.where(CompanyRecord.id > after_id)
+            if first_id is not None:
+                statement = statement.where(CompanyRecord.id >= first_id)
+            if last_id is not None:
+                statement = statement.where(CompanyRecord.id <= last_id)
+            if updated_after is not None:
+                statement = statement.where(CompanyRecord.updated_at > updated_after)
+            if updated_through is not None:
+                statement = statement.where(CompanyRecord.updated_at <= updated_through)
+            
+            result = read_session.execute(
+                statement.execution_options(stream_results=True, yield_per=self.chunk_size)
+            )
+            
+            for records in result.scalars().partitions(self.chunk_size):
+                yield records
+                read_session.expunge_all()
+        finally:
+            read_session.close()
+    
+    def _process_chunks(
+        self,
+        chunks: Iterator[List[CompanyRecord]],
+        compiled_rules: List[Tuple[ComplianceRule, CompiledRule]],
+        hot_keys: List[str]
+    ) -> Iterator[Tuple[Any, int, int]]:
+        """
+        Evaluate and write chunks in-process or across a process pool.
+        
+        With a pool, rule evaluation for upcoming chunks overlaps with the
+        parent writing the hits of earlier ones; writes stay in chunk order.
+        
+        Args:
+            chunks: Record chunks in primary-key order
+            compiled_rules: Pairs of rule and its compiled form
+            hot_keys: Data keys to materialize as columns
+        
+        Yields:
+            (last record ID, records scanned, violations created) per chunk
+        """
+        if self.processes == 1 or not self.detector.can_use_processes():
+            for records in chunks:
+                yield records[-1].id, len(records), self.process_chunk(records, compiled_rules, hot_keys)
+            return
+        
+        row_chunks = ([record_to_data(record) for record in records] for records in chunks)
+        results = self.detector.evaluate_parallel(
+            row_chunks,
+            [compiled for _, compiled in compiled_rules],
+            processes=self.processes or None
+        )
+        
+        for rows, hits in results:
+            batch = RecordBatch.from_dicts(rows, hot_keys)
+            yield rows[-1]["id"], len(rows), self.write_hits(batch, hits, compiled_rules)
+    
+    def process_chunk(
+        self,
+        records: List[CompanyRecord],
+        compiled_rules: List[Tuple[ComplianceRule, CompiledRule]],
+        hot_keys: List[str]
+    ) -> int:
+        """
+        Evaluate one chunk of records and bulk insert the new violations.
+        
+        Args:
+            records: Records in the chunk
+            compiled_rules: Pairs of rule and its compiled form
+            hot_keys: Data keys to materialize as columns
+        
+        Returns:
+            Number of violations created
+        """
+        batch = RecordBatch.from_records(records, hot_keys)
+        hits = self.detector.evaluate_batch(
+            batch,
+            [compiled for _, compiled in compiled_rules]
+        )
+        return self.write_hits(batch, hits, compiled_rules)
+    
+    def write_hits(
+        self,
+        batch: RecordBatch,
+        hits: Dict[str, Any],
+        compiled_rules: List[Tuple[ComplianceRule, CompiledRule]]
+    ) -> int:
+        """
+        Bulk insert violations for a chunk's rule hits, skipping known pairs.
+        
+        Args:
+            batch: Records in the chunk
+            hits: Rule ID -> positions of violating records in the batch
+            compiled_rules: Pairs of rule and its compiled form
+        
+        Returns:
+            Number of violations created
+        """
+        if not hits:
+            return 0
+        
+        # One set-based lookup for every (rule, record) pair already flagged
+        record_ids = batch.frame["id"]
+        hit_record_ids = {
+            str(record_ids.iat[index])
+            for indices in hits.values()
+            for index in indices
+        }
+        existing = self._existing_keys(
+            [rule.id for rule, compiled in compiled_rules if compiled.rule_id in hits],
+            hit_record_ids
+        )
+        
+        violation_rows = []
+        trace_steps = {}
+        
+        for rule, compiled_rule in compiled_rules:
+            if compiled_rule.rule_id not in hits:
+                continue
+            
+            mode = ViolationTemplates.select_mode(rule.validation_logic, rule.severity.value)
+            
+            for index in hits[compiled_rule.rule_id]:
+                record_data = batch.record_data(index)
+                
+                if (compiled_rule.rule_id, record_data["id"]) in existing:
+                    continue
+                
+                row, steps = self._build_violation(rule, compiled_rule, record_data, mode)
+                violation_rows.append(row)
+                if steps is not None:
+                    trace_steps[row["id"]] = steps
+        
+        # One grouped count per factor for the whole chunk
+        risk_scores = self.risk_engine.calculate_risk_scores_batch(violation_rows, self.db)
+        for row, risk_data in zip(violation_rows, risk_scores):
+            row["risk_score"] = risk_data["score"]
+            row["risk_level"] = risk_data["level"]
+            row["risk_factors"] = risk_data["factors"]
+        
+        inserted_ids = self._insert_violations(violation_rows)
+        
+        # Templated violations are complete at detection, including their trace
+        trace_rows = [
+            {
+                "id": uuid.uuid4(),
+                "violation_id": violation_id,
+                "steps": trace_steps[violation_id],
+                "created_at": datetime.utcnow()
+            }
+            for violation_id in inserted_ids
+            if violation_id in trace_steps
+        ]
+        if trace_rows:
+            self.db.execute(insert(ReasoningTrace), trace_rows)
+        
+        return len(inserted_ids)
+    
+    def _existing_keys(self, rule_ids: List[Any], record_ids: Set[str]) -> Set[Tuple[str, str]]:
+        """
+        Load the (rule_id, record_identifier) pairs that already have violations.
+        
+        Args:
+            rule_ids: Rules with hits in the chunk
+            record_ids: Record identifiers with hits in the chunk
+            
+        Returns:
+            Set of existing (rule ID, record identifier) keys
+        """
+        rows = self.db.query(Violation.rule_id, Violation.record_identifier).filter(
+            Violation.rule_id.in_(rule_ids),
+            Violation.record_identifier.in_(record_ids)
+        ).all()
+        
+        return {(str(rule_id), record_identifier) for rule_id, record_identifier in rows}
+    
+    def _insert_violations(self, rows: List[Dict[str, Any]]) -> Set[Any]:
+        """
+        Bulk insert violation rows, skipping pairs another scan inserted first.
+        
+        Relies on the unique (rule_id, record_identifier) index.
+        
+        Args:
+            rows: Violation column values
+            
+        Returns:
+            IDs of the violations actually inserted
+        """
+        if not rows:
+            return set()
+        
+        statement = pg_insert(Violation).values(rows).on_conflict_do_nothing(
+            index_elements=["rule_id", "record_identifier"]
+        ).returning(Violation.id)
+        
+        return {row[0] for row in self.db.execute(statement)}
+    
+    def _build_violation(
+        self,
+        rule: ComplianceRule,
+        compiled_rule: CompiledRule,
+        record_data: Dict[str, Any],
+        mode: str
+    ) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]:
+        """
+        Build a violation row (risk scores are added per chunk).
+        
+        In template mode the justification, remediation and reasoning are
+        rendered immediately. Otherwise the row gets a placeholder
+        justification and is left pending for the enrichment pipeline, so
+        detection never makes LLM calls.
+        
+        Args:
+            rule: Violated rule
+            compiled_rule: Compiled form of the rule
+            record_data: Violating record data
+            mode: Justification mode selected for the rule
+        
+        Returns:
+            Violation column values and templated reasoning steps (or None)
+        """
+        justification = f"Violation detected: {rule.description}"
+        remediation = None
+        reasoning_steps = None
+        enrichment_status = EnrichmentStatus.PENDING.value
+        enriched_at = None
+        
+        if mode == MODE_TEMPLATE:
+            violation_details = self.detector.build_violation(record_data, compiled_rule)["violation_details"]
+            justification = ViolationTemplates.render_justification(
+                rule.description, record_data, violation_details
+            )
+            remediation = ViolationTemplates.render_remediation(
+                rule.description, record_data, violation_details, rule.severity.value
+            )
+            reasoning_steps = ViolationTemplates.render_trace(
+                rule.description, rule.severity.value, record_data, violation_details
+            )
+            enrichment_status = EnrichmentStatus.COMPLETED.value
+            enriched_at = datetime.utcnow()
+        
+        row = {
+            "id": uuid.uuid4(),
+            "rule_id": rule.id,
+            "record_identifier": record_data["id"],
+            "table_name": "company_records",
+            "detected_at": datetime.utcnow(),
+            "status": ViolationStatus.PENDING_REVIEW,
+            "justification": justification,
+            "record_snapshot": record_data,
+            "severity": rule.severity.value,
+            "remediation_steps": remediation,
+            "enrichment_status": enrichment_status,
+            "enriched_at": enriched_at
+        }
+        
+        return row, reasoning_steps
+    
+    def _start_checkpoint(self, scan_key: str, resume: bool) -> ScanCheckpoint:
+        """Load the checkpoint to resume from, or reset it for a fresh scan."""
+        checkpoint = self.db.query(ScanCheckpoint).filter(
+            ScanCheckpoint.scan_key == scan_key
+        ).first()
+        
+        if checkpoint is None:
+            checkpoint = ScanCheckpoint(scan_key=scan_key)
+            self.db.add(checkpoint)
+        
+        if not resume or checkpoint.status == "completed" or checkpoint.last_record_id is None:
+            checkpoint.last_record_id = None
+            checkpoint.records_scanned = 0
+            checkpoint.violations_detected = 0
+            checkpoint.chunks_completed = 0
+            checkpoint.started_at = datetime.utcnow()
+        
+        checkpoint.status = "running"
+        checkpoint.completed_at = None
+        checkpoint.error_message = None
+        self.db.commit()
+        
+        return checkpoint
@@ -0,0 +1,271 @@
+"""Deterministic justification, remediation and reasoning for simple violations."""
+
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+
+# Justification modes
+MODE_AUTO = "auto"
+MODE_TEMPLATE = "template"
+MODE_LLM = "llm"
+MODES = (MODE_AUTO, MODE_TEMPLATE, MODE_LLM)
+
+# Operator -> phrase describing why the actual value violates the condition
+OPERATOR_PHRASES = {
+    "greater_than": "{actual}, which exceeds the limit of {expected}",
+    "less_than": "{actual}, which is below the minimum of {expected}",
+    "equals": "\"{actual}\", which matches the prohibited value \"{expected}\"",
+    "not_equals": "\"{actual}\", but the rule requires \"{expected}\"",
+    "contains": "\"{actual}\", which contains the prohibited term \"{expected}\"",
+    "not_contains": "\"{actual}\", which does not contain the required term \"{expected}\"",
+    "regex_match": "\"{actual}\", which matches the flagged pattern \"{expected}\"",
+    "is_null": "present, but the rule requires it to be empty",
+    "is_not_null": "{actual}, and the rule flags records where it is set",
+}
+
+# is_not_null rules also fire when the field is absent (CompiledRule.evaluate)
+ABSENT_PHRASE = "missing, but the rule requires a value"
+
+# Operator -> short label used in reasoning steps
+OPERATOR_LABELS = {
+    "greater_than": "greater than",
+    "less_than": "less than",
+    "equals": "equal to",
+    "not_equals": "not equal to",
+    "contains": "containing",
+    "not_contains": "not containing",
+    "regex_match": "matching",
+    "is_null": "empty",
+    "is_not_null": "set",
+}
+
+# Severity -> (priority of the first step, priority of the follow-up steps)
+SEVERITY_PRIORITIES = {
+    "critical": ("immediate", "immediate"),
+    "high": ("immediate", "high"),
+    "medium": ("high", "medium"),
+    "low": ("medium", "low"),
+}
+
+
+class ViolationTemplates:
+    """Render audit text for single-field conditions without calling the LLM."""
+    
+    @staticmethod
+    def select_mode(
+        validation_logic: Optional[Dict[str, Any]],
+        severity: Optional[str]
+    ) -> str:
+        """
+        Decide whether a rule's violations are explained by templates or the LLM.
+        
+        A per-rule "justification_mode" in validation_logic wins over the
+        JUSTIFICATION_MODE setting. In auto mode, templates are used for
+        severities listed in TEMPLATE_SEVERITIES when the condition is a
+        single supported field comparison.
+        
+        Args:
+            validation_logic: Rule validation logic
+            severity: Rule severity
+        
+        Returns:
+            "template" or "llm"
+        """
+        validation_logic = validation_logic or {}
+        condition = validation_logic.get("condition") or {}
+        
+        mode = validation_logic.get("justification_mode") or settings.justification_mode
+        if mode not in MODES:
+            mode = MODE_AUTO
+        
+        if mode == MODE_LLM or not ViolationTemplates.supports(condition):
+            return MODE_LLM
+        if mode == MODE_TEMPLATE:
+            return MODE_TEMPLATE
+        
+        severities = {s.strip().lower() for s in settings.template_severities.split(",") if s.strip()}
+        return MODE_TEMPLATE if (severity or "").lower() in severities else MODE_LLM
+    
+    @staticmethod
+    def supports(condition: Dict[str, Any]) -> bool:
+        """
+        Whether a condition is simple enough to explain with a template.
+        
+        Multi-condition rules (additional_conditions/logic) and operators
+        without a phrase are left to the LLM.
+        
+        Args:
+            condition: Rule condition
+        
+        Returns:
+            True if the condition can be rendered
+        """
+        if not condition or not condition.get("field"):
+            return False
+        if condition.get("additional_conditions") or condition.get("logic"):
+            return False
+        return condition.get("operator") in OPERATOR_PHRASES
+    
+    @staticmethod
+    def render_justification(
+        rule_description: str,
+        record_data: Dict[str, Any],
+        violation_details: Dict[str, Any]
+    ) -> str:
+        """
+        Render a justification from the condition and the actual value.
+        
+        Args:
+            rule_description: Description of the violated rule
+            record_data: The record that violated the rule
+            violation_details: Expected condition and actual value
+        
+        Returns:
+            Justification text
+        """
+        condition = violation_details.get("expected") or {}
+        actual = (violation_details.get("actual") or {}).get("value")
+        field = condition.get("field", "value")
+        
+        operator = condition.get("operator")
+        
+        if operator == "is_not_null" and actual is None:
+            phrase = ABSENT_PHRASE
+        else:
+            phrase = OPERATOR_PHRASES[operator].format(
+                actual=_format_value(actual),
+                expected=_format_value(condition.get("value"))
+            )
+        record = _record_label(record_data)
+        
+        return (
+            f"{record} violates the rule \"{rule_description.rstrip('.')}\". "
+            f"Its {field} is {phrase}."
+        )
+    
+    @staticmethod
+    def render_remediation(
+        rule_description: str,
+        record_data: Dict[str, Any],
+        violation_details: Dict[str, Any],
+        severity: str = "medium"
+    ) -> List[Dict[str, Any]]:
+        """
+        Render standard remediation steps for a violation.
+        
+        Args:
+            rule_description: Description of the violated rule
+            record_data: The violating record
+            violation_details: Expected condition and actual value
+            severity: Severity level of the violation
+        
+        Returns:
+            Remediation steps in the RemediationPrompt format
+        """
+        condition = violation_details.get("expected") or {}
+        field = condition.get("field", "value")
+        first, rest = SEVERITY_PRIORITIES.get((severity or "").lower(), SEVERITY_PRIORITIES["medium"])
+        record = _record_label(record_data)
+        
+        return [
+            {
+                "step_number": 1,
+                "action": f"Review {record} and verify its {field} against the rule \"{rule_description.rstrip('.')}\"",
+                "responsible_party": "Compliance Team",
+                "priority": first,
+                "estimated_time": "1 day",
+                "prevents_recurrence": False
+            },
+            {
+                "step_number": 2,
+                "action": f"Correct or document an approved exception for the {field} of {record}",
+                "responsible_party": "Account Manager",
+                "priority": rest,
+                "estimated_time": "2 days",
+                "prevents_recurrence": False
+            },
+            {
+                "step_number": 3,
+                "action": f"Add a control that checks {field} before records like this are processed",
+                "responsible_party": "System Admin",
+                "priority": rest,
+                "estimated_time": "1 week",
+                "prevents_recurrence": True
+            }
+        ]
+    
+    @staticmethod
+    def render_trace(
+        rule_description: str,
+        severity: str,
+        record_data: Dict[str, Any],
+        violation_details: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Render a reasoning trace for a deterministic field comparison.
+        
+        Args:
+            rule_description: Description of the compliance rule
+            severity: Severity level
+            record_data: The record being evaluated
+            violation_details: Expected condition and actual value
+        
+        Returns:
+            Reasoning steps in the ReasoningTraceGenerator format
+        """
+        condition = violation_details.get("expected") or {}
+        actual = (violation_details.get("actual") or {}).get("value")
+        field = condition.get("field", "value")
+        operator = condition.get("operator")
+        
+        label = "missing" if operator == "is_not_null" and actual is None else OPERATOR_LABELS[operator]
+        requirement = f"{field} {label}"
+        if operator not in ("is_null", "is_not_null"):
+            requirement += f" {_format_value(condition.get('value'))}"
+        
+        return [
+            {
+                "step_number": 1,
+                "description": f"Evaluated {_record_label(record_data).lower()} against rule: {rule_description}",
+                "rules_evaluated": [rule_description],
+                "policy_references": [],
+                "confidence_score": 100,
+                "outcome": "inconclusive"
+            },
+            {
+                "step_number": 2,
+                "description": f"The rule flags records with {requirement}; the record's {field} is {_format_value(actual)}",
+                "rules_evaluated": [rule_description],
+                "policy_references": [],
+                "confidence_score": 100,
+                "outcome": "fail"
+            },
+            {
+                "step_number": 3,
+                "description": f"Condition met, so the record is a {severity} severity violation",
+                "rules_evaluated": [rule_description],
+                "policy_references": [],
+                "confidence_score": 100,
+                "outcome": "fail"
+            }
+        ]
+
+
+def _format_value(value: Any) -> str:
+    """Format a value for audit text, dropping a trailing .0 from whole numbers."""
+    if value is None:
+        return "missing"
+    if isinstance(value, float) and value.is_integer():
+        return f"{int(value):,}"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{value:,}"
+    return str(value)
+
+
+def _record_label(record_data: Dict[str, Any]) -> str:
+    """Name a record by transaction ID when present, otherwise by record ID."""
+    if record_data.get("transaction_id"):
+        return f"Transaction {record_data['transaction_id']}"
+    if record_data.get("id"):
+        return f"Record {record_data['id']}"
+    return "The record"
@@ -32,6 +32,14 @@ celery_app.conf.beat_schedule = {
         "task": "src.workers.tasks.continuous_monitoring_task",
         "schedule": 300.0,  # Every 5 minutes
     },
+    "enrich-violations": {
+        "task": "src.workers.tasks.enrich_violations_task",
+        "schedule": 60.0,  # Every minute, picks up anything a scan did not hand off
+    },
+    "refresh-dashboard-metrics": {
+        "task": "src.workers.tasks.refresh_dashboard_metrics_task",
+        "schedule": 300.0,  # Every 5 minutes, each run is a full re-aggregation of the view
+    },
     "cleanup-old-jobs": {
         "task": "src.workers.tasks.cleanup_old_jobs_task",
         "schedule": crontab(hour=2, minute=0),  # Daily at 2 AM
@@ -1,24 +1,120 @@
 """Celery tasks for background processing."""
 
 import structlog
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List
+from celery import chord
+from redis.exceptions import LockError
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
+from src.config.settings import settings
 from src.workers.celery_app import celery_app
-from src.core.database import get_db_session
-from src.services.violation_detector import ViolationDetector
-from src.models.job import MonitoringJob
+from src.core.database import db_manager, get_db_session
+from src.services.violation_scanner import ViolationScanner
+from src.services.violation_enricher import ViolationEnricher
+from src.services.risk_scoring import RiskScoringEngine
+from src.services.delta_monitor import DeltaMonitor
+from src.services.predictive_analytics import score_company_records, train_predictor
+from src.services.dashboard_metrics import DashboardMetrics
+from src.services.response_cache import install_invalidation_listeners
+from src.models.job import MonitoringJob, JobStatus
 from src.models.rule import ComplianceRule
+from src.models.scan_checkpoint import ScanCheckpoint
 
 logger = structlog.get_logger()
 
+# Violations, reviews and corrections written by workers invalidate cached API responses
+install_invalidation_listeners()
+
+# Single-flight locks expire after the hard task time limit if a worker dies holding one
+TASK_LOCK_SECONDS = 30 * 60
+
+
+@contextmanager
+def _single_flight(name: str, timeout: int = TASK_LOCK_SECONDS) -> Iterator[bool]:
+    """
+    Hold a Redis lock for one task run so overlapping triggers skip instead of stacking.
+    
+    Yields:
+        True if this run holds the lock, False if another run already does
+    """
+    lock = db_manager.ensure_redis().lock(f"task:lock:{name}", timeout=timeout)
+    acquired = lock.acquire(blocking=False)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except LockError:
+                # Expired while running; another run may already hold it
+                pass
+
+
+def _start_sharded_scan(
+    db: Session,
+    job: MonitoringJob,
+    policy_id: str = None,
+    scan_key: str = "full_scan",
+    rule_ids: List[str] = None
+) -> Dict[str, Any]:
+    """
+    Split the records into primary-key shards and scan them on any worker.
+    
+    Shard tasks run as a Celery chord; finalize_sharded_scan_task aggregates
+    their results into the job once every shard has finished.
+    """
+    shards = ViolationScanner(db).shard_ranges(settings.scan_max_shards, settings.scan_shard_size)
+    
+    if not shards:
+        DeltaMonitor(db).complete_backfill(job.result.get("backfill"))
+        job.status = JobStatus.COMPLETED
+        job.completed_at = datetime.utcnow()
+        job.result = {
+            "message": "No records to scan",
+            "violations_found": 0,
+            "records_scanned": 0,
+            **job.result
+        }
+        db.commit()
+        return job.result
+    
+    job.result = {**job.result, "shards": len(shards)}
+    db.commit()
+    
+    job_id = str(job.id)
+    chord(
+        scan_shard_task.s(
+            job_id,
+            index,
+            str(first_id),
+            str(last_id),
+            policy_id=policy_id,
+            scan_key=scan_key,
+            rule_ids=rule_ids
+        )
+        for index, (first_id, last_id, _) in enumerate(shards)
+    )(
+        finalize_sharded_scan_task.s(job_id).on_error(sharded_scan_failed_task.s(job_id))
+    )
+    
+    logger.info(
+        "sharded_scan_dispatched",
+        job_id=job_id,
+        shards=len(shards),
+        records=sum(count for _, _, count in shards)
+    )
+    
+    return job.result
+
 
 @celery_app.task(name="src.workers.tasks.continuous_monitoring_task", bind=True)
 def continuous_monitoring_task(self) -> Dict[str, Any]:
     """
     Continuous monitoring task that scans for violations.
-    Runs every 5 minutes via Celery Beat.
+    Runs every 5 minutes via Celery Beat and fans the scan out to shard tasks.
     """
     task_id = self.request.id
     logger.info("continuous_monitoring_started", task_id=task_id)
@@ -27,10 +123,21 @@ def continuous_monitoring_task(self) -> Dict[str, Any]:
     job = None
     
     try:
+        # Skip while the previous run's shards are still scanning
+        running = db.query(MonitoringJob).filter(
+            MonitoringJob.job_type == "continuous_monitoring",
+            MonitoringJob.status == JobStatus.RUNNING,
+            MonitoringJob.started_at >= datetime.utcnow() - timedelta(seconds=celery_app.conf.task_time_limit)
+        ).first()
+        
+        if running:
+            logger.info("continuous_monitoring_skipped", task_id=task_id, running_job_id=str(running.id))
+            return {"task_id": task_id, "message": "Previous scan still running", "job_id": str(running.id)}
+        
         # Create monitoring job record
         job = MonitoringJob(
             job_type="continuous_monitoring",
-            status="running",
+            status=JobStatus.RUNNING,
             started_at=datetime.utcnow(),
             result={"task_id": task_id}
         )
@@ -44,7 +151,7 @@ def continuous_monitoring_task(self) -> Dict[str, Any]:
         
         if active_rules == 0:
             logger.info("no_active_rules", task_id=task_id)
-            job.status = "completed"
+            job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
             job.result = {
                 "task_id": task_id,
@@ -54,36 +161,78 @@ def continuous_monitoring_task(self) -> Dict[str, Any]:
             db.commit()
             return job.result
         
-        # Run violation detection
-        detector = ViolationDetector(db)
-        result = detector.scan_all_records()
+        # Unchanged rules only see records updated since their watermark;
+        # new or edited rules are backfilled over every record
+        monitor = DeltaMonitor(db)
+        plan = monitor.plan(
+            db.query(ComplianceRule).filter(ComplianceRule.is_active == True).all()
+        )
+        
+        delta = {"rules": len(plan.delta_rules), "records_scanned": 0, "violations_found": 0}
+        if plan.delta_rules:
+            result = ViolationScanner(db).scan(
+                scan_key="continuous_monitoring:delta",
+                resume=False,
+                rule_ids=[str(rule.id) for rule in plan.delta_rules],
+                updated_after=plan.updated_after,
+                updated_through=plan.records_through
+            )
+            monitor.advance(
+                {str(rule.id): rule.updated_at for rule in plan.delta_rules},
+                plan.records_through
+            )
+            delta.update(
+                records_scanned=result.get("records_scanned", 0),
+                violations_found=result.get("violations_created", 0),
+                updated_after=plan.updated_after.isoformat()
+            )
+        
+        job.result = {"task_id": task_id, "delta": delta}
+        
+        if not plan.backfill_rules:
+            job.status = JobStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            job.result = {
+                **job.result,
+                "violations_found": delta["violations_found"],
+                "records_scanned": delta["records_scanned"],
+                "rules_evaluated": len(plan.delta_rules),
+                "scan_duration_seconds": (job.completed_at - job.started_at).total_seconds()
+            }
+            db.commit()
+            
+            if delta["violations_found"]:
+                enrich_violations_task.delay()
+            
+            logger.info(
+                "continuous_monitoring_completed",
+                task_id=task_id,
+                violations_found=delta["violations_found"],
+                records_scanned=delta["records_scanned"]
+            )
+            return {"job_id": str(job.id), **job.result}
         
-        # Update job with results
-        job.status = "completed"
-        job.completed_at = datetime.utcnow()
         job.result = {
-            "task_id": task_id,
-            "violations_found": result.get("violations_created", 0),
-            "records_scanned": result.get("records_scanned", 0),
-            "rules_evaluated": result.get("rules_evaluated", 0),
-            "scan_duration_seconds": (datetime.utcnow() - job.started_at).total_seconds()
+            **job.result,
+            "backfill": DeltaMonitor.backfill_state(plan.backfill_rules, plan.records_through)
         }
         db.commit()
         
-        logger.info(
-            "continuous_monitoring_completed",
-            task_id=task_id,
-            violations_found=result.get("violations_created", 0),
-            records_scanned=result.get("records_scanned", 0)
-        )
-        
-        return job.result
+        return {
+            "job_id": str(job.id),
+            **_start_sharded_scan(
+                db,
+                job,
+                scan_key="continuous_monitoring:backfill",
+                rule_ids=[str(rule.id) for rule in plan.backfill_rules]
+            )
+        }
         
     except Exception as e:
         logger.error("continuous_monitoring_failed", task_id=task_id, error=str(e))
         
         if job:
-            job.status = "failed"
+            job.status = JobStatus.FAILED
             job.completed_at = datetime.utcnow()
             job.error_message = str(e)
             db.commit()
@@ -98,7 +247,7 @@ def continuous_monitoring_task(self) -> Dict[str, Any]:
 def scan_violations_task(self, policy_id: str = None) -> Dict[str, Any]:
     """
     Manual scan task triggered by user.
-    Can scan all policies or a specific policy.
+    Can scan all policies or a specific policy; the scan is fanned out to shard tasks.
     """
     task_id = self.request.id
     logger.info("scan_violations_started", task_id=task_id, policy_id=policy_id)
@@ -110,57 +259,328 @@ def scan_violations_task(self, policy_id: str = None) -> Dict[str, Any]:
         # Create monitoring job record
         job = MonitoringJob(
             job_type="manual_scan",
-            status="running",
+            status=JobStatus.RUNNING,
             started_at=datetime.utcnow(),
             result={"task_id": task_id, "policy_id": policy_id}
         )
         db.add(job)
         db.commit()
         
-        # Run violation detection
-        detector = ViolationDetector(db)
+        scan_key = f"policy:{policy_id}" if policy_id else "full_scan"
+        return {"job_id": str(job.id), **_start_sharded_scan(db, job, policy_id=policy_id, scan_key=scan_key)}
         
-        if policy_id:
-            result = detector.scan_by_policy(policy_id)
-        else:
-            result = detector.scan_all_records()
+    except Exception as e:
+        logger.error("scan_violations_failed", task_id=task_id, error=str(e))
         
-        # Update job with results
-        job.status = "completed"
-        job.completed_at = datetime.utcnow()
-        job.result = {
-            "task_id": task_id,
-            "policy_id": policy_id,
-            "violations_found": result.get("violations_created", 0),
+        if job:
+            job.status = JobStatus.FAILED
+            job.completed_at = datetime.utcnow()
+            job.error_message = str(e)
+            db.commit()
+        
+        raise
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    name="src.workers.tasks.scan_shard_task",
+    bind=True,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    max_retries=5,
+    acks_late=True
+)
+def scan_shard_task(
+    self,
+    job_id: str,
+    shard_index: int,
+    first_id: str,
+    last_id: str,
+    policy_id: str = None,
+    scan_key: str = "full_scan",
+    rule_ids: List[str] = None
+) -> Dict[str, Any]:
+    """
+    Scan one primary-key range of company records.
+    Database errors are retried with backoff, and the message is acknowledged
+    only once the shard finishes so a lost worker's shard is redelivered.
+    Retries and redeliveries keep the job_id, and with it the per-shard
+    checkpoint key, so they resume after the last committed chunk.
+    """
+    task_id = self.request.id
+    logger.info("scan_shard_started", task_id=task_id, job_id=job_id, shard=shard_index)
+    
+    db = next(get_db_session())
+    
+    try:
+        started_at = datetime.utcnow()
+        result = ViolationScanner(db).scan(
+            policy_id=policy_id,
+            scan_key=f"{scan_key}:job:{job_id}:shard:{shard_index}",
+            id_range=(first_id, last_id),
+            rule_ids=rule_ids
+        )
+        
+        logger.info(
+            "scan_shard_completed",
+            task_id=task_id,
+            job_id=job_id,
+            shard=shard_index,
+            records_scanned=result.get("records_scanned", 0),
+            violations_found=result.get("violations_created", 0)
+        )
+        
+        return {
+            "shard": shard_index,
             "records_scanned": result.get("records_scanned", 0),
+            "violations_found": result.get("violations_created", 0),
             "rules_evaluated": result.get("rules_evaluated", 0),
-            "scan_duration_seconds": (datetime.utcnow() - job.started_at).total_seconds()
+            "duration_seconds": (datetime.utcnow() - started_at).total_seconds()
+        }
+        
+    except Exception as e:
+        logger.error("scan_shard_failed", task_id=task_id, job_id=job_id, shard=shard_index, error=str(e))
+        raise
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(name="src.workers.tasks.finalize_sharded_scan_task")
+def finalize_sharded_scan_task(shard_results: List[Dict[str, Any]], job_id: str) -> Dict[str, Any]:
+    """
+    Aggregate shard results into the monitoring job (chord callback).
+    """
+    db = next(get_db_session())
+    
+    try:
+        job = db.query(MonitoringJob).filter(MonitoringJob.id == job_id).first()
+        if not job:
+            raise ValueError(f"Monitoring job {job_id} not found")
+        
+        # Backfilled rules only start delta scans once every shard succeeded
+        DeltaMonitor(db).complete_backfill((job.result or {}).get("backfill"))
+        
+        delta = (job.result or {}).get("delta") or {}
+        violations_found = sum(shard["violations_found"] for shard in shard_results) + delta.get("violations_found", 0)
+        durations = [shard["duration_seconds"] for shard in shard_results]
+        
+        job.status = JobStatus.COMPLETED
+        job.completed_at = datetime.utcnow()
+        job.result = {
+            **(job.result or {}),
+            "violations_found": violations_found,
+            "records_scanned": sum(shard["records_scanned"] for shard in shard_results) + delta.get("records_scanned", 0),
+            "rules_evaluated": max((shard["rules_evaluated"] for shard in shard_results), default=0),
+            "shards": len(shard_results),
+            "slowest_shard_seconds": max(durations, default=0),
+            "scan_duration_seconds": (job.completed_at - job.started_at).total_seconds()
         }
         db.commit()
         
+        if violations_found:
+            enrich_violations_task.delay()
+        
         logger.info(
-            "scan_violations_completed",
-            task_id=task_id,
-            violations_found=result.get("violations_created", 0)
+            "sharded_scan_completed",
+            job_id=job_id,
+            shards=len(shard_results),
+            violations_found=violations_found,
+            records_scanned=job.result["records_scanned"]
         )
         
         return job.result
         
-    except Exception as e:
-        logger.error("scan_violations_failed", task_id=task_id, error=str(e))
-        
-        if job:
-            job.status = "failed"
+    finally:
+        db.close()
+
+
+@celery_app.task(name="src.workers.tasks.sharded_scan_failed_task")
+def sharded_scan_failed_task(request, exc, traceback, job_id: str) -> None:
+    """
+    Mark a sharded scan's job as failed when a shard raises (chord errback).
+    """
+    db = next(get_db_session())
+    
+    try:
+        job = db.query(MonitoringJob).filter(MonitoringJob.id == job_id).first()
+        if job and job.status == JobStatus.RUNNING:
+            job.status = JobStatus.FAILED
             job.completed_at = datetime.utcnow()
-            job.error_message = str(e)
+            job.error_message = str(exc)
             db.commit()
         
+        logger.error("sharded_scan_failed", job_id=job_id, error=str(exc))
+        
+    finally:
+        db.close()
+
+
+@celery_app.task(name="src.workers.tasks.enrich_violations_task", bind=True)
+def enrich_violations_task(self, batch_size: int = None) -> Dict[str, Any]:
+    """
+    Generate justification, remediation and reasoning for detected violations.
+    Processes one batch with bounded concurrency and re-queues itself while
+    a backlog remains. Also runs every minute via Celery Beat.
+    
+    Runs are single-flight: beat, scan finalizers and the re-queue all
+    trigger this task, and a trigger that finds another run in progress
+    skips, so LLM concurrency stays at ENRICHMENT_CONCURRENCY.
+    """
+    task_id = self.request.id
+    
+    with _single_flight("enrich_violations") as acquired:
+        if not acquired:
+            logger.info("enrich_violations_skipped", task_id=task_id, reason="already_running")
+            return {"task_id": task_id, "skipped": True}
+        
+        logger.info("enrich_violations_started", task_id=task_id)
+        db = next(get_db_session())
+        
+        try:
+            enricher = ViolationEnricher(db)
+            result = enricher.enrich_batch(batch_size)
+            remaining = enricher.pending_count()
+            
+        except Exception as e:
+            logger.error("enrich_violations_failed", task_id=task_id, error=str(e))
+            raise
+        
+        finally:
+            db.close()
+    
+    # Keep draining the backlog in a fresh task once the lock is released
+    if result["claimed"] and remaining:
+        enrich_violations_task.delay(batch_size)
+    
+    logger.info(
+        "enrich_violations_completed",
+        task_id=task_id,
+        enriched=result["enriched"],
+        failed=result["failed"],
+        remaining=remaining
+    )
+    
+    return {"task_id": task_id, "remaining": remaining, **result}
+
+
+@celery_app.task(name="src.workers.tasks.rescore_violations_task", bind=True)
+def rescore_violations_task(self, chunk_size: int = 5000) -> Dict[str, Any]:
+    """
+    Recompute risk scores for every stored violation.
+    Run after changing risk weights or thresholds.
+    """
+    task_id = self.request.id
+    logger.info("rescore_violations_started", task_id=task_id)
+    
+    db = next(get_db_session())
+    
+    try:
+        rescored = RiskScoringEngine().rescore_all(db, chunk_size=chunk_size)
+        
+        logger.info("rescore_violations_completed", task_id=task_id, rescored=rescored)
+        
+        return {"task_id": task_id, "rescored": rescored}
+        
+    except Exception as e:
+        db.rollback()
+        logger.error("rescore_violations_failed", task_id=task_id, error=str(e))
+        raise
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(name="src.workers.tasks.train_predictor_task", bind=True)
+def train_predictor_task(self, policy_id: str = None) -> Dict[str, Any]:
+    """
+    Train the violation predictor on all company records and publish it.
+    Workers pick up the new model version on their next registry poll.
+    """
+    task_id = self.request.id
+    logger.info("train_predictor_started", task_id=task_id, policy_id=policy_id)
+    
+    db = next(get_db_session())
+    
+    try:
+        result = train_predictor(db, policy_id)
+        
+        if not result["success"]:
+            logger.warning("train_predictor_skipped", task_id=task_id, message=result["message"])
+        else:
+            logger.info("train_predictor_completed", task_id=task_id, model_version=result["model_version"])
+        
+        return {"task_id": task_id, **result}
+        
+    except Exception as e:
+        db.rollback()
+        logger.error("train_predictor_failed", task_id=task_id, error=str(e))
+        raise
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(name="src.workers.tasks.predict_records_task", bind=True)
+def predict_records_task(self, policy_id: str = None, chunk_size: int = 5000) -> Dict[str, Any]:
+    """
+    Score every company record with the violation predictor.
+    Stores batch predictions for the high-risk records view.
+    """
+    task_id = self.request.id
+    logger.info("predict_records_started", task_id=task_id, policy_id=policy_id)
+    
+    db = next(get_db_session())
+    
+    try:
+        result = score_company_records(db, policy_id=policy_id, chunk_size=chunk_size)
+        
+        logger.info("predict_records_completed", task_id=task_id, **result)
+        
+        return {"task_id": task_id, **result}
+        
+    except Exception as e:
+        db.rollback()
+        logger.error("predict_records_failed", task_id=task_id, error=str(e))
         raise
     
     finally:
         db.close()
 
 
+@celery_app.task(name="src.workers.tasks.refresh_dashboard_metrics_task")
+def refresh_dashboard_metrics_task() -> Dict[str, Any]:
+    """
+    Refresh the violation metrics rollup read by the dashboard.
+    Runs every 5 minutes; skipped while a previous refresh is still running.
+    """
+    with _single_flight("refresh_dashboard_metrics") as acquired:
+        if not acquired:
+            logger.info("refresh_dashboard_metrics_skipped", reason="already_running")
+            return {"refreshed": False, "skipped": True}
+        
+        db = next(get_db_session())
+        
+        try:
+            refreshed = DashboardMetrics(db).refresh()
+            
+            if not refreshed:
+                logger.warning("dashboard_metrics_view_missing")
+            
+            return {"refreshed": refreshed}
+            
+        except Exception as e:
+            db.rollback()
+            logger.error("refresh_dashboard_metrics_failed", error=str(e))
+            raise
+        
+        finally:
+            db.close()
+
+
 @celery_app.task(name="src.workers.tasks.cleanup_old_jobs_task")
 def cleanup_old_jobs_task() -> Dict[str, Any]:
     """
@@ -178,12 +598,23 @@ def cleanup_old_jobs_task() -> Dict[str, Any]:
             MonitoringJob.started_at < cutoff_date
         ).delete()
         
+        # Shard checkpoints are per job, so they are only useful while it runs
+        deleted_checkpoints = db.query(ScanCheckpoint).filter(
+            ScanCheckpoint.scan_key.like("%:job:%"),
+            ScanCheckpoint.updated_at < cutoff_date
+        ).delete(synchronize_session=False)
+        
         db.commit()
         
-        logger.info("cleanup_old_jobs_completed", deleted_count=deleted_count)
+        logger.info(
+            "cleanup_old_jobs_completed",
+            deleted_count=deleted_count,
+            deleted_checkpoints=deleted_checkpoints
+        )
         
         return {
             "deleted_count": deleted_count,
+            "deleted_checkpoints": deleted_checkpoints,
             "cutoff_date": cutoff_date.isoformat()
         }
         
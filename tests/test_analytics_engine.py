@@ -0,0 +1,29 @@
+"""Tests for correction analytics helpers."""
+
+from datetime import datetime
+
+from src.services.analytics_engine import AnalyticsEngine
+
+
+def test_period_labels_match_granularity():
+    period = datetime(2024, 5, 6)
+
+    assert AnalyticsEngine._period_label(period, "day") == "2024-05-06"
+    assert AnalyticsEngine._period_label(period, "week") == "2024-W19"
+    assert AnalyticsEngine._period_label(period, "month") == "2024-05"
+
+
+def test_trend_compares_older_and_recent_accuracy():
+    assert AnalyticsEngine._classify_trend(40.0, 60.0, 20) == "improving"
+    assert AnalyticsEngine._classify_trend(60.0, 40.0, 20) == "declining"
+    assert AnalyticsEngine._classify_trend(50.0, 55.0, 20) == "stable"
+    assert AnalyticsEngine._classify_trend(0.0, 100.0, 9) == "insufficient_data"
+
+
+def test_trend_reads_precomputed_rule_state():
+    state = {"ewma_accuracy": 85.0, "accuracy_90d": 60.0, "reviews_90d": 40}
+
+    assert AnalyticsEngine._trend_from_state(state) == "improving"
+    assert AnalyticsEngine._trend_from_state({**state, "ewma_accuracy": 45.0}) == "declining"
+    assert AnalyticsEngine._trend_from_state({**state, "accuracy_90d": None, "reviews_90d": 0}) == "insufficient_data"
+    assert AnalyticsEngine._trend_from_state(None) == "insufficient_data"
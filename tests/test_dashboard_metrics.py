@@ -0,0 +1,34 @@
+"""Tests for dashboard metric rollups."""
+
+from src.services.dashboard_metrics import DashboardMetrics
+
+
+class StubMetrics(DashboardMetrics):
+    def __init__(self, rows):
+        self.rows = rows
+
+    def totals(self):
+        return self.rows
+
+
+def test_summary_splits_active_and_resolved_violations():
+    metrics = StubMetrics([
+        {"status": "pending_review", "severity": "critical", "risk_level": "critical", "violation_count": 3},
+        {"status": "confirmed", "severity": "high", "risk_level": "unscored", "violation_count": 2},
+        {"status": "resolved", "severity": "critical", "risk_level": "high", "violation_count": 4},
+        {"status": "dismissed", "severity": "low", "risk_level": "low", "violation_count": 1},
+    ])
+
+    summary = metrics.summary()
+
+    assert summary["total"] == 10
+    assert summary["active"] == 6
+    assert summary["by_severity"] == {"critical": 7, "high": 2, "medium": 0, "low": 1}
+    assert summary["active_by_severity"] == {"critical": 3, "high": 2, "medium": 0, "low": 1}
+    assert summary["by_risk_level"] == {"low": 1, "medium": 0, "high": 4, "critical": 3}
+
+
+def test_compliance_score_scale():
+    assert DashboardMetrics.compliance_score({"critical": 0, "high": 0, "medium": 0, "low": 0}) == 100
+    assert DashboardMetrics.compliance_score({"critical": 2, "high": 3, "medium": 4, "low": 1}) == 79
+    assert DashboardMetrics.compliance_score({"critical": 30, "high": 0, "medium": 0, "low": 0}) == 25
@@ -0,0 +1,55 @@
+"""Tests for the IBM AML bulk ingestion transforms."""
+
+import io
+import json
+
+import pandas as pd
+
+from src.datasets.ibm_aml_loader import IBMAMLLoader
+
+CSV = """Timestamp,From Bank,Account,To Bank,Account,Amount Received,Receiving Currency,Amount Paid,Payment Currency,Payment Format,Is Laundering
+2022/09/01 00:20,010,8000EBD30,010,8000EBD30,3697.34,US Dollar,3697.34,US Dollar,Reinvestment,0
+2022-09-01 00:21:15,03208,8000F4580,001,8000F5340,"1,000.50",Euro,0.01,US Dollar,Cheque,1
+2022-09-01 00:22,011,800\tA,012,800\\B,12.5,US Dollar,12.5,US Dollar,Cash,0
+"""
+
+
+def test_transform_frame_matches_transform_row():
+    loader = IBMAMLLoader(dataset_path=None)
+    chunk = pd.read_csv(io.StringIO(CSV), header=0, names=list(IBMAMLLoader.FIELD_MAPPING), dtype=str, keep_default_na=False)
+
+    frame = loader._transform_frame(chunk)
+
+    for (_, row), (_, staged) in zip(chunk.iterrows(), frame.iterrows()):
+        record = loader._transform_row(row.to_dict())
+        assert staged["transaction_id"] == record.transaction_id
+        assert staged["timestamp"] == record.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        assert staged["amount"] == record.amount
+        assert staged["transaction_type"] == record.transaction_type
+        assert json.loads(staged["data"]) == record.data
+
+
+def test_copy_text_escapes_special_characters():
+    frame = pd.DataFrame({"account": ["800\tA", "800\\B", "plain"], "amount": [1.5, 2.0, 3.25]})
+
+    assert IBMAMLLoader._copy_text(frame) == "800\\tA\t1.5\n800\\\\B\t2.0\nplain\t3.25\n"
+
+
+def test_parallel_byte_ranges_match_sequential_chunks(tmp_path):
+    path = tmp_path / "trans.csv"
+    header, *rows = CSV.splitlines(keepends=True)
+    path.write_text(header + "".join(rows * 40))
+    loader = IBMAMLLoader(dataset_path=str(path))
+    loader.BULK_CHUNK_BYTES = 500
+
+    ranges = IBMAMLLoader.byte_ranges(path, loader.BULK_CHUNK_BYTES)
+    content = path.read_bytes()
+    assert ranges[0][0] == len(header.encode()) and ranges[-1][1] == len(content)
+    assert all(content[end - 1:end] == b"\n" for _, end in ranges)
+
+    sequential = list(loader._staged_chunks(50, True, False))
+    parallel = list(loader._staged_ranges(2, True, False))
+
+    assert len(parallel) == len(ranges) > 1
+    assert sum(read for read, _, _ in parallel) == sum(read for read, _, _ in sequential) == 120
+    assert "".join(text for _, _, text in parallel) == "".join(text for _, _, text in sequential)
@@ -0,0 +1,114 @@
+"""Tests for the LLM batch executor."""
+
+import src.services.llm.factory as factory
+from src.config.settings import settings
+from src.services.llm.base import LLMClient, LLMResponse, LLMMetrics
+from src.services.llm.batch import BatchRequest, LLMBatchExecutor
+from src.services.llm.cache import CachedLLMClient, LLMResponseCache
+from src.services.llm.router import LLMRouter
+
+
+class FakeClient(LLMClient):
+    """Client that fails for prompts listed in fail_on."""
+
+    def __init__(self, provider, fail_on=()):
+        self.provider = provider
+        self.fail_on = set(fail_on)
+        self.calls = []
+
+    async def complete(self, prompt, system_message=None, temperature=0.7, max_tokens=1000):
+        self.calls.append(prompt)
+        if prompt in self.fail_on:
+            raise RuntimeError(f"{self.provider} failed")
+        return LLMResponse(f"{self.provider}:{prompt}", 10, 1.0, self.provider, "fake", 0.0)
+
+    def get_metrics(self):
+        return LLMMetrics(self.provider, len(self.calls), 0, 0.0, 0.0, 0)
+
+    def reset_metrics(self):
+        self.calls = []
+
+
+def make_executor(primary, fallback):
+    limits = {name: {"rpm": 10000, "tpm": 10000000} for name in ("openai", "gemini")}
+    return LLMBatchExecutor(
+        LLMRouter(primary, fallback),
+        concurrency=4,
+        max_retries=1,
+        base_delay=0.001,
+        limits=limits
+    )
+
+
+def test_results_in_order_with_per_item_fallback():
+    """Test failing items retry, then fall back without affecting the rest."""
+    primary = FakeClient("openai", fail_on={"p1"})
+    fallback = FakeClient("gemini")
+    executor = make_executor(primary, fallback)
+
+    results = executor.run_sync([BatchRequest(prompt=f"p{i}") for i in range(5)])
+
+    assert [r.index for r in results] == list(range(5))
+    assert [r.content for r in results] == ["openai:p0", "gemini:p1", "openai:p2", "openai:p3", "openai:p4"]
+    assert results[1].attempts == 3
+    assert primary.calls.count("p1") == 2
+
+
+def test_failed_item_reports_error():
+    """Test an item failing on every provider returns an error instead of raising."""
+    executor = make_executor(FakeClient("openai", fail_on={"bad"}), FakeClient("gemini", fail_on={"bad"}))
+
+    good, bad = executor.run_sync([BatchRequest(prompt="good"), BatchRequest(prompt="bad")])
+
+    assert good.ok and not bad.ok
+    assert "gemini failed" in bad.error
+
+
+def test_openai_only_router_has_no_separate_fallback(monkeypatch):
+    """Test the factory's default config retries OpenAI once per item, not again as a fallback."""
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "google_api_key", None)
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    monkeypatch.setattr(factory, "get_llm_cache", lambda: LLMResponseCache())
+
+    executor = factory.create_llm_batch_executor()
+
+    assert isinstance(executor.router.primary, CachedLLMClient)
+    assert executor.router.fallback is executor.router.primary
+    assert executor._clients() == [executor.router.primary]
+
+
+def test_same_client_behind_two_cache_wrappers_is_tried_once():
+    """Test separately wrapped copies of one provider are not treated as a fallback."""
+    client = FakeClient("openai", fail_on={"bad"})
+    executor = make_executor(
+        CachedLLMClient(client, LLMResponseCache()),
+        CachedLLMClient(client, LLMResponseCache())
+    )
+
+    [result] = executor.run_sync([BatchRequest(prompt="bad")])
+
+    assert not result.ok
+    assert result.attempts == 2
+    assert client.calls == ["bad", "bad"]
+
+
+def test_cached_response_does_not_spend_rate_limits(tmp_path):
+    """Test a cache hit is served without taking a request slot or tokens."""
+    client = FakeClient("openai")
+    cached = CachedLLMClient(client, LLMResponseCache(disk_dir=str(tmp_path)))
+    executor = make_executor(cached, cached)
+    request = BatchRequest(prompt="p0")
+
+    executor.run_sync([request])
+    limiter = executor._limiter("openai")
+    requests_before, tokens_before = limiter.requests.tokens, limiter.tokens.tokens
+
+    [result] = executor.run_sync([request])
+
+    assert result.content == "openai:p0"
+    assert result.attempts == 0
+    assert client.calls == ["p0"]
+    # Buckets only refill between the two reads, so nothing was taken
+    assert limiter.requests.tokens >= requests_before
+    assert limiter.tokens.tokens >= tokens_before
@@ -0,0 +1,41 @@
+"""Tests for LLM response cache keys."""
+
+from src.services.llm.cache import LLMResponseCache
+from src.services.reasoning_trace import ReasoningTraceGenerator
+from src.services.rule_extractor import RuleExtractor
+
+
+def request_key(request):
+    return LLMResponseCache.make_key(
+        "gpt-4",
+        request.system_message,
+        request.prompt,
+        request.temperature,
+        max_tokens=request.max_tokens
+    )
+
+
+def test_records_differing_only_in_identifiers_share_an_entry():
+    extractor = RuleExtractor.__new__(RuleExtractor)
+    generator = ReasoningTraceGenerator.__new__(ReasoningTraceGenerator)
+    details = {
+        "expected": {"field": "amount", "operator": "greater_than", "value": 10000},
+        "actual": {"field": "amount", "value": 15750.0},
+    }
+    first = {"id": "rec-1", "transaction_id": "TXN1", "amount": 15750.0, "timestamp": "2022-09-01 00:20"}
+    second = {"id": "rec-2", "transaction_id": "TXN2", "amount": 15750.0, "timestamp": "2022-09-03 11:05"}
+
+    builders = [
+        lambda record: extractor.build_justification_request("Large transactions", record, details),
+        lambda record: extractor.build_remediation_request(
+            "Large transactions", "Amount exceeds the limit", record, "high", violation_details=details
+        ),
+        lambda record: generator.build_trace_request("Large transactions", "high", record, details),
+    ]
+
+    for build in builders:
+        assert request_key(build(first)) == request_key(build(second))
+        assert "rec-1" not in build(first).prompt
+
+    other_amount = {**second, "amount": 20000.0}
+    assert request_key(builders[0](first)) != request_key(builders[0](other_amount))
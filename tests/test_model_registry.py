@@ -0,0 +1,38 @@
+"""Tests for the versioned model registry."""
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.services.model_registry import ModelRegistry
+from src.services.predictive_analytics import MODEL_NAME, ViolationPredictor
+
+
+def test_published_predictor_reloads_with_same_predictions(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 100000, size=(60, 3))
+    y = (X[:, 0] > 50000).astype(int)
+
+    predictor = ViolationPredictor()
+    predictor.scaler = StandardScaler().fit(X)
+    predictor.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(predictor.scaler.transform(X), y)
+    predictor.feature_names = ["a", "b", "c"]
+    predictor.training_metadata = {"training_samples": len(X)}
+    predictor.is_trained = True
+
+    first = predictor.publish(registry)
+    second = predictor.publish(registry)
+    assert registry.latest_version(MODEL_NAME) == second
+
+    loaded = ViolationPredictor.from_registry(registry)
+    assert loaded.model_version == second
+    assert loaded.feature_names == ["a", "b", "c"]
+    assert loaded.training_metadata["training_samples"] == 60
+    np.testing.assert_array_equal(
+        loaded.model.predict_proba(loaded.scaler.transform(X)),
+        predictor.model.predict_proba(predictor.scaler.transform(X))
+    )
+
+    registry.activate(MODEL_NAME, first)
+    assert [version["active"] for version in registry.list_versions(MODEL_NAME)] == [False, True]
@@ -0,0 +1,29 @@
+"""Tests for page-aligned policy chunking."""
+
+from src.services.policy_chunker import PolicyChunker
+
+
+def test_chunks_follow_page_markers():
+    text = "\n\n".join(f"[Page {n}]\n" + ("Policy text. " * 40) for n in range(1, 6))
+    chunks = PolicyChunker.chunk(text, max_chars=1200)
+    
+    assert [page for chunk in chunks for page in chunk.pages] == [1, 2, 3, 4, 5]
+    assert all(len(chunk.text) <= 1200 for chunk in chunks)
+    assert chunks[0].text.startswith("[Page 1]")
+    
+    rule = PolicyChunker.attach_page_number({"page_reference": "Page 99"}, chunks[-1])
+    assert rule["page_number"] == str(chunks[-1].pages[0])
+
+
+def test_deduplicate_keeps_higher_confidence():
+    condition = {"field": "amount", "operator": "greater_than", "value": 10000}
+    rules = [
+        {"description": "Transactions over $10,000 require review", "condition": condition, "confidence_score": 80},
+        {"description": "Transactions over $10,000 require review.", "condition": condition, "confidence_score": 95},
+        {"description": "Transactions over $10,000 require review", "condition": {**condition, "value": 5000}},
+    ]
+    
+    deduplicated = PolicyChunker.deduplicate(rules)
+    
+    assert len(deduplicated) == 2
+    assert deduplicated[0]["confidence_score"] == 95
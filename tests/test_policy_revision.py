@@ -0,0 +1,22 @@
+"""Tests for page diffing between policy revisions."""
+
+from src.services.policy_revision import PolicyRevisionService
+
+
+def test_diff_pages_matches_moved_pages_by_content():
+    old = {1: "a", 2: "b", 3: "c"}
+    new = {1: "a", 2: "x", 3: "b", 4: "c"}
+    
+    diff = PolicyRevisionService.diff_pages(old, new)
+    
+    assert diff.kept == {1: 1, 2: 3, 3: 4}
+    assert diff.changed == [2]
+    assert diff.removed == []
+
+
+def test_diff_pages_reports_edited_and_removed_pages():
+    diff = PolicyRevisionService.diff_pages({1: "a", 2: "b", 3: "c"}, {1: "a", 2: "B"})
+    
+    assert diff.kept == {1: 1}
+    assert diff.changed == [2]
+    assert diff.removed == [2, 3]
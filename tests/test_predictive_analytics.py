@@ -0,0 +1,140 @@
+"""Tests for ViolationPredictor training and batch prediction."""
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.models.correction import CorrectedDecision
+from src.services.predictive_analytics import FEATURE_NAMES, ViolationPredictor, save_predictions
+
+
+class PagedPredictor(ViolationPredictor):
+    """Predictor reading training pages from memory instead of the database."""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+
+    def _label_counts(self, db, policy_id=None):
+        positives = sum(
+            int(self._labels([data["id"] for data in records], violations).sum())
+            for records, violations in self.pages
+        )
+        return positives, sum(len(records) for records, _ in self.pages)
+
+    def _training_pages(self, db, policy_id, chunk_size):
+        return iter(self.pages)
+
+
+def test_train_model_labels_dismissed_violations_as_negative():
+    records = [{"id": f"rec-{n}", "amount": 1000 * n, "approver_1": "EMP1" if n % 2 else None} for n in range(40)]
+    violations = [(f"v-{n}", f"rec-{n}", None) for n in range(11)] + [
+        # Corrected but not dismissed: still a positive
+        ("v-11", "rec-11", CorrectedDecision.NEEDS_REVIEW),
+        # Dismissed on review, even though a later correction asked for review
+        ("v-12", "rec-12", CorrectedDecision.FALSE_POSITIVE),
+        ("v-12", "rec-12", CorrectedDecision.NEEDS_REVIEW),
+    ]
+    predictor = PagedPredictor([(records[:20], violations), (records[20:], [])])
+
+    result = predictor.train_model(db=None, chunk_size=20)
+
+    assert result["success"] is True
+    assert result["violations_count"] == 12
+    assert result["negative_samples"] == 28
+    assert result["training_samples"] == 40
+    assert predictor.model.class_weight == {0: 40 / (2 * 28), 1: 40 / (2 * 12)}
+    assert predictor.feature_names == list(FEATURE_NAMES)
+    assert predictor.training_metadata["feature_names"] == list(FEATURE_NAMES)
+    assert predictor.is_trained
+
+
+def test_train_model_requires_enough_violations():
+    records = [{"id": f"rec-{n}"} for n in range(20)]
+    violations = [(f"v-{n}", f"rec-{n}", None) for n in range(9)]
+    predictor = PagedPredictor([(records, violations)])
+
+    result = predictor.train_model(db=None)
+
+    assert result["success"] is False
+    assert result["violations_count"] == 9
+    assert not predictor.is_trained
+
+
+def test_feature_matrix_has_fixed_schema():
+    predictor = ViolationPredictor()
+    records = [
+        {"approver_1": "EMP001", "initiator": "EMP001"},
+        {"customer_id": "CUST001", "amount": "2500.50", "approver_2": " ", "transaction_id": "TXN1"},
+        {"amount": None, "approver_1": "EMP002", "approver_2": "EMP003", "initiator": "EMP004"},
+    ]
+
+    X = predictor.feature_matrix(predictor.feature_frame(records))
+
+    assert X.dtype == np.float32
+    assert X.shape == (3, len(FEATURE_NAMES))
+    np.testing.assert_allclose(X, np.array([
+        [0, 0, 1, 0, 1, 0, 0, 1],
+        [2500.5, np.log1p(2500.5), 0, 0, 0, 1, 1, 0],
+        [0, 0, 1, 1, 2, 0, 0, 0],
+    ], dtype=np.float32), rtol=1e-6)
+    assert list(predictor.extract_features(records[1])) == list(FEATURE_NAMES)
+
+
+def test_predict_batch_matches_single_record_predictions():
+    rng = np.random.default_rng(1)
+    records = [
+        {
+            "amount": float(amount),
+            "approver_1": "EMP001" if i % 3 else None,
+            "approver_2": "EMP002" if i % 4 else "",
+            "initiator": "EMP001" if i % 5 == 0 else "EMP009",
+            "transaction_id": f"TXN{i}" if i % 7 else None,
+            "customer_id": "CUST001",
+        }
+        for i, amount in enumerate(rng.uniform(100, 80000, size=40))
+    ]
+    records.append({"approver_1": "EMP001"})
+
+    predictor = ViolationPredictor()
+    predictor.feature_names = list(FEATURE_NAMES)
+    features = predictor.feature_frame(records)
+    X = predictor.feature_matrix(features)
+    y = ((features["approval_count"] < 2) | (features["amount"] > 40000)).astype(int).to_numpy()
+    predictor.scaler = StandardScaler().fit(X)
+    predictor.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(predictor.scaler.transform(X), y)
+    predictor.is_trained = True
+
+    batch = predictor.predict_batch(records)
+    assert [prediction["prediction_method"] for prediction in batch] == ["ml_model"] * len(records)
+    assert batch == [predictor.predict_violation(record) for record in records]
+
+
+class RecordingSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, rows=None):
+        self.executed.append((statement, rows))
+
+
+def test_save_predictions_replaces_earlier_and_skips_unmatched_records():
+    prediction = {
+        "violation_probability": 0.9,
+        "confidence_score": 0.8,
+        "risk_level": "critical",
+        "risk_factors": [],
+        "recommendations": [],
+        "model_version": "1",
+    }
+    db = RecordingSession()
+
+    prediction_ids = save_predictions(db, ["rec-1", None, "rec-2"], [prediction] * 3)
+
+    assert prediction_ids[1] is None
+    (superseded, _), (_, rows) = db.executed
+    assert superseded.is_delete
+    [replaced_ids] = [value for value in superseded.compile().params.values() if isinstance(value, (list, set))]
+    assert sorted(replaced_ids) == ["rec-1", "rec-2"]
+    assert [row["record_id"] for row in rows] == ["rec-1", "rec-2"]
+    assert [row["id"] for row in rows] == [prediction_ids[0], prediction_ids[2]]
@@ -0,0 +1,91 @@
+"""Tests for the API response cache."""
+
+import asyncio
+from collections import defaultdict
+
+import src.services.response_cache as response_cache
+from src.services.response_cache import ResponseCache, cached_response
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands the cache uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = defaultdict(dict)
+        self.lists = defaultdict(list)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+
+    def hincrby(self, key, field, amount):
+        self.hashes[key][field] = int(self.hashes[key].get(field, 0)) + amount
+
+    def hgetall(self, key):
+        return {k: str(v) for k, v in self.hashes[key].items()}
+
+    def lpush(self, key, value):
+        self.lists[key].insert(0, str(value))
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists[key][start:end + 1]
+
+    def lrange(self, key, start, end):
+        return list(self.lists[key])
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.calls]
+
+
+def test_cached_endpoint_serves_hits_until_tag_is_invalidated(monkeypatch):
+    cache = ResponseCache(FakeRedis(), ttl_seconds=30)
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: cache)
+    calls = []
+
+    @cached_response("violations")
+    async def get_stats(days: int = 30, db=None):
+        calls.append(days)
+        return {"days": days, "calls": len(calls)}
+
+    assert asyncio.run(get_stats(days=7, db=object())) == {"days": 7, "calls": 1}
+    assert asyncio.run(get_stats(days=7, db=object())) == {"days": 7, "calls": 1}
+    assert asyncio.run(get_stats(days=14, db=object())) == {"days": 14, "calls": 2}
+
+    cache.invalidate("violations")
+    assert asyncio.run(get_stats(days=7, db=object())) == {"days": 7, "calls": 3}
+
+    metrics = cache.get_metrics()
+    route = metrics["routes"]["test_response_cache.get_stats"]
+    assert (metrics["hits"], metrics["misses"]) == (1, 3)
+    assert metrics["hit_rate"] == 0.25
+    assert route["p95_ms"] is not None
+    assert metrics["scope"] == "shared"
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(n) for n in range(1, 101)]
+
+    assert response_cache._percentile(samples, 95) == 95.0
+    assert response_cache._percentile(samples, 50) == 50.0
+    assert response_cache._percentile([], 95) is None
@@ -0,0 +1,51 @@
+"""Parity tests for the array risk scoring path."""
+
+import numpy as np
+
+from src.services.risk_scoring import RiskScoringEngine
+
+
+def test_score_arrays_matches_scalar_path():
+    engine = RiskScoringEngine()
+    records = [
+        {"amount": 0},
+        {"amount": 9999.99},
+        {"amount": 10000},
+        {"transaction_amount": "50000"},
+        {"amount": "n/a", "value": 100000},
+        {"value": 499999.5},
+        {"total": 500000},
+        {"amount": 2500000},
+        {"amount": None, "total": "75000"},
+        {"description": "no amount"},
+        {"amount": -500},
+    ]
+    severities = ["critical", "high", "medium", "low", "HIGH", "unknown"]
+    
+    rows = [
+        (record, severity, repeats, similar)
+        for record in records
+        for severity in severities
+        for repeats in (0, 1, 2, 3, 4, 5, 9)
+        for similar in (0, 1, 2, 5, 9, 10, 30)
+    ]
+    
+    scores, levels, factors = engine.score_arrays(
+        engine.amounts_from_records([row[0] for row in rows]),
+        np.array([row[1] for row in rows]),
+        np.array([row[2] for row in rows]),
+        np.array([row[3] for row in rows])
+    )
+    
+    for i, (record, severity, repeats, similar) in enumerate(rows):
+        expected_factors = {
+            "severity_weight": engine.SEVERITY_WEIGHTS.get(severity.lower(), 10),
+            "amount_factor": engine._calculate_amount_factor(record),
+            "frequency_factor": engine._frequency_points(repeats),
+            "historical_factor": engine._historical_points(similar),
+        }
+        expected_score = min(100, sum(expected_factors.values()))
+        
+        assert {name: int(values[i]) for name, values in factors.items()} == expected_factors
+        assert scores[i] == expected_score
+        assert levels[i] == engine.get_risk_level(expected_score)
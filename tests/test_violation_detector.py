@@ -0,0 +1,148 @@
+"""Tests for violation detection."""
+
+import pickle
+import uuid
+from datetime import datetime
+
+import pytest
+from src.models import CompanyRecord
+from src.services.violation_detector import ViolationDetector
+from src.services.rule_compiler import RuleCompiler
+from src.services.record_batch import RecordBatch, hot_keys_for, record_to_data
+
+
+def make_rule(field, operator, value=None, rule_id="rule-1", updated_at=None):
+    """Build a rule dict in the shape the scan route passes to the detector."""
+    return {
+        "id": rule_id,
+        "validation_logic": {
+            "condition": {"field": field, "operator": operator, "value": value}
+        },
+        "severity": "high",
+        "updated_at": updated_at
+    }
+
+
+EVALUATION_CASES = [
+    ("amount", "greater_than", 10000, {"amount": 15000}, True),
+    ("amount", "greater_than", 10000, {"amount": 500}, False),
+    ("amount", "greater_than", 10000, {"amount": "not a number"}, False),
+    ("amount", "less_than", "100", {"amount": "50"}, True),
+    ("transaction_type", "equals", "CASH_OUT", {"transaction_type": "CASH_OUT"}, True),
+    ("transaction_type", "not_equals", "CASH_OUT", {"transaction_type": "CASH_OUT"}, False),
+    ("payment_format", "contains", "WIRE", {"payment_format": "Wire transfer"}, True),
+    ("payment_format", "not_contains", "wire", {"payment_format": "Cheque"}, True),
+    ("to_account", "regex_match", r"^8\d+", {"to_account": "80012"}, True),
+    ("to_account", "regex_match", "[", {"to_account": "80012"}, False),
+    ("data.currency", "equals", "USD", {"data": {"currency": "USD"}}, True),
+    ("approver", "is_not_null", None, {}, True),
+    ("approver", "is_null", None, {}, False),
+    ("amount", "unknown_operator", 1, {"amount": 5}, False),
+]
+
+
+@pytest.mark.parametrize("field,operator,value,record,expected", EVALUATION_CASES)
+def test_evaluate_record(field, operator, value, record, expected):
+    """Test compiled conditions match the documented operator semantics."""
+    detector = ViolationDetector()
+    result = detector.evaluate_record(
+        {"id": "rec-1", **record},
+        make_rule(field, operator, value)
+    )
+    assert (result is not None) == expected
+
+
+def test_violation_details():
+    """Test violation details report the expected condition and actual value."""
+    detector = ViolationDetector()
+    rule = make_rule("amount", "greater_than", 10000)
+    result = detector.evaluate_record({"id": "rec-1", "amount": 20000}, rule)
+
+    assert result["rule_id"] == "rule-1"
+    assert result["record_identifier"] == "rec-1"
+    assert result["violation_details"]["expected"] == rule["validation_logic"]["condition"]
+    assert result["violation_details"]["actual"] == {"field": "amount", "value": 20000}
+
+
+def test_rule_without_condition():
+    """Test rules without a condition never produce violations."""
+    detector = ViolationDetector()
+    rule = {"id": "rule-1", "validation_logic": {}}
+    assert detector.evaluate_record({"id": "rec-1", "amount": 1}, rule) is None
+
+
+def test_compiled_rules_cached_by_version():
+    """Test compiled rules are reused until the rule's updated_at changes."""
+    compiler = RuleCompiler()
+    first = compiler.compile(make_rule("amount", "greater_than", 100, updated_at=datetime(2024, 1, 1)))
+    again = compiler.compile(make_rule("amount", "greater_than", 100, updated_at=datetime(2024, 1, 1)))
+    edited = compiler.compile(make_rule("amount", "greater_than", 500, updated_at=datetime(2024, 2, 1)))
+
+    assert first is again
+    assert edited is not first
+    assert edited.expected == 500.0
+
+
+def test_compiled_rule_is_picklable():
+    """Test compiled rules survive pickling for worker processes."""
+    compiled = RuleCompiler().compile(make_rule("to_account", "regex_match", r"^8\d+"))
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert restored.evaluate({"to_account": "8123"})
+
+
+@pytest.mark.parametrize("field,operator,value,record,expected", EVALUATION_CASES)
+def test_evaluate_batch_matches_scalar(field, operator, value, record, expected):
+    """Test columnar evaluation flags the same records as the scalar path."""
+    detector = ViolationDetector()
+    rule = detector.compile_rule(make_rule(field, operator, value))
+    rows = [{"id": "rec-0"}, {"id": "rec-1", **record}, {"id": "rec-2", "amount": None}]
+
+    batch = RecordBatch.from_dicts(rows, hot_keys_for([rule]))
+    hits = detector.evaluate_batch(batch, [rule])
+
+    scalar = [i for i, row in enumerate(rows) if detector.evaluate_record(row, rule)]
+    assert list(hits.get(rule.rule_id, [])) == scalar
+    assert (1 in scalar) == expected
+
+
+def test_batch_from_records_prefers_data_keys():
+    """Test JSONB data keys override first-class columns like record_to_data."""
+    records = [
+        CompanyRecord(id=uuid.uuid4(), amount=50.0, data={"payment_format": "Wire"}),
+        CompanyRecord(id=uuid.uuid4(), amount=50.0, data={"amount": 20000}),
+    ]
+    detector = ViolationDetector()
+    rules = [
+        detector.compile_rule(make_rule("amount", "greater_than", 10000, rule_id="amount")),
+        detector.compile_rule(make_rule("payment_format", "equals", "Wire", rule_id="format")),
+    ]
+
+    batch = RecordBatch.from_records(records, hot_keys_for(rules))
+    hits = detector.evaluate_batch(batch, rules)
+
+    assert list(hits["amount"]) == [1]
+    assert list(hits["format"]) == [0]
+    assert batch.record_data(1) == record_to_data(records[1])
+
+
+def test_evaluate_parallel_matches_in_process_batches():
+    """Test the process pool returns the same hits, in chunk order."""
+    detector = ViolationDetector()
+    rules = [
+        detector.compile_rule(make_rule("amount", "greater_than", 10000, rule_id="large")),
+        detector.compile_rule(make_rule("transaction_type", "equals", "CASH_OUT", rule_id="cash")),
+    ]
+    rows = [
+        {"id": f"rec-{i}", "amount": i * 1000, "transaction_type": "CASH_OUT" if i % 3 == 0 else "PAYMENT"}
+        for i in range(40)
+    ]
+    chunks = [rows[i:i + 7] for i in range(0, len(rows), 7)]
+
+    results = list(detector.evaluate_parallel(iter(chunks), rules, processes=2))
+
+    assert [chunk for chunk, _ in results] == chunks
+    for chunk, hits in results:
+        expected = detector.evaluate_batch(RecordBatch.from_dicts(chunk, hot_keys_for(rules)), rules)
+        assert hits.keys() == expected.keys()
+        for rule_id in expected:
+            assert list(hits[rule_id]) == list(expected[rule_id])
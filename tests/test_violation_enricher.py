@@ -0,0 +1,134 @@
+"""Tests for violation enrichment error handling."""
+
+from types import SimpleNamespace
+
+from src.models.violation import EnrichmentStatus
+from src.services.reasoning_trace import ReasoningTraceGenerator
+from src.services.violation_enricher import ViolationEnricher
+from src.services.violation_templates import MODE_LLM
+
+
+class FailingExtractor:
+    def generate_justification(self, *args, raise_errors=False, **kwargs):
+        if raise_errors:
+            raise RuntimeError("rate limited")
+        return "Violation detected: placeholder"
+
+
+def make_enricher(**attrs):
+    enricher = ViolationEnricher.__new__(ViolationEnricher)
+    enricher.executor = None
+    for name, value in attrs.items():
+        setattr(enricher, name, value)
+    return enricher
+
+
+ITEM = {
+    "violation_id": "v-1",
+    "rule_description": "Transactions over $10,000 must be flagged",
+    "severity": "critical",
+    "record_data": {"id": "rec-1", "amount": 15750.0},
+    "violation_details": {"field": "amount", "expected": {}},
+    "mode": MODE_LLM,
+}
+
+
+def test_sequential_llm_failure_is_reported_not_stored():
+    enricher = make_enricher(rule_extractor=FailingExtractor(), reasoning_generator=SimpleNamespace())
+
+    [(result, error)] = enricher.enrich_all([ITEM])
+
+    assert result is None
+    assert str(error) == "rate limited"
+
+
+def test_parse_trace_falls_back_on_wrong_shape():
+    generator = ReasoningTraceGenerator.__new__(ReasoningTraceGenerator)
+    details = {"field": "amount", "expected": {}}
+
+    for content in ('{"step": 1}', '"fine"', '["a", "b"]'):
+        trace = generator.parse_trace(content, "Rule", details)
+        assert trace == generator._create_fallback_trace("Rule", details)
+
+
+def test_batched_item_error_does_not_fail_batch():
+    class Extractor:
+        def build_justification_request(self, *args):
+            return "justify"
+
+        def parse_justification(self, content):
+            return content
+
+        def build_remediation_request(self, *args, **kwargs):
+            return "remediate"
+
+        def parse_remediation_steps(self, content):
+            if content == "boom":
+                raise RuntimeError("unexpected")
+            return [{"step": content}]
+
+    class Generator:
+        def build_trace_request(self, *args):
+            return "trace"
+
+        def parse_trace(self, content, *args):
+            return []
+
+    class Executor:
+        def __init__(self):
+            self.rounds = [
+                [SimpleNamespace(ok=True, content="j1"), SimpleNamespace(ok=True, content="[]")] * 2,
+                [SimpleNamespace(ok=True, content="boom"), SimpleNamespace(ok=True, content="fix")],
+            ]
+
+        def run_sync(self, requests):
+            return self.rounds.pop(0)
+
+    enricher = make_enricher(rule_extractor=Extractor(), reasoning_generator=Generator(), executor=Executor())
+
+    [(first, first_error), (second, second_error)] = enricher._enrich_batched([ITEM, {**ITEM, "violation_id": "v-2"}])
+
+    assert first is None and str(first_error) == "unexpected"
+    assert second_error is None and second["remediation_steps"] == [{"step": "fix"}]
+
+
+class ClaimSession:
+    """Session returning fixed rows from the claim query."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.commits = 0
+
+    def query(self, *entities):
+        return self
+
+    def join(self, *args):
+        return self
+
+    filter = order_by = limit = join
+
+    def with_for_update(self, **kwargs):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_stale_claim_out_of_attempts_is_failed_not_reclaimed():
+    violation = SimpleNamespace(
+        id="v-1",
+        enrichment_status=EnrichmentStatus.IN_PROGRESS.value,
+        enrichment_attempts=3,
+        enrichment_error=None
+    )
+    db = ClaimSession([(violation, SimpleNamespace())])
+    enricher = make_enricher(db=db, max_attempts=3)
+
+    assert enricher.claim_batch(10) == []
+    assert violation.enrichment_status == EnrichmentStatus.FAILED.value
+    assert violation.enrichment_attempts == 3
+    assert "did not finish" in violation.enrichment_error
+    assert db.commits == 1
@@ -0,0 +1,62 @@
+"""Tests for templated violation justifications."""
+
+from src.config.settings import settings
+from src.services.violation_detector import ViolationDetector
+from src.services.violation_templates import ViolationTemplates, MODE_LLM, MODE_TEMPLATE
+
+
+def test_select_mode(monkeypatch):
+    """Test templates cover simple rules at configured severities, with per-rule overrides."""
+    monkeypatch.setattr(settings, "justification_mode", "auto")
+    monkeypatch.setattr(settings, "template_severities", "low,medium,high")
+    simple = {"condition": {"field": "amount", "operator": "greater_than", "value": 10000}}
+    compound = {"condition": {**simple["condition"], "additional_conditions": [{"field": "x"}], "logic": "AND"}}
+
+    assert ViolationTemplates.select_mode(simple, "high") == MODE_TEMPLATE
+    assert ViolationTemplates.select_mode(simple, "critical") == MODE_LLM
+    assert ViolationTemplates.select_mode(compound, "low") == MODE_LLM
+    assert ViolationTemplates.select_mode({**simple, "justification_mode": "template"}, "critical") == MODE_TEMPLATE
+    assert ViolationTemplates.select_mode({**simple, "justification_mode": "llm"}, "low") == MODE_LLM
+
+
+def test_render_from_violation_details():
+    """Test rendered text reports the condition and the actual value."""
+    rule = {
+        "id": "rule-1",
+        "validation_logic": {"condition": {"field": "amount", "operator": "greater_than", "value": 10000}},
+        "severity": "high"
+    }
+    record = {"id": "rec-1", "transaction_id": "TXN1", "amount": 15750.0}
+    details = ViolationDetector().evaluate_record(record, rule)["violation_details"]
+
+    justification = ViolationTemplates.render_justification("Transactions over $10,000 must be flagged", record, details)
+    trace = ViolationTemplates.render_trace("Transactions over $10,000 must be flagged", "high", record, details)
+
+    assert justification == (
+        "Transaction TXN1 violates the rule \"Transactions over $10,000 must be flagged\". "
+        "Its amount is 15,750, which exceeds the limit of 10,000."
+    )
+    assert [step["outcome"] for step in trace] == ["inconclusive", "fail", "fail"]
+
+
+def test_is_not_null_text_follows_actual_value():
+    """Test is_not_null violations describe a present value as set, not missing."""
+    rule = {
+        "id": "rule-2",
+        "validation_logic": {"condition": {"field": "sanctions_flag", "operator": "is_not_null"}},
+        "severity": "high"
+    }
+    detector = ViolationDetector()
+    present = {"id": "rec-1", "transaction_id": "TXN1", "sanctions_flag": "OFAC"}
+    absent = {"id": "rec-2", "transaction_id": "TXN2"}
+
+    present_details = detector.evaluate_record(present, rule)["violation_details"]
+    absent_details = detector.evaluate_record(absent, rule)["violation_details"]
+
+    assert ViolationTemplates.render_justification("Sanctioned parties", present, present_details).endswith(
+        "Its sanctions_flag is OFAC, and the rule flags records where it is set."
+    )
+    assert "missing" not in ViolationTemplates.render_trace("Sanctioned parties", "high", present, present_details)[1]["description"]
+    assert ViolationTemplates.render_justification("Sanctioned parties", absent, absent_details).endswith(
+        "Its sanctions_flag is missing, but the rule requires a value."
+    )